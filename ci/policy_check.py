@@ -5,13 +5,40 @@ project-config.yml の policies セクション、または本ファイル内の
 
 使い方:
     python ci/policy_check.py
+    python ci/policy_check.py --no-cache          # キャッシュを使わず全件スキャン
+    python ci/policy_check.py --cache-file PATH   # キャッシュファイルの場所を変更
+    python ci/policy_check.py --jobs 0            # 全コアで並列スキャン
+    python ci/policy_check.py --mmap-threshold N  # N バイト以上のファイルをメモリマップで照合
+    python ci/policy_check.py --staged            # ステージ済みの変更行のみ検査（pre-commit 向け）
+    python ci/policy_check.py --since origin/main # REF からの変更行のみ検査（PR 向け）
+    python ci/policy_check.py --enumerator git -v # git のインデックスで列挙し、所要時間を表示
+    python ci/policy_check.py --format jsonl      # 検出結果を JSON Lines で逐次出力
+    python ci/policy_check.py --format sarif -o policy.sarif --max-issues 20
+    python ci/policy_check.py --profile           # フェーズ・ファイル・パターンごとの所要時間を表示
+    python ci/policy_check.py --watch             # 常駐して変更ファイルのみ再スキャン
+    python ci/policy_check.py --status            # 常駐プロセスの現在の判定を即座に表示
 """
 
 from __future__ import annotations
 
+import argparse
+import hashlib
+import heapq
+import json
+import mmap
+import os
 import re
+import signal
 import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
+from typing import TYPE_CHECKING, NamedTuple, TextIO, TypeAlias
+
+if TYPE_CHECKING:
+    from collections.abc import Generator, Iterator
 
 # ---------------------------------------------------------------------------
 # 設定
@@ -39,6 +66,12 @@ SKIP_DIR_NAMES = {
     "target",
 }
 
+# このサイズ（バイト）以上のファイルはメモリマップで読み、デコードせずにバイト列のまま照合する
+MMAP_THRESHOLD_BYTES = 4 * 1024 * 1024
+
+# 先頭のこのバイト数に NUL を含むファイルはバイナリとみなしてスキャンしない
+BINARY_SNIFF_BYTES = 8192
+
 # ホワイトリスト（パスの相対表記）— 誤検知を除外するファイル
 SKIP_FILES: set[str] = {
     "ci/policy_check.py",  # 自分自身のパターン定義は除外
@@ -86,25 +119,212 @@ FORBIDDEN_PATTERNS: list[str] = [
     # プロジェクト固有の禁止パターンをここに追加
 ]
 
+# ---------------------------------------------------------------------------
+# 結果キャッシュ
+# ---------------------------------------------------------------------------
+
+# スキャン結果キャッシュの保存先（.gitignore 対象）
+CACHE_FILE = REPO_ROOT / ".policy_check_cache.json"
+
+# キャッシュ形式のバージョン。形式を変えたら上げること。
+CACHE_VERSION = 3
+
+# mtime がこの秒数以内のファイルは stat 一致だけでは信用しない
+# （同一タイムスタンプ内の書き換えを見逃さないため。git の racy-git 対策と同じ考え方）
+CACHE_RACY_WINDOW_SEC = 2.0
+
+# ---------------------------------------------------------------------------
+# 並列実行
+# ---------------------------------------------------------------------------
+
+# スキャン対象がこの件数未満なら --jobs 指定時も逐次実行する（プロセス起動コストの方が大きい）
+PARALLEL_MIN_FILES = 64
+
+# ワーカー 1 つあたりのチャンク数（負荷の偏りを均すため複数に分割する）
+PARALLEL_CHUNKS_PER_JOB = 4
+
+# ---------------------------------------------------------------------------
+# 監視モード
+# ---------------------------------------------------------------------------
+
+# 監視プロセスが現在の判定を書き出すファイル（--status で参照する）
+STATUS_FILE = REPO_ROOT / ".policy_check_status.json"
+
+# 既定のポーリング間隔（秒）
+WATCH_INTERVAL_SEC = 1.0
+
+# 状態ファイルの更新がこの秒数（またはポーリング間隔の 3 倍の大きい方）より古ければ
+# 監視プロセスは停止しているとみなす
+STATUS_STALE_MIN_SEC = 5.0
+
 
 # ---------------------------------------------------------------------------
 # ユーティリティ
 # ---------------------------------------------------------------------------
 
 
-def git_ls_files() -> list[Path]:
-    """git 管理対象のファイル一覧を取得する。"""
+class GitError(RuntimeError):
+    """git コマンドの実行に失敗した。"""
+
+
+def run_git(*args: str) -> str:
+    """リポジトリルートで git を実行し、標準出力を返す。
+
+    Raises:
+        GitError: git が見つからない、または非ゼロで終了した場合。
+    """
     try:
         result = subprocess.run(
-            ["git", "ls-files"],
+            ["git", *args],
             capture_output=True,
             text=True,
+            encoding="utf-8",
+            errors="surrogateescape",
             cwd=REPO_ROOT,
             check=True,
         )
-        return [REPO_ROOT / line for line in result.stdout.splitlines() if line.strip()]
-    except (subprocess.CalledProcessError, FileNotFoundError):
+    except FileNotFoundError as exc:
+        raise GitError("git が見つかりません") from exc
+    except subprocess.CalledProcessError as exc:
+        raise GitError(exc.stderr.strip() or f"git {args[0]} が失敗しました") from exc
+    return result.stdout
+
+
+def git_ls_files(*pathspecs: str) -> list[Path]:
+    """git 管理対象のファイル一覧を取得する（pathspec 指定時はその範囲のみ）。"""
+    try:
+        stdout = run_git("ls-files", "-z", "--", *pathspecs)
+    except GitError:
         return []
+    return [REPO_ROOT / name for name in stdout.split("\0") if name]
+
+
+def _diff_revision(since: str | None, staged: bool) -> list[str]:
+    """差分の比較対象を表す git diff の引数を返す。"""
+    return ["--cached"] if staged else [since or "HEAD"]
+
+
+def git_changed_files(*, since: str | None = None, staged: bool = False) -> list[Path]:
+    """変更（追加・コピー・変更・リネーム）されたファイルの一覧を取得する。
+
+    ``staged=True`` ではインデックスと HEAD の差分、それ以外では
+    ``since`` と作業ツリーの差分を対象とする。削除されたファイルは含まない。
+
+    Raises:
+        GitError: git の実行に失敗した場合（不正な REF など）。
+    """
+    stdout = run_git(
+        "diff", "--name-only", "-z", "--diff-filter=ACMR", *_diff_revision(since, staged), "--"
+    )
+    return [REPO_ROOT / name for name in stdout.split("\0") if name]
+
+
+# 統合 diff のハンクヘッダ（変更後側の開始行と行数）
+_HUNK_HEADER = re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@")
+
+
+def git_changed_lines(*, since: str | None = None, staged: bool = False) -> dict[str, set[int]]:
+    """ファイルごとに、変更後の内容で追加・変更された行番号の集合を返す。
+
+    キーはリポジトリ相対パス。パスを特定できなかったファイルは含まないため、
+    呼び出し側では「キーがない = 行で絞り込まない」として扱うこと。
+
+    Raises:
+        GitError: git の実行に失敗した場合。
+    """
+    stdout = run_git(
+        "-c",
+        "core.quotePath=false",
+        "diff",
+        "-U0",
+        "--no-color",
+        "--no-ext-diff",
+        "--src-prefix=a/",
+        "--dst-prefix=b/",
+        "--diff-filter=ACMR",
+        *_diff_revision(since, staged),
+        "--",
+    )
+    changed: dict[str, set[int]] = {}
+    current: set[int] | None = None
+    in_header = False
+    for line in stdout.splitlines():
+        if line.startswith("diff --git "):
+            in_header = True
+            current = None
+        elif in_header and line.startswith("+++ "):
+            name = line[4:]
+            # 引用符付き（制御文字を含む名前）は解釈せず、行の絞り込み対象外とする
+            current = changed.setdefault(name[2:], set()) if name.startswith("b/") else None
+        elif line.startswith("@@"):
+            in_header = False
+            match = _HUNK_HEADER.match(line)
+            if match and current is not None:
+                start = int(match.group(1))
+                count = int(match.group(2) or "1")
+                current.update(range(start, start + count))
+    return changed
+
+
+def _run_git_bytes(*args: str, stdin: bytes) -> bytes:
+    """リポジトリルートで git を実行し、標準入力を渡して標準出力をバイト列で返す。
+
+    Raises:
+        GitError: git が見つからない、または非ゼロで終了した場合。
+    """
+    try:
+        result = subprocess.run(
+            ["git", *args], input=stdin, capture_output=True, cwd=REPO_ROOT, check=True
+        )
+    except FileNotFoundError as exc:
+        raise GitError("git が見つかりません") from exc
+    except subprocess.CalledProcessError as exc:
+        stderr = exc.stderr.decode("utf-8", errors="replace").strip()
+        raise GitError(stderr or f"git {args[0]} が失敗しました") from exc
+    return result.stdout
+
+
+def git_staged_contents(paths: list[Path]) -> dict[Path, bytes]:
+    """インデックス上（ステージ済み）のファイル内容を返す。
+
+    ``git ls-files --stage`` で求めた blob を ``git cat-file --batch`` でまとめて読み出す。
+    作業ツリーの内容は参照しないため、ステージ後に作業ツリーだけを書き換えても結果は変わらない。
+    インデックスにない（または競合中の）ファイルは含まない。
+
+    Raises:
+        GitError: git の実行に失敗した場合。
+    """
+    if not paths:
+        return {}
+    names = [path.relative_to(REPO_ROOT).as_posix() for path in paths]
+    stdout = run_git("--literal-pathspecs", "ls-files", "--stage", "-z", "--", *names)
+    blobs: dict[str, Path] = {}
+    for entry in stdout.split("\0"):
+        if not entry:
+            continue
+        info, _, name = entry.partition("\t")
+        _mode, oid, stage = info.split()
+        if stage == "0":
+            blobs[oid] = REPO_ROOT / name
+    if not blobs:
+        return {}
+
+    output = _run_git_bytes(
+        "cat-file", "--batch", stdin="".join(f"{oid}\n" for oid in blobs).encode()
+    )
+    contents: dict[Path, bytes] = {}
+    pos = 0
+    for path in blobs.values():
+        # 各オブジェクトは "<oid> <type> <size>\n<内容>\n"（存在しなければ "<oid> missing\n"）
+        end = output.index(b"\n", pos)
+        header = output[pos:end].split()
+        pos = end + 1
+        if header[-1] == b"missing":
+            continue
+        size = int(header[2])
+        contents[path] = output[pos : pos + size]
+        pos += size + 1
+    return contents
 
 
 def should_skip(path: Path) -> bool:
@@ -119,17 +339,50 @@ def is_skipped_file(path: Path) -> bool:
     return rel in SKIP_FILES
 
 
-def read_text_safely(path: Path) -> str | None:
-    """ファイルを安全に読み込む。"""
+def file_suffix(name: str) -> str:
+    """ファイル名の拡張子を小文字で返す（``Path.suffix`` と同じ規則）。"""
+    dot = name.rfind(".")
+    if dot <= 0 or dot == len(name) - 1:
+        return ""
+    return name[dot:].lower()
+
+
+def is_scan_target(path: Path, *, require_file: bool = True) -> bool:
+    """スキャン対象のファイルか判定する（SCAN_DIRS 配下・除外条件・拡張子）。
+
+    ``require_file=False`` では作業ツリーに存在するかを問わない
+    （ステージ済みの内容を検査する場合）。
+    """
+    if not any(path.is_relative_to(root) for root in SCAN_DIRS):
+        return False
+    if path.suffix.lower() not in SCAN_EXTENSIONS:
+        return False
+    if require_file and not path.is_file():
+        return False
+    return not should_skip(path) and not is_skipped_file(path)
+
+
+def read_bytes_safely(path: Path) -> bytes | None:
+    """ファイルをバイト列として安全に読み込む。"""
     try:
-        return path.read_text(encoding="utf-8", errors="ignore")
-    except (OSError, UnicodeDecodeError):
+        return path.read_bytes()
+    except OSError:
         return None
 
 
+def content_digest(data: bytes | mmap.mmap) -> str:
+    """ファイル内容のハッシュ値を返す（キャッシュキー用）。"""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def is_binary(data: bytes | mmap.mmap) -> bool:
+    """先頭部分に NUL を含むか（バイナリファイルか）判定する。"""
+    return data.find(b"\0", 0, BINARY_SNIFF_BYTES) != -1
+
+
 def is_url_allowlisted(line: str) -> bool:
     """URL がホワイトリストに該当するか判定する。"""
-    return any(re.search(pat, line) for pat in URL_ALLOWLIST_PATTERNS)
+    return get_engine().is_url_allowlisted(line)
 
 
 def is_code_file(path: Path) -> bool:
@@ -145,87 +398,1469 @@ def is_comment_line(line: str, suffix: str) -> bool:
     )
 
 
+# ---------------------------------------------------------------------------
+# パターンエンジン
+# ---------------------------------------------------------------------------
+
+# 正規表現のメタ文字（リテラル接頭辞の抽出で使用）
+_REGEX_META = frozenset(".^$*+?{}[]\\|()")
+
+# str.splitlines() と同じ改行の定義（行番号を splitlines() 基準で数えるため）
+_LINE_BREAK = re.compile(r"\r\n|[\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029]")
+_EXOTIC_LINE_BREAK = re.compile(r"[\r\v\f\x1c\x1d\x1e\x85\u2028\u2029]")
+
+# 上記の UTF-8 バイト列版（メモリマップしたファイルの照合で使用）
+_LINE_BREAK_BYTES = re.compile(rb"\r\n|[\n\r\v\f\x1c\x1d\x1e]|\xc2\x85|\xe2\x80[\xa8\xa9]")
+_EXOTIC_LINE_BREAK_BYTES = re.compile(rb"[\r\v\f\x1c\x1d\x1e]|\xc2\x85|\xe2\x80[\xa8\xa9]")
+
+# バイト列中の改行を数えるときに 1 度にコピーする最大バイト数
+_COUNT_WINDOW_BYTES = 1024 * 1024
+
+# 照合対象（デコード済みテキスト、またはメモリマップしたバイト列）
+Content: TypeAlias = "str | mmap.mmap"
+
+
+def literal_prefix(pattern: str) -> str:
+    """パターンがマッチするとき必ず先頭に現れるリテラル文字列を返す。
+
+    確定できない場合（トップレベルの ``|``、先頭がメタ文字など）は空文字列。
+    抽出は保守的に行い、誤って長い接頭辞を返すことはない。
+    """
+    depth = 0
+    i = 0
+    while i < len(pattern):
+        ch = pattern[i]
+        if ch == "\\":
+            i += 1
+        elif ch == "[":
+            # 文字クラス内の ( | ) は構文上の意味を持たないため読み飛ばす
+            i += 2 if pattern[i + 1 : i + 2] == "^" else 1
+            i += 1 if pattern[i : i + 1] == "]" else 0
+            while i < len(pattern) and pattern[i] != "]":
+                i += 2 if pattern[i] == "\\" else 1
+        elif ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+        elif ch == "|" and depth == 0:
+            return ""
+        i += 1
+
+    prefix: list[str] = []
+    i = 0
+    while i < len(pattern):
+        ch = pattern[i]
+        if ch == "\\" and i + 1 < len(pattern) and not pattern[i + 1].isalnum():
+            literal, step = pattern[i + 1], 2
+        elif ch not in _REGEX_META:
+            literal, step = ch, 1
+        else:
+            break
+        following = pattern[i + step : i + step + 1]
+        if following in {"?", "*", "{"}:
+            break
+        prefix.append(literal)
+        if following == "+":
+            break
+        i += step
+    return "".join(prefix)
+
+
+def _compile_bytes(pattern: str, flags: int = 0) -> re.Pattern[bytes] | None:
+    """パターンをバイト列用にコンパイルする。表現できない場合は ``None``。"""
+    try:
+        return re.compile(pattern.encode("utf-8"), flags)
+    except re.error:
+        return None
+
+
+def _count_newlines(data: mmap.mmap, start: int, end: int) -> int:
+    """バイト列 ``data[start:end]`` 中の ``\\n`` の数を固定サイズの窓で数える。"""
+    count = 0
+    for offset in range(start, end, _COUNT_WINDOW_BYTES):
+        count += data[offset : min(offset + _COUNT_WINDOW_BYTES, end)].count(b"\n")
+    return count
+
+
+class _Rule:
+    """事前コンパイル済みの 1 パターン。リテラル接頭辞による事前フィルタを持つ。"""
+
+    __slots__ = ("pattern", "regex", "prefix", "bytes_regex", "bytes_prefix")
+
+    def __init__(self, pattern: str, flags: int = 0) -> None:
+        self.pattern = pattern
+        self.regex = re.compile(pattern, flags)
+        self.prefix = literal_prefix(pattern)
+        self.bytes_regex = _compile_bytes(pattern, flags)
+        self.bytes_prefix = self.prefix.encode("utf-8")
+
+    def find(self, content: Content) -> int:
+        """最初のマッチの開始位置を返す（マッチしなければ -1）。
+
+        ``content`` はテキスト、またはメモリマップしたバイト列（位置はバイト単位）。
+        """
+        if isinstance(content, str):
+            if self.prefix and self.prefix not in content:
+                return -1
+            match = self.regex.search(content)
+            return -1 if match is None else match.start()
+        if self.bytes_prefix and content.find(self.bytes_prefix) == -1:
+            return -1
+        assert self.bytes_regex is not None, "bytes_compatible でないエンジンで照合された"
+        bytes_match = self.bytes_regex.search(content)
+        return -1 if bytes_match is None else bytes_match.start()
+
+
+def locate(content: Content, pos: int) -> tuple[int, int]:
+    """位置 ``pos`` の (行, 桁) を 1 始まりで返す。
+
+    行は ``str.splitlines()`` と同じ基準で数え、桁は文字単位で数える
+    （メモリマップしたバイト列では行頭から ``pos`` までをデコードして数える）。
+    """
+    if isinstance(content, str):
+        if _EXOTIC_LINE_BREAK.search(content, 0, pos) is None:
+            line = content.count("\n", 0, pos) + 1
+            start = content.rfind("\n", 0, pos) + 1
+        else:
+            line, start = 1, 0
+            for brk in _LINE_BREAK.finditer(content, 0, pos):
+                line, start = line + 1, brk.end()
+        return line, pos - start + 1
+
+    if _EXOTIC_LINE_BREAK_BYTES.search(content, 0, pos) is None:
+        line = _count_newlines(content, 0, pos) + 1
+        start = content.rfind(b"\n", 0, pos) + 1
+    else:
+        line, start = 1, 0
+        for bytes_brk in _LINE_BREAK_BYTES.finditer(content, 0, pos):
+            line, start = line + 1, bytes_brk.end()
+    return line, len(content[start:pos].decode("utf-8", errors="ignore")) + 1
+
+
+class PatternEngine:
+    """スキャン用パターンを事前コンパイルした照合エンジン。
+
+    - 各パターンは 1 度だけコンパイルし、``re`` モジュールのキャッシュ検索を避ける。
+    - リテラル接頭辞（``AKIA`` / ``ghp_`` / ``-----BEGIN`` など）を持つパターンは
+      ``str.__contains__`` で事前フィルタし、接頭辞がなければ正規表現を実行しない。
+    - URL はファイル全体を 1 パスで走査し、マッチした行に対してのみ
+      コメント判定と許可リスト照合を行う。
+    - 大きなファイルはメモリマップしたバイト列のまま照合できる
+      （``bytes_compatible`` が真の場合）。行番号はマッチした箇所についてのみ数える。
+
+    CPython の ``re`` はバックトラック型のため、全パターンを名前付きグループの
+    選択（``|``）に結合すると分岐ごとの試行が位置ごとに発生し、パターン別の
+    検索より遅くなる（``tests/benchmarks/bench_policy_patterns.py`` 参照）。
+    そのため結合は行わず、事前フィルタで 1 パスに近いコストに抑える。
+    """
+
+    def __init__(
+        self,
+        *,
+        forbidden_imports: list[str],
+        secrets: list[str],
+        url: str,
+        url_allowlist: list[str],
+        forbidden: list[str],
+    ) -> None:
+        self.import_rules = [_Rule(pat, re.MULTILINE) for pat in forbidden_imports]
+        self.secret_rules = [_Rule(pat) for pat in secrets]
+        self.forbidden_rules = [_Rule(pat, re.MULTILINE) for pat in forbidden]
+        self.url = re.compile(url)
+        self.url_bytes = _compile_bytes(url)
+        self.url_allowlist = (
+            re.compile("|".join(f"(?:{pat})" for pat in url_allowlist)) if url_allowlist else None
+        )
+        rules = self.import_rules + self.secret_rules + self.forbidden_rules
+        self.bytes_compatible = self.url_bytes is not None and all(
+            rule.bytes_regex is not None for rule in rules
+        )
+
+    @staticmethod
+    def _matching(rule_id: str, rules: list[_Rule], text: Content) -> list[tuple[str, int]]:
+        """マッチしたパターンと最初のマッチ位置を定義順に返す。"""
+        found = []
+        profile = _profile
+        for rule in rules:
+            if profile is None:
+                pos = rule.find(text)
+            else:
+                started = time.perf_counter()
+                pos = rule.find(text)
+                profile.add_pattern(rule_id, rule.pattern, time.perf_counter() - started)
+            if pos >= 0:
+                found.append((rule.pattern, pos))
+        return found
+
+    def matching_imports(self, text: Content) -> list[tuple[str, int]]:
+        """マッチした禁止 import パターンと最初のマッチ位置を定義順に返す。"""
+        return self._matching(RULE_IMPORT, self.import_rules, text)
+
+    def matching_secrets(self, text: Content) -> list[tuple[str, int]]:
+        """マッチした秘密情報パターンと最初のマッチ位置を定義順に返す。"""
+        return self._matching(RULE_SECRET, self.secret_rules, text)
+
+    def matching_forbidden(self, text: Content) -> list[tuple[str, int]]:
+        """マッチした禁止パターンと最初のマッチ位置を定義順に返す。"""
+        return self._matching(RULE_FORBIDDEN, self.forbidden_rules, text)
+
+    def is_url_allowlisted(self, line: str) -> bool:
+        """行が URL ホワイトリストに該当するか判定する。"""
+        return self.url_allowlist is not None and self.url_allowlist.search(line) is not None
+
+    def url_violation_lines(self, text: Content, suffix: str) -> Iterator[tuple[int, int]]:
+        """許可されていない URL を含む行の (行, 桁) を 1 始まりで返す。
+
+        行番号は ``text.splitlines()`` と同じ基準で数え、桁はその行の最初の URL の
+        位置（文字単位）とする。コメント行とホワイトリストに該当する行は除外し、
+        1 行につき高々 1 回だけ返す。
+        """
+        hits = self._url_lines(text) if isinstance(text, str) else self._url_lines_bytes(text)
+        profile = _profile
+        for lineno, column, line in hits:
+            if is_comment_line(line, suffix):
+                continue
+            if profile is None:
+                allowed = self.is_url_allowlisted(line)
+            else:
+                started = time.perf_counter()
+                allowed = self.is_url_allowlisted(line)
+                profile.add_phase("url_allowlist", time.perf_counter() - started)
+            if not allowed:
+                yield lineno, column
+
+    def _url_lines(self, text: str) -> Iterator[tuple[int, int, str]]:
+        """URL を含む行の (行番号, 桁, 行) をテキストから返す。"""
+        # "\n" 以外の改行文字がなければ str.count / str.find で高速に行を特定する
+        simple = _EXOTIC_LINE_BREAK.search(text) is None
+        lineno = 1
+        line_start = 0
+        line_end = -1
+        for match in self.url.finditer(text):
+            pos = match.start()
+            if pos < line_end:
+                continue  # 同じ行の 2 つ目以降の URL
+            if simple:
+                lineno += text.count("\n", line_start, pos)
+                line_start = text.rfind("\n", 0, pos) + 1
+                line_end = text.find("\n", pos)
+                if line_end < 0:
+                    line_end = len(text)
+            else:
+                for brk in _LINE_BREAK.finditer(text, line_start, pos):
+                    lineno += 1
+                    line_start = brk.end()
+                next_break = _LINE_BREAK.search(text, pos)
+                line_end = next_break.start() if next_break else len(text)
+            yield lineno, pos - line_start + 1, text[line_start:line_end]
+
+    def _url_lines_bytes(self, data: mmap.mmap) -> Iterator[tuple[int, int, str]]:
+        """URL を含む行の (行番号, 桁, 行) をメモリマップしたバイト列から返す。
+
+        ファイル全体はデコードせず、URL を含む行だけをデコードする。
+        """
+        assert self.url_bytes is not None, "bytes_compatible でないエンジンで照合された"
+        simple = _EXOTIC_LINE_BREAK_BYTES.search(data) is None
+        lineno = 1
+        line_start = 0
+        line_end = -1
+        for match in self.url_bytes.finditer(data):
+            pos = match.start()
+            if pos < line_end:
+                continue  # 同じ行の 2 つ目以降の URL
+            if simple:
+                lineno += _count_newlines(data, line_start, pos)
+                line_start = data.rfind(b"\n", 0, pos) + 1
+                line_end = data.find(b"\n", pos)
+                if line_end < 0:
+                    line_end = len(data)
+            else:
+                for brk in _LINE_BREAK_BYTES.finditer(data, line_start, pos):
+                    lineno += 1
+                    line_start = brk.end()
+                next_break = _LINE_BREAK_BYTES.search(data, pos)
+                line_end = next_break.start() if next_break else len(data)
+            column = len(data[line_start:pos].decode("utf-8", errors="ignore")) + 1
+            yield lineno, column, data[line_start:line_end].decode("utf-8", errors="ignore")
+
+
+_engine_cache: tuple[tuple[object, ...], PatternEngine] | None = None
+
+
+def get_engine() -> PatternEngine:
+    """現在のパターン定数から構築したエンジンを返す（定数が変わるまで再利用する）。"""
+    global _engine_cache
+    key = (
+        tuple(FORBIDDEN_IMPORT_PATTERNS),
+        tuple(SECRET_PATTERNS),
+        URL_PATTERN,
+        tuple(URL_ALLOWLIST_PATTERNS),
+        tuple(FORBIDDEN_PATTERNS),
+    )
+    if _engine_cache is None or _engine_cache[0] != key:
+        engine = PatternEngine(
+            forbidden_imports=FORBIDDEN_IMPORT_PATTERNS,
+            secrets=SECRET_PATTERNS,
+            url=URL_PATTERN,
+            url_allowlist=URL_ALLOWLIST_PATTERNS,
+            forbidden=FORBIDDEN_PATTERNS,
+        )
+        _engine_cache = (key, engine)
+    return _engine_cache[1]
+
+
+# ---------------------------------------------------------------------------
+# 対象ファイルの列挙
+# ---------------------------------------------------------------------------
+
+# 列挙方式: walk = os.scandir による走査、git = git のインデックス（+ 未追跡ファイル）
+ENUMERATORS = ("walk", "git")
+
+
+def walk_scan_files(root: Path) -> Iterator[Path]:
+    """``root`` 配下のスキャン対象ファイルを ``os.scandir`` で列挙する。
+
+    ``SKIP_DIR_NAMES`` に該当するディレクトリは降りずに刈り込み、
+    拡張子と ``SKIP_FILES`` の判定はエントリ名とリポジトリ相対パスの
+    文字列操作のみで行う（パスごとの ``stat`` / ``relative_to`` を行わない）。
+    シンボリックリンクのディレクトリには降りない。各ディレクトリではファイルを名前順に返してから
+    サブディレクトリを名前順に辿る（パス全体を整列した順序ではない）。
+    """
+    root_rel = root.relative_to(REPO_ROOT).as_posix()
+    stack = [(os.fspath(root), "" if root_rel == "." else f"{root_rel}/")]
+    while stack:
+        directory, rel_prefix = stack.pop()
+        try:
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda entry: entry.name)
+        except OSError:
+            continue
+        subdirs: list[tuple[str, str]] = []
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in SKIP_DIR_NAMES:
+                    subdirs.append((entry.path, f"{rel_prefix}{entry.name}/"))
+                continue
+            if file_suffix(entry.name) not in SCAN_EXTENSIONS:
+                continue
+            if f"{rel_prefix}{entry.name}" in SKIP_FILES or not entry.is_file():
+                continue
+            yield Path(entry.path)
+        stack.extend(reversed(subdirs))
+
+
+def git_scan_files() -> list[Path]:
+    """``SCAN_DIRS`` 配下のスキャン対象ファイルを git のインデックスから列挙する。
+
+    追跡中のファイルに加え、``.gitignore`` で除外されていない未追跡ファイルも含む。
+    判定は ``git ls-files -z`` の出力文字列に対してのみ行い、ファイルシステムは走査しない。
+
+    Raises:
+        GitError: git の実行に失敗した場合。
+    """
+    pathspecs = [root.relative_to(REPO_ROOT).as_posix() for root in SCAN_DIRS if root.exists()]
+    if not pathspecs:
+        return []
+    stdout = run_git(
+        "ls-files", "-z", "--cached", "--others", "--exclude-standard", "--", *pathspecs
+    )
+    paths: list[Path] = []
+    for rel in stdout.split("\0"):
+        if not rel or file_suffix(rel.rpartition("/")[2]) not in SCAN_EXTENSIONS:
+            continue
+        if rel in SKIP_FILES or not SKIP_DIR_NAMES.isdisjoint(rel.split("/")[:-1]):
+            continue
+        paths.append(REPO_ROOT / rel)
+    return paths
+
+
+def enumerate_scan_files(enumerator: str = "walk") -> list[Path]:
+    """``SCAN_DIRS`` 配下のスキャン対象ファイルを列挙する。
+
+    ``enumerator="git"`` で git を利用できない場合は ``walk`` にフォールバックする。
+    """
+    if enumerator == "git":
+        try:
+            return git_scan_files()
+        except GitError as exc:
+            print(
+                f"[policy_check] WARN: git で列挙できないため walk を使用: {exc}", file=sys.stderr
+            )
+    paths: list[Path] = []
+    for root in SCAN_DIRS:
+        if root.is_dir():
+            paths.extend(walk_scan_files(root))
+    return paths
+
+
+# ---------------------------------------------------------------------------
+# 検出結果
+# ---------------------------------------------------------------------------
+
+
+# ルール ID と説明（SARIF の rules にも使用する）
+RULE_ENV = "env-committed"
+RULE_IMPORT = "forbidden-import"
+RULE_URL = "url-literal"
+RULE_SECRET = "secret"
+RULE_FORBIDDEN = "forbidden-pattern"
+
+RULES: dict[str, str] = {
+    RULE_ENV: ".env がリポジトリにコミットされている",
+    RULE_IMPORT: "禁止された import（FORBIDDEN_IMPORT_PATTERNS）",
+    RULE_URL: "許可リスト外の URL の直書き（URL_ALLOWLIST_PATTERNS）",
+    RULE_SECRET: "秘密情報らしき文字列（SECRET_PATTERNS）",
+    RULE_FORBIDDEN: "プロジェクト固有の禁止パターン（FORBIDDEN_PATTERNS）",
+}
+
+# 差分モードで変更行に絞り込むルール（それ以外はファイル全体が対象）
+LINE_SCOPED_RULES = frozenset({RULE_URL})
+
+
+class Issue(NamedTuple):
+    """1 件の検出結果。
+
+    Attributes:
+        rule: ルール ID（``RULES`` のキー）。
+        path: リポジトリ相対パス（POSIX 形式）。
+        message: 表示用メッセージ。
+        line: 検出行（1 始まり）。位置を持たない検出では ``None``。
+        column: 検出桁（1 始まり、文字単位）。位置を持たない検出では ``None``。
+        pattern: マッチしたパターン。パターンによらない検出では ``None``。
+    """
+
+    rule: str
+    path: str
+    message: str
+    line: int | None = None
+    column: int | None = None
+    pattern: str | None = None
+
+
+def env_issue() -> Issue | None:
+    """.env が git 管理されていれば検出結果を返す。"""
+    tracked_files = {p.relative_to(REPO_ROOT).as_posix() for p in git_ls_files(".env")}
+    if ".env" not in tracked_files:
+        return None
+    message = (
+        "禁止: .env がリポジトリにコミットされています。削除し、gitignore 対象にしてください。"
+    )
+    return Issue(RULE_ENV, ".env", message)
+
+
+def filter_changed_lines(
+    rel: str, issues: list[Issue], changed_lines: dict[str, set[int]]
+) -> list[Issue]:
+    """行単位のルールの検出結果を、変更された行のものだけに絞り込む。
+
+    ``LINE_SCOPED_RULES`` 以外の検出結果と、変更行が不明なファイルの
+    検出結果はそのまま返す。
+    """
+    lines = changed_lines.get(rel)
+    if lines is None:
+        return issues
+    return [issue for issue in issues if issue.rule not in LINE_SCOPED_RULES or issue.line in lines]
+
+
+# ---------------------------------------------------------------------------
+# 出力
+# ---------------------------------------------------------------------------
+
+OUTPUT_FORMATS = ("text", "jsonl", "sarif")
+
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+
+
+class Reporter:
+    """検出結果を見つかった順に逐次出力する。
+
+    ``text`` は従来どおりの番号付き一覧（最初の検出時に ``FAILED`` 見出しを出す）、
+    ``jsonl`` は 1 行 1 件の JSON、``sarif`` は SARIF 2.1.0 を出力する。
+    SARIF も結果を 1 件ずつ書き出し、全件をメモリに保持しない。
+    """
+
+    def __init__(self, fmt: str = "text", stream: TextIO | None = None) -> None:
+        self.fmt = fmt
+        self.stream = stream or sys.stdout
+        self.count = 0
+
+    def start(self) -> None:
+        """出力を開始する。"""
+        if self.fmt == "sarif":
+            driver = {
+                "name": "policy_check",
+                "rules": [
+                    {"id": rule, "shortDescription": {"text": text}} for rule, text in RULES.items()
+                ],
+            }
+            header = json.dumps(
+                {
+                    "$schema": SARIF_SCHEMA,
+                    "version": "2.1.0",
+                    "runs": [{"tool": {"driver": driver}}],
+                },
+                ensure_ascii=False,
+            )
+            # "runs": [{ ... }] の末尾の "}]}" を外し、results 配列を開く
+            self.stream.write(header[:-3] + ', "results": [\n')
+
+    def report(self, issue: Issue) -> None:
+        """検出結果を 1 件出力する。"""
+        self.count += 1
+        if self.fmt == "text":
+            if self.count == 1:
+                self.stream.write("[policy_check] FAILED\n")
+            self.stream.write(f"  {self.count}. {issue.message}\n")
+        elif self.fmt == "jsonl":
+            self.stream.write(json.dumps(issue._asdict(), ensure_ascii=False) + "\n")
+        else:
+            separator = "" if self.count == 1 else ",\n"
+            self.stream.write(separator + json.dumps(sarif_result(issue), ensure_ascii=False))
+        self.stream.flush()
+
+    def finish(self) -> None:
+        """出力を終了する。"""
+        if self.fmt == "text" and self.count == 0:
+            self.stream.write("[policy_check] OK\n")
+        elif self.fmt == "sarif":
+            self.stream.write("\n]}]}\n")
+        self.stream.flush()
+
+
+def sarif_result(issue: Issue) -> dict[str, object]:
+    """検出結果を SARIF の result オブジェクトに変換する。"""
+    location: dict[str, object] = {"artifactLocation": {"uri": issue.path}}
+    if issue.line is not None:
+        region: dict[str, int] = {"startLine": issue.line}
+        if issue.column is not None:
+            region["startColumn"] = issue.column
+        location["region"] = region
+    return {
+        "ruleId": issue.rule,
+        "level": "error",
+        "message": {"text": issue.message},
+        "locations": [{"physicalLocation": location}],
+    }
+
+
+# ---------------------------------------------------------------------------
+# プロファイル
+# ---------------------------------------------------------------------------
+
+# --profile で表示する遅いファイル・高コストなパターンの既定件数
+PROFILE_TOP_N = 10
+
+
+class ScanProfile:
+    """フェーズ・ファイル・パターンごとの所要時間を集計する。
+
+    ``--profile`` / ``--profile-json`` 指定時のみモジュール変数 ``_profile`` に設定され、
+    計測箇所は ``_profile is None`` なら何もしない。並列スキャン時、ファイル単位の
+    計測値はワーカーで ``state()`` に変換して親プロセスへ返し、``merge()`` で合算する。
+    """
+
+    def __init__(self) -> None:
+        # フェーズ名 -> 累計秒数
+        self.phases: dict[str, float] = {}
+        # (ルール ID, パターン) -> [累計秒数, 照合回数]
+        self.patterns: dict[tuple[str, str], list[float]] = {}
+        # (秒数, リポジトリ相対パス)
+        self.files: list[tuple[float, str]] = []
+
+    def add_phase(self, name: str, seconds: float) -> None:
+        """フェーズの所要時間を加算する。"""
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def add_pattern(self, rule: str, pattern: str, seconds: float) -> None:
+        """パターン 1 回分の照合時間を加算する。"""
+        entry = self.patterns.setdefault((rule, pattern), [0.0, 0])
+        entry[0] += seconds
+        entry[1] += 1
+
+    def add_file(self, rel: str, seconds: float) -> None:
+        """ファイル 1 件分の処理時間を記録する。"""
+        self.files.append((seconds, rel))
+
+    def state(self) -> dict[str, object]:
+        """プロセス間で受け渡せる形に変換する。"""
+        return {
+            "phases": self.phases,
+            "patterns": [[*key, *value] for key, value in self.patterns.items()],
+            "files": self.files,
+        }
+
+    def merge(self, state: dict[str, object]) -> None:
+        """``state()`` の結果を合算する。"""
+        for name, seconds in state["phases"].items():  # type: ignore[attr-defined]
+            self.add_phase(name, seconds)
+        for rule, pattern, seconds, calls in state["patterns"]:  # type: ignore[attr-defined]
+            entry = self.patterns.setdefault((rule, pattern), [0.0, 0])
+            entry[0] += seconds
+            entry[1] += calls
+        self.files.extend(state["files"])  # type: ignore[arg-type]
+
+    def slowest_files(self, top: int) -> list[tuple[float, str]]:
+        """処理時間の長いファイルを上位 ``top`` 件返す。"""
+        return heapq.nlargest(top, self.files)
+
+    def costliest_patterns(self, top: int) -> list[tuple[str, str, float, int]]:
+        """累計照合時間の長いパターンを上位 ``top`` 件返す。"""
+        ranked = sorted(self.patterns.items(), key=lambda item: item[1][0], reverse=True)
+        return [(rule, pat, value[0], int(value[1])) for (rule, pat), value in ranked[:top]]
+
+    def to_dict(self, top: int = PROFILE_TOP_N) -> dict[str, object]:
+        """JSON 出力用の辞書に変換する（時間はミリ秒）。"""
+        return {
+            "phases_ms": {name: seconds * 1000 for name, seconds in self.phases.items()},
+            "files_scanned": len(self.files),
+            "slowest_files": [
+                {"path": rel, "ms": seconds * 1000} for seconds, rel in self.slowest_files(top)
+            ],
+            "patterns": [
+                {"rule": rule, "pattern": pat, "ms": seconds * 1000, "calls": calls}
+                for rule, pat, seconds, calls in self.costliest_patterns(top)
+            ],
+        }
+
+    def render(self, top: int = PROFILE_TOP_N) -> str:
+        """人が読むための一覧に整形する。"""
+        lines = ["[policy_check] プロファイル（read / match / パターンは並列時ワーカー合計）"]
+        lines.append("  フェーズ:")
+        for name, seconds in self.phases.items():
+            lines.append(f"    {name:<14} {seconds * 1000:10.1f} ms")
+        lines.append(f"  遅いファイル（上位 {top} / {len(self.files)} 件）:")
+        for seconds, rel in self.slowest_files(top):
+            lines.append(f"    {seconds * 1000:10.1f} ms  {rel}")
+        lines.append(f"  高コストなパターン（上位 {top} 件）:")
+        for rule, pat, seconds, calls in self.costliest_patterns(top):
+            lines.append(f"    {seconds * 1000:10.1f} ms  {calls:6d} 回  {rule:<17} {pat}")
+        return "\n".join(lines)
+
+
+# 実行中のプロファイル（プロファイル無効時は None）
+_profile: ScanProfile | None = None
+
+
+@contextmanager
+def measure(phase: str) -> Iterator[None]:
+    """プロファイル中であれば、ブロックの所要時間をフェーズとして記録する。"""
+    if _profile is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        _profile.add_phase(phase, time.perf_counter() - started)
+
+
 # ---------------------------------------------------------------------------
 # スキャン
 # ---------------------------------------------------------------------------
 
 
-def scan_file(path: Path) -> list[str]:
+def scan_file(path: Path) -> list[Issue]:
     """1 ファイルをスキャンし、問題を返す。"""
-    issues: list[str] = []
-    text = read_text_safely(path)
-    if text is None:
-        return issues
+    result = scan_file_digest(path)
+    if result is None:
+        return []
+    return result[1] or []
+
+
+def scan_text(path: Path, text: Content) -> list[Issue]:
+    """読み込み済みのファイル内容をスキャンし、問題を返す。
 
-    rel = path.relative_to(REPO_ROOT)
+    ``text`` にはデコード済みのテキストのほか、メモリマップしたファイルも渡せる。
+    """
+    started = time.perf_counter() if _profile is not None else 0.0
+    issues: list[Issue] = []
+    rel = path.relative_to(REPO_ROOT).as_posix()
     suffix = path.suffix.lower()
+    engine = get_engine()
 
     # 禁止 import（コードファイルのみ）
-    if is_code_file(path) and FORBIDDEN_IMPORT_PATTERNS:
-        for pat in FORBIDDEN_IMPORT_PATTERNS:
-            if re.search(pat, text, flags=re.MULTILINE):
-                issues.append(f"禁止操作疑い: 禁止import検出 ({pat}) in {rel}")
+    if is_code_file(path):
+        for pat, pos in engine.matching_imports(text):
+            message = f"禁止操作疑い: 禁止import検出 ({pat}) in {rel}"
+            issues.append(Issue(RULE_IMPORT, rel, message, *locate(text, pos), pat))
 
     # URL 直書き（コードファイルのみ — コメント行は除外）
+    # URL パターンの計測値からは url_allowlist フェーズ分を除き、match の内訳として足せるようにする
     if is_code_file(path):
-        for lineno, line in enumerate(text.splitlines(), start=1):
-            if is_comment_line(line, suffix):
-                continue
-            if re.search(URL_PATTERN, line) and not is_url_allowlisted(line):
-                issues.append(f"外部接続疑い: URL直書き検出 in {rel}:{lineno}")
+        if _profile is not None:
+            url_started = time.perf_counter()
+            allowlist_before = _profile.phases.get("url_allowlist", 0.0)
+        for lineno, column in engine.url_violation_lines(text, suffix):
+            message = f"外部接続疑い: URL直書き検出 in {rel}:{lineno}"
+            issues.append(Issue(RULE_URL, rel, message, lineno, column, engine.url.pattern))
+        if _profile is not None:
+            allowlist = _profile.phases.get("url_allowlist", 0.0) - allowlist_before
+            url_elapsed = time.perf_counter() - url_started - allowlist
+            _profile.add_pattern(RULE_URL, engine.url.pattern, url_elapsed)
 
     # 秘密情報（全ファイル種別）
-    for pat in SECRET_PATTERNS:
-        if re.search(pat, text):
-            issues.append(f"秘密情報疑い: パターン検出 ({pat}) in {rel}")
+    for pat, pos in engine.matching_secrets(text):
+        message = f"秘密情報疑い: パターン検出 ({pat}) in {rel}"
+        issues.append(Issue(RULE_SECRET, rel, message, *locate(text, pos), pat))
 
     # プロジェクト固有の禁止パターン（全ファイル種別）
-    for pat in FORBIDDEN_PATTERNS:
-        if re.search(pat, text, flags=re.MULTILINE):
-            issues.append(f"禁止パターン検出: ({pat}) in {rel}")
+    for pat, pos in engine.matching_forbidden(text):
+        message = f"禁止パターン検出: ({pat}) in {rel}"
+        issues.append(Issue(RULE_FORBIDDEN, rel, message, *locate(text, pos), pat))
 
+    if _profile is not None:
+        _profile.add_phase("match", time.perf_counter() - started)
     return issues
 
 
 # ---------------------------------------------------------------------------
-# メイン
+# キャッシュ
 # ---------------------------------------------------------------------------
 
 
-def main() -> int:
-    """ポリシーチェックを実行し、違反があれば非ゼロで終了する。"""
-    issues: list[str] = []
+def pattern_fingerprint() -> str:
+    """有効なパターン集合とチェッカー自身のフィンガープリントを返す。
 
-    # .env が git 管理されていないことを確認
-    tracked_files = {p.relative_to(REPO_ROOT).as_posix() for p in git_ls_files()}
-    if ".env" in tracked_files:
-        issues.append(
-            "禁止: .env がリポジトリにコミットされています。削除し、gitignore 対象にしてください。"
-        )
+    パターン定数またはスキャンロジック（本ファイル）が変わると値が変わり、
+    既存のキャッシュは丸ごと無効になる。
+    """
+    payload = json.dumps(
+        {
+            "version": CACHE_VERSION,
+            "forbidden_import": FORBIDDEN_IMPORT_PATTERNS,
+            "secret": SECRET_PATTERNS,
+            "url": URL_PATTERN,
+            "url_allowlist": URL_ALLOWLIST_PATTERNS,
+            "forbidden": FORBIDDEN_PATTERNS,
+        },
+        sort_keys=True,
+    )
+    digest = hashlib.sha256(payload.encode("utf-8"))
+    digest.update(Path(__file__).read_bytes())
+    return digest.hexdigest()
 
-    # 対象ファイルのスキャン
-    for root in SCAN_DIRS:
-        if not root.exists():
+
+class ScanCache:
+    """ファイル内容ハッシュをキーとしたスキャン結果の永続キャッシュ。
+
+    エントリはリポジトリ相対パスごとに ``mtime_ns`` / ``size`` / 内容ハッシュ /
+    検出結果を保持する。stat 情報が一致すればファイルを読まずに結果を再利用し、
+    不一致でも内容ハッシュが一致すれば再スキャンを省略する。
+
+    ``save()`` は今回の実行で参照したエントリのみを書き出すため、
+    削除・除外されたファイルのエントリは自動的に破棄される。
+    """
+
+    def __init__(self, path: Path, fingerprint: str) -> None:
+        self.path = path
+        self.fingerprint = fingerprint
+        self._entries: dict[str, dict[str, object]] = {}
+        self._seen: dict[str, dict[str, object]] = {}
+        self._started_ns = time.time_ns()
+
+    @classmethod
+    def load(cls, path: Path, fingerprint: str) -> ScanCache:
+        """キャッシュファイルを読み込む。壊れている・古い場合は空で開始する。"""
+        cache = cls(path, fingerprint)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return cache
+        if not isinstance(data, dict) or data.get("fingerprint") != fingerprint:
+            return cache
+        entries = data.get("entries")
+        if isinstance(entries, dict):
+            cache._entries = entries
+        return cache
+
+    def lookup_stat(self, rel: str, st: os.stat_result) -> list[Issue] | None:
+        """stat 情報が一致するエントリの検出結果を返す。"""
+        entry = self._entries.get(rel)
+        if entry is None or entry.get("mtime_ns") is None:
+            return None
+        if entry["mtime_ns"] != st.st_mtime_ns or entry["size"] != st.st_size:
+            return None
+        self._seen[rel] = entry
+        return [Issue(*item) for item in entry["issues"]]  # type: ignore[attr-defined]
+
+    def known_digest(self, rel: str) -> str | None:
+        """前回記録した内容ハッシュを返す。"""
+        entry = self._entries.get(rel)
+        return None if entry is None else entry.get("digest")  # type: ignore[return-value]
+
+    def lookup_digest(self, rel: str, digest: str) -> list[Issue] | None:
+        """内容ハッシュが一致するエントリの検出結果を返す。"""
+        entry = self._entries.get(rel)
+        if entry is None or entry.get("digest") != digest:
+            return None
+        return [Issue(*item) for item in entry["issues"]]  # type: ignore[attr-defined]
+
+    def store(self, rel: str, st: os.stat_result, digest: str, issues: list[Issue]) -> None:
+        """検出結果を記録する。"""
+        racy_ns = int(CACHE_RACY_WINDOW_SEC * 1e9)
+        trusted = st.st_mtime_ns < self._started_ns - racy_ns
+        self._seen[rel] = {
+            "mtime_ns": st.st_mtime_ns if trusted else None,
+            "size": st.st_size,
+            "digest": digest,
+            "issues": [list(issue) for issue in issues],
+        }
+
+    def rollover(self) -> ScanCache:
+        """今回参照したエントリを引き継いだ、次の実行用のキャッシュを返す。
+
+        監視モードでポーリングごとに呼び出し、削除されたファイルのエントリを落としつつ
+        メモリ上の結果を再利用する。
+        """
+        cache = ScanCache(self.path, self.fingerprint)
+        cache._entries = self._seen
+        return cache
+
+    def save(self, *, evict: bool = True) -> None:
+        """エントリをアトミックに書き出す。
+
+        ``evict=True`` では今回参照したエントリのみを残し、古いエントリは破棄する。
+        差分スキャンのように一部のファイルしか参照しない場合は ``evict=False`` とし、
+        既存のエントリを保持したまま今回の結果で上書きする。
+        """
+        entries = self._seen if evict else {**self._entries, **self._seen}
+        payload = {"fingerprint": self.fingerprint, "entries": entries}
+        tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        try:
+            tmp.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp, self.path)
+        except OSError:
+            tmp.unlink(missing_ok=True)
+
+
+def scan_file_digest(
+    path: Path, known_digest: str | None = None
+) -> tuple[str, list[Issue] | None] | None:
+    """ファイルを読み込み、内容ハッシュと検出結果を返す。
+
+    内容ハッシュが ``known_digest`` と一致した場合はスキャンを省略し、
+    検出結果として ``None`` を返す（呼び出し側でキャッシュ済みの結果を使う）。
+    読み込めないファイルは ``None`` を返す。
+    """
+    try:
+        size = path.stat().st_size
+    except OSError:
+        return None
+    if size >= MMAP_THRESHOLD_BYTES and size > 0 and get_engine().bytes_compatible:
+        return _scan_mapped(path, known_digest)
+
+    started = time.perf_counter() if _profile is not None else 0.0
+    data = read_bytes_safely(path)
+    if data is None:
+        return None
+    digest = content_digest(data)
+    if _profile is not None:
+        _profile.add_phase("read", time.perf_counter() - started)
+    if digest == known_digest:
+        return digest, None
+    if is_binary(data):
+        return digest, []
+    return digest, scan_text(path, data.decode("utf-8", errors="ignore"))
+
+
+def _scan_mapped(path: Path, known_digest: str | None) -> tuple[str, list[Issue] | None] | None:
+    """大きなファイルをメモリマップし、デコードせずにスキャンする。"""
+    try:
+        started = time.perf_counter() if _profile is not None else 0.0
+        with path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            digest = content_digest(data)
+            if _profile is not None:
+                _profile.add_phase("read", time.perf_counter() - started)
+            if digest == known_digest:
+                return digest, None
+            if is_binary(data):
+                return digest, []
+            return digest, scan_text(path, data)
+    except (OSError, ValueError):
+        return None
+
+
+# ---------------------------------------------------------------------------
+# 並列スキャン
+# ---------------------------------------------------------------------------
+
+# ワーカープロセスへ引き継ぐモジュール設定（spawn 方式でも実行時の変更を反映するため）
+_WORKER_SETTING_NAMES = (
+    "REPO_ROOT",
+    "MMAP_THRESHOLD_BYTES",
+    "FORBIDDEN_IMPORT_PATTERNS",
+    "SECRET_PATTERNS",
+    "URL_PATTERN",
+    "URL_ALLOWLIST_PATTERNS",
+    "FORBIDDEN_PATTERNS",
+)
+
+
+def _scan_profiled(
+    path: Path, known_digest: str | None
+) -> tuple[tuple[str, list[Issue] | None] | None, dict[str, object]]:
+    """``scan_file_digest`` を計測付きで実行し、結果とこのファイル分の計測値を返す。
+
+    ワーカープロセスでも動作するよう、計測値は ``ScanProfile.state()`` の形で返す。
+    """
+    global _profile
+    outer, _profile = _profile, ScanProfile()
+    started = time.perf_counter()
+    try:
+        result = scan_file_digest(path, known_digest)
+        file_profile = _profile
+    finally:
+        _profile = outer
+    file_profile.add_file(path.relative_to(REPO_ROOT).as_posix(), time.perf_counter() - started)
+    return result, file_profile.state()
+
+
+def _init_worker(settings: dict[str, object]) -> None:
+    """ワーカープロセスの初期化。親プロセスの設定を反映する。"""
+    globals().update(settings)
+
+
+def _run_scans(
+    paths: list[Path], known_digests: list[str | None], jobs: int
+) -> Generator[tuple[str, list[Issue] | None] | None, None, None]:
+    """``scan_file_digest`` を逐次または並列に実行し、入力順に結果を返す。
+
+    プロファイル中は各ファイルの計測値も受け取り、親プロセスのプロファイルへ合算する。
+    """
+    profile = _profile
+    if jobs <= 1 or len(paths) < PARALLEL_MIN_FILES:
+        if profile is None:
+            yield from map(scan_file_digest, paths, known_digests)
+            return
+        for result, state in map(_scan_profiled, paths, known_digests):
+            profile.merge(state)
+            yield result
+        return
+
+    settings = {name: globals()[name] for name in _WORKER_SETTING_NAMES}
+    chunksize = max(1, len(paths) // (jobs * PARALLEL_CHUNKS_PER_JOB))
+    with ProcessPoolExecutor(
+        max_workers=jobs, initializer=_init_worker, initargs=(settings,)
+    ) as pool:
+        if profile is None:
+            yield from pool.map(scan_file_digest, paths, known_digests, chunksize=chunksize)
+            return
+        profiled = pool.map(_scan_profiled, paths, known_digests, chunksize=chunksize)
+        for result, state in profiled:
+            profile.merge(state)
+            yield result
+
+
+def scan_contents(
+    paths: list[Path], contents: dict[Path, bytes]
+) -> Generator[list[Issue], None, None]:
+    """読み込み済みの内容（ステージ済みの内容など）をスキャンし、``paths`` の順に結果を返す。
+
+    作業ツリーのファイルとは内容が異なりうるため、キャッシュは使わない。
+    """
+    for path in paths:
+        data = contents.get(path)
+        if data is None or is_binary(data):
+            yield []
             continue
-        for path in root.rglob("*"):
-            if not path.is_file():
-                continue
-            if should_skip(path):
-                continue
-            if is_skipped_file(path):
+        if _profile is None:
+            yield scan_text(path, data.decode("utf-8", errors="ignore"))
+            continue
+        started = time.perf_counter()
+        issues = scan_text(path, data.decode("utf-8", errors="ignore"))
+        _profile.add_file(path.relative_to(REPO_ROOT).as_posix(), time.perf_counter() - started)
+        yield issues
+
+
+def scan_files(
+    paths: list[Path], cache: ScanCache | None = None, jobs: int = 1
+) -> Generator[list[Issue], None, None]:
+    """ファイル群をスキャンし、ファイルごとの検出結果を ``paths`` の順に返す。
+
+    キャッシュの stat 一致で解決できるファイルは親プロセスで処理し、
+    残りを ``jobs`` 個のワーカーに分配する。``ProcessPoolExecutor.map`` は
+    入力順を保つため、出力は逐次実行時と同一になる。
+    途中で反復を打ち切る（ジェネレータを閉じる）と、未着手のスキャンは取り消される。
+    """
+    # キャッシュで解決済みの結果（None はスキャンが必要な枠）
+    resolved: list[list[Issue] | None] = []
+    pending: list[tuple[Path, str, os.stat_result | None]] = []
+    for path in paths:
+        if cache is None:
+            resolved.append(None)
+            pending.append((path, "", None))
+            continue
+        rel = path.relative_to(REPO_ROOT).as_posix()
+        try:
+            st = path.stat()
+        except OSError:
+            resolved.append([])
+            continue
+        hit = cache.lookup_stat(rel, st)
+        resolved.append(hit)
+        if hit is None:
+            pending.append((path, rel, st))
+
+    known = [cache.known_digest(rel) if cache else None for _, rel, _ in pending]
+    results = _run_scans([path for path, _, _ in pending], known, jobs)
+    pending_iter = iter(pending)
+    try:
+        for hit in resolved:
+            if hit is not None:
+                yield hit
                 continue
-            if path.suffix.lower() not in SCAN_EXTENSIONS:
+            _, rel, pending_st = next(pending_iter)
+            result = next(results)
+            if result is None:
+                yield []
                 continue
-            issues.extend(scan_file(path))
+            digest, issues = result
+            if cache is not None and pending_st is not None:
+                if issues is None:  # 内容ハッシュがキャッシュと一致
+                    issues = cache.lookup_digest(rel, digest) or []
+                cache.store(rel, pending_st, digest, issues)
+            yield issues or []
+    finally:
+        # 打ち切り時は Executor.map の未完了タスクを取り消してプールを閉じる
+        results.close()
+
+
+# ---------------------------------------------------------------------------
+# 監視モード
+# ---------------------------------------------------------------------------
+
+
+class PolicyWatcher:
+    """対象ツリーをポーリングし、変更されたファイルだけを再スキャンし続ける。
 
-    if issues:
-        print("[policy_check] FAILED")
-        for i, msg in enumerate(issues, start=1):
-            print(f"  {i}. {msg}")
-        return 1
+    コンパイル済みパターンとファイルごとの検出結果（``ScanCache``）をメモリ上に保持し、
+    ポーリングごとに mtime / size が変わったファイルのみを読み直す。
+    判定は ``status_file`` にアトミックに書き出し、変化がなければ mtime だけを更新して
+    生存を示す。``--status`` はこのファイルを読むだけで判定を返す。
+    """
 
-    print("[policy_check] OK")
-    return 0
+    def __init__(
+        self,
+        cache: ScanCache,
+        status_file: Path,
+        *,
+        enumerator: str = "walk",
+        jobs: int = 1,
+        interval: float = WATCH_INTERVAL_SEC,
+        persist_cache: bool = True,
+    ) -> None:
+        self.cache = cache
+        self.status_file = status_file
+        self.enumerator = enumerator
+        self.jobs = jobs
+        self.interval = interval
+        self.persist_cache = persist_cache
+        self.issues: list[Issue] | None = None
+        self._env_key: tuple[int, int] | None = None
+        self._env_issue: Issue | None = None
+
+    def _check_env(self) -> Issue | None:
+        """.env の検査結果を返す。git のインデックスが変わったときだけ git を呼ぶ。"""
+        try:
+            st = (REPO_ROOT / ".git" / "index").stat()
+            key: tuple[int, int] | None = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            key = None
+        if key is None or key != self._env_key:
+            self._env_key = key
+            self._env_issue = env_issue()
+        return self._env_issue
+
+    def poll(self) -> bool:
+        """1 回分の検査を行い、判定が前回から変わったかを返す。"""
+        issues: list[Issue] = []
+        env = self._check_env()
+        if env is not None:
+            issues.append(env)
+        paths = enumerate_scan_files(self.enumerator)
+        for file_issues in scan_files(paths, self.cache, self.jobs):
+            issues.extend(file_issues)
+
+        changed = issues != self.issues
+        if changed and self.persist_cache:
+            self.cache.save()
+        self.cache = self.cache.rollover()
+        self.issues = issues
+        if changed:
+            self.write_status()
+        else:
+            self.touch_status()
+        return changed
+
+    def write_status(self) -> None:
+        """現在の判定を状態ファイルへアトミックに書き出す。"""
+        payload = {
+            "pid": os.getpid(),
+            "fingerprint": self.cache.fingerprint,
+            "interval": self.interval,
+            "issues": [issue._asdict() for issue in self.issues or []],
+        }
+        tmp = self.status_file.with_name(f"{self.status_file.name}.{os.getpid()}.tmp")
+        try:
+            tmp.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp, self.status_file)
+        except OSError:
+            tmp.unlink(missing_ok=True)
+
+    def touch_status(self) -> None:
+        """判定に変化がないとき、状態ファイルの mtime だけを更新して生存を示す。"""
+        try:
+            os.utime(self.status_file)
+        except OSError:
+            self.write_status()
+
+    def run(self, stream: TextIO | None = None) -> int:
+        """Ctrl-C で停止するまでポーリングを続ける。判定が変わるたびに一覧を表示する。"""
+        print(
+            f"[policy_check] 監視を開始しました（{self.interval:g} 秒間隔、Ctrl-C で終了）",
+            file=sys.stderr,
+        )
+        try:
+            while True:
+                if self.poll():
+                    reporter = Reporter("text", stream)
+                    reporter.start()
+                    for issue in self.issues or []:
+                        reporter.report(issue)
+                    reporter.finish()
+                time.sleep(self.interval)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.status_file.unlink(missing_ok=True)
+        return 0
+
+
+def read_status(status_file: Path, reporter: Reporter) -> int:
+    """監視プロセスが書き出した判定を ``reporter`` へ出力する。
+
+    Returns:
+        0: 違反なし / 1: 違反あり / 2: 監視プロセスが動いていない・パターンが変わった
+    """
+    try:
+        st = status_file.stat()
+        data = json.loads(status_file.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        print("[policy_check] ERROR: 監視プロセスが起動していません（--watch）", file=sys.stderr)
+        return 2
+    stale_sec = max(STATUS_STALE_MIN_SEC, 3 * float(data.get("interval", WATCH_INTERVAL_SEC)))
+    if time.time() - st.st_mtime > stale_sec:
+        print("[policy_check] ERROR: 監視プロセスが応答していません", file=sys.stderr)
+        return 2
+    if data.get("fingerprint") != pattern_fingerprint():
+        print(
+            "[policy_check] ERROR: パターンが変更されました。監視プロセスを再起動してください",
+            file=sys.stderr,
+        )
+        return 2
+
+    reporter.start()
+    for item in data.get("issues", []):
+        reporter.report(Issue(**item))
+    reporter.finish()
+    return 1 if reporter.count else 0
+
+
+# ---------------------------------------------------------------------------
+# メイン
+# ---------------------------------------------------------------------------
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """コマンドライン引数を解析する。"""
+    parser = argparse.ArgumentParser(description="汎用ポリシーチェッカー")
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="結果キャッシュを使わずに全ファイルをスキャンする",
+    )
+    parser.add_argument(
+        "--cache-file",
+        type=Path,
+        default=None,
+        help=f"結果キャッシュの保存先（既定: {CACHE_FILE.name}）",
+    )
+    parser.add_argument(
+        "--mmap-threshold",
+        type=int,
+        default=None,
+        metavar="BYTES",
+        help=f"このサイズ以上のファイルをメモリマップで照合する（既定: {MMAP_THRESHOLD_BYTES}）",
+    )
+    parser.add_argument(
+        "--enumerator",
+        choices=ENUMERATORS,
+        default="walk",
+        help="対象ファイルの列挙方式（walk: ディレクトリ走査 / git: git ls-files、既定: walk）",
+    )
+    parser.add_argument(
+        "-v",
+        "--verbose",
+        action="store_true",
+        help="列挙・スキャンの所要時間を標準エラー出力に表示する",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="並列スキャンのワーカー数（0 で CPU コア数、既定: 1 = 逐次）",
+    )
+    parser.add_argument(
+        "--format",
+        choices=OUTPUT_FORMATS,
+        default="text",
+        help="出力形式（text: 一覧 / jsonl: JSON Lines / sarif: SARIF 2.1.0、既定: text）",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        type=Path,
+        default=None,
+        metavar="PATH",
+        help="検出結果の出力先（既定: 標準出力）",
+    )
+    parser.add_argument(
+        "--max-issues",
+        type=int,
+        default=None,
+        metavar="N",
+        help="N 件検出した時点でスキャンを打ち切る",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="フェーズ・ファイル・パターンごとの所要時間を標準エラー出力に表示する",
+    )
+    parser.add_argument(
+        "--profile-json",
+        type=Path,
+        default=None,
+        metavar="PATH",
+        help="プロファイル結果を JSON で書き出す",
+    )
+    parser.add_argument(
+        "--profile-top",
+        type=int,
+        default=PROFILE_TOP_N,
+        metavar="N",
+        help=f"プロファイルに表示する遅いファイル・パターンの件数（既定: {PROFILE_TOP_N}）",
+    )
+    parser.add_argument(
+        "--status-file",
+        type=Path,
+        default=None,
+        metavar="PATH",
+        help=f"監視モードの状態ファイル（既定: {STATUS_FILE.name}）",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=WATCH_INTERVAL_SEC,
+        metavar="SEC",
+        help=f"監視モードのポーリング間隔（秒、既定: {WATCH_INTERVAL_SEC:g}）",
+    )
+    daemon = parser.add_mutually_exclusive_group()
+    daemon.add_argument(
+        "--watch",
+        action="store_true",
+        help="常駐して変更されたファイルのみを再スキャンし続ける",
+    )
+    daemon.add_argument(
+        "--status",
+        action="store_true",
+        help="監視プロセスの現在の判定を表示する（スキャンは行わない）",
+    )
+    diff_mode = parser.add_mutually_exclusive_group()
+    diff_mode.add_argument(
+        "--since",
+        metavar="REF",
+        default=None,
+        help="REF と作業ツリーの差分で変更されたファイル・行のみを検査する",
+    )
+    diff_mode.add_argument(
+        "--staged",
+        action="store_true",
+        help="ステージ済みの差分で変更されたファイル・行のみを検査する",
+    )
+    args = parser.parse_args(argv)
+    if args.jobs < 0:
+        parser.error("--jobs は 0 以上を指定してください")
+    if args.profile_top < 1:
+        parser.error("--profile-top は 1 以上を指定してください")
+    if args.max_issues is not None and args.max_issues < 1:
+        parser.error("--max-issues は 1 以上を指定してください")
+    if args.interval <= 0:
+        parser.error("--interval は正の値を指定してください")
+    if args.watch and (args.since is not None or args.staged):
+        parser.error("--watch は --since / --staged と併用できません")
+    if args.jobs == 0:
+        args.jobs = os.cpu_count() or 1
+    return args
+
+
+def main(argv: list[str] | None = None) -> int:
+    """ポリシーチェックを実行し、違反があれば非ゼロで終了する。"""
+    global MMAP_THRESHOLD_BYTES
+    args = parse_args(argv)
+    if args.mmap_threshold is not None:
+        MMAP_THRESHOLD_BYTES = args.mmap_threshold
+    if args.watch:
+        return watch(args)
+    if args.output is None:
+        return dispatch(args, Reporter(args.format, sys.stdout))
+    with args.output.open("w", encoding="utf-8") as stream:
+        return dispatch(args, Reporter(args.format, stream))
+
+
+def dispatch(args: argparse.Namespace, reporter: Reporter) -> int:
+    """``--status`` なら監視プロセスの判定を、それ以外は検査結果を出力する。"""
+    if args.status:
+        return read_status(args.status_file or STATUS_FILE, reporter)
+    return run(args, reporter)
+
+
+def watch(args: argparse.Namespace) -> int:
+    """監視モードを開始する。"""
+    cache_file = args.cache_file or CACHE_FILE
+    if args.no_cache:
+        cache = ScanCache(cache_file, pattern_fingerprint())
+    else:
+        cache = ScanCache.load(cache_file, pattern_fingerprint())
+    watcher = PolicyWatcher(
+        cache,
+        args.status_file or STATUS_FILE,
+        enumerator=args.enumerator,
+        jobs=args.jobs,
+        interval=args.interval,
+        persist_cache=not args.no_cache,
+    )
+    # kill / サービス停止時も状態ファイルを片付けてから終了する
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    return watcher.run()
+
+
+def run(args: argparse.Namespace, reporter: Reporter) -> int:
+    """検査を実行し、検出結果を見つかった順に ``reporter`` へ出力する。"""
+    global _profile
+    profiling = args.profile or args.profile_json is not None
+    _profile = ScanProfile() if profiling else None
+    try:
+        return _run(args, reporter)
+    finally:
+        profile, _profile = _profile, None
+        if profile is not None:
+            if args.profile:
+                print(profile.render(args.profile_top), file=sys.stderr)
+            if args.profile_json is not None:
+                args.profile_json.write_text(
+                    json.dumps(profile.to_dict(args.profile_top), ensure_ascii=False, indent=2),
+                    encoding="utf-8",
+                )
+
+
+def _run(args: argparse.Namespace, reporter: Reporter) -> int:
+    """``run`` の本体。"""
+    started = time.perf_counter()
+    cache: ScanCache | None = None
+    if not args.no_cache:
+        with measure("cache_load"):
+            cache = ScanCache.load(args.cache_file or CACHE_FILE, pattern_fingerprint())
+    diff_mode = args.since is not None or args.staged
+
+    # 対象ファイルの列挙（差分モードでは git が報告した変更ファイルのみ）
+    enumerate_started = time.perf_counter()
+    changed_lines: dict[str, set[int]] = {}
+    if diff_mode:
+        try:
+            with measure("git_diff"):
+                changed = git_changed_files(since=args.since, staged=args.staged)
+                changed_lines = git_changed_lines(since=args.since, staged=args.staged)
+        except GitError as exc:
+            print(f"[policy_check] ERROR: 差分を取得できません: {exc}", file=sys.stderr)
+            return 2
+        with measure("enumerate"):
+            paths = [path for path in changed if is_scan_target(path, require_file=not args.staged)]
+    else:
+        with measure("enumerate"):
+            paths = enumerate_scan_files(args.enumerator)
+    enumerated = time.perf_counter()
+    if args.verbose:
+        method = "diff" if diff_mode else args.enumerator
+        elapsed_ms = (enumerated - enumerate_started) * 1000
+        print(
+            f"[policy_check] 列挙: {len(paths)} ファイル {elapsed_ms:.1f} ms ({method})",
+            file=sys.stderr,
+        )
+
+    # --staged ではコミットされる内容（インデックス）を検査する。変更行の番号もインデックス基準
+    staged: dict[Path, bytes] | None = None
+    if args.staged:
+        try:
+            with measure("read"):
+                staged = git_staged_contents(paths)
+        except GitError as exc:
+            print(
+                f"[policy_check] ERROR: ステージ済みの内容を取得できません: {exc}", file=sys.stderr
+            )
+            return 2
+
+    reporter.start()
+    truncated = False
+
+    def emit(issue: Issue) -> bool:
+        """検出結果を出力し、上限に達したら False を返す。"""
+        reporter.report(issue)
+        return args.max_issues is None or reporter.count < args.max_issues
+
+    # パターンのコンパイル（プロファイル時にフェーズとして分離するため先に行う）
+    with measure("compile"):
+        get_engine()
+
+    # .env が git 管理されていないことを確認
+    with measure("git_ls_files"):
+        env = env_issue()
+    if env is not None:
+        truncated = not emit(env)
+
+    # 対象ファイルのスキャン（差分モードでは行単位の検出を変更行に限定する）
+    if not truncated:
+        if staged is not None:
+            scans = scan_contents(paths, staged)
+        else:
+            scans = scan_files(paths, cache, args.jobs)
+        try:
+            for path, file_issues in zip(paths, scans, strict=True):
+                if diff_mode:
+                    rel = path.relative_to(REPO_ROOT).as_posix()
+                    file_issues = filter_changed_lines(rel, file_issues, changed_lines)
+                if not all(emit(issue) for issue in file_issues):
+                    truncated = True
+                    break
+        finally:
+            scans.close()
+
+    reporter.finish()
+    if cache is not None:
+        # 打ち切り時は未スキャンのファイルがあるため、エントリを破棄しない
+        with measure("cache_save"):
+            cache.save(evict=not (diff_mode or truncated))
+    if _profile is not None:
+        _profile.add_phase("total", time.perf_counter() - started)
+    if args.verbose:
+        elapsed_ms = (time.perf_counter() - enumerated) * 1000
+        print(f"[policy_check] スキャン: {elapsed_ms:.1f} ms", file=sys.stderr)
+    if truncated:
+        print(
+            f"[policy_check] {args.max_issues} 件に達したためスキャンを打ち切りました",
+            file=sys.stderr,
+        )
+    return 1 if reporter.count else 0
 
 
 if __name__ == "__main__":
@@ -7,7 +7,7 @@
 #
 # 前提:
 #   - bash 4+
-#   - Python 3.8+ (YAML パース用)
+#   - Python 3.8+ (YAML パース用、PyYAML は不要)
 #   - git
 #
 # 使い方:
@@ -29,44 +29,13 @@ warn()  { echo -e "\033[0;33m[WARN]\033[0m  $*"; }
 error() { echo -e "\033[0;31m[ERROR]\033[0m $*" >&2; }
 ok()    { echo -e "\033[0;32m[OK]\033[0m    $*"; }
 
-# Python で YAML から値を取得する（外部ライブラリ不要、簡易パース）
-yaml_get() {
-    local key="$1"
-    python3 -c "
-import sys, re
-
-# 簡易 YAML パーサー（PyYAML 不要）
-def parse_yaml(filepath):
-    result = {}
-    with open(filepath) as f:
-        current_section = ''
-        for line in f:
-            line = line.rstrip()
-            if not line or line.lstrip().startswith('#'):
-                continue
-            # セクションヘッダ
-            m = re.match(r'^(\w[\w.]*):$', line)
-            if m:
-                current_section = m.group(1)
-                continue
-            # キー: 値（トップレベル）
-            m = re.match(r'^(\w[\w.]*)\s*:\s*(.+)', line)
-            if m:
-                result[m.group(1)] = m.group(2).strip().strip('\"').strip(\"'\")
-                current_section = ''
-                continue
-            # インデントされたキー: 値
-            m = re.match(r'^  (\w[\w.]*)\s*:\s*(.+)', line)
-            if m and current_section:
-                key = f'{current_section}.{m.group(1)}'
-                result[key] = m.group(2).strip().strip('\"').strip(\"'\")
-
-    return result
-
-data = parse_yaml('$CONFIG_FILE')
-key = '$key'
-print(data.get(key, ''))
-" 2>/dev/null || echo ""
+# project-config.yml の全キーを 1 回の python3 呼び出しでシェル変数（CFG_*）として読み込む
+# （src/project_config/loader.py。PyYAML がなくても動作する）
+load_config() {
+    local assignments
+    assignments=$(PYTHONPATH="$REPO_ROOT/src${PYTHONPATH:+:$PYTHONPATH}" \
+        python3 -m project_config.loader --config "$CONFIG_FILE" shell) || return 1
+    eval "$assignments"
 }
 
 # ---------------------------------------------------------------------------
@@ -80,20 +49,25 @@ fi
 
 info "project-config.yml を読み込み中..."
 
-PROJECT_NAME=$(yaml_get "project.name")
-DISPLAY_NAME=$(yaml_get "project.display_name")
-DESCRIPTION=$(yaml_get "project.description")
-OWNER=$(yaml_get "project.owner")
-PACKAGE_NAME=$(yaml_get "source.package_name")
-SRC_DIR=$(yaml_get "source.src_dir")
-LANGUAGE=$(yaml_get "toolchain.language")
-VERSION=$(yaml_get "toolchain.version")
-PKG_MANAGER=$(yaml_get "toolchain.package_manager")
-LINTER=$(yaml_get "toolchain.linter")
-FORMATTER=$(yaml_get "toolchain.formatter")
-TYPE_CHECKER=$(yaml_get "toolchain.type_checker")
-TEST_RUNNER=$(yaml_get "toolchain.test_runner")
-RUN_PREFIX=$(yaml_get "toolchain.run_prefix")
+if ! load_config; then
+    error "project-config.yml の読み込みに失敗しました: $CONFIG_FILE"
+    exit 1
+fi
+
+PROJECT_NAME="${CFG_PROJECT_NAME:-}"
+DISPLAY_NAME="${CFG_PROJECT_DISPLAY_NAME:-}"
+DESCRIPTION="${CFG_PROJECT_DESCRIPTION:-}"
+OWNER="${CFG_PROJECT_OWNER:-}"
+PACKAGE_NAME="${CFG_SOURCE_PACKAGE_NAME:-}"
+SRC_DIR="${CFG_SOURCE_SRC_DIR:-}"
+LANGUAGE="${CFG_TOOLCHAIN_LANGUAGE:-}"
+VERSION="${CFG_TOOLCHAIN_VERSION:-}"
+PKG_MANAGER="${CFG_TOOLCHAIN_PACKAGE_MANAGER:-}"
+LINTER="${CFG_TOOLCHAIN_LINTER:-}"
+FORMATTER="${CFG_TOOLCHAIN_FORMATTER:-}"
+TYPE_CHECKER="${CFG_TOOLCHAIN_TYPE_CHECKER:-}"
+TEST_RUNNER="${CFG_TOOLCHAIN_TEST_RUNNER:-}"
+RUN_PREFIX="${CFG_TOOLCHAIN_RUN_PREFIX:-}"
 
 # デフォルト値
 PROJECT_NAME="${PROJECT_NAME:-my-project}"
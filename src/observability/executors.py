@@ -0,0 +1,37 @@
+"""送信時のスパンをワーカープロセスへ引き継ぐ ``ProcessPoolExecutor``。
+
+``concurrent.futures.process`` は ``multiprocessing`` 一式を読み込み、import に時間がかかるため、
+このモジュールは ``tracing.ContextProcessPoolExecutor`` が参照されたときに初めて読み込まれる。
+"""
+
+import functools
+from collections.abc import Callable
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import ParamSpec, TypeVar, cast
+
+from . import tracing
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+
+class ContextProcessPoolExecutor(ProcessPoolExecutor):
+    """送信時のスパンの子としてタスクを実行する ``ProcessPoolExecutor``。
+
+    ``submit()`` / ``map()`` を呼んだ時点のスパンを W3C Trace Context としてタスクとともに
+    送り、ワーカープロセスで復元してから実行する。ワーカーはタスクの終了ごとに未送信の
+    スパンを送信する（ワーカープロセスは終了時に TracerProvider を停止しないため）。
+
+    fork で起動したワーカー（Linux の既定）は親プロセスの TracerProvider を引き継ぐため、
+    ワーカー側での初期化は不要である。spawn / forkserver では ``initializer`` で
+    ``init_tracer()`` を呼び、ワーカーの TracerProvider を設定すること。
+    """
+
+    def submit(self, fn: Callable[P, R], /, *args: P.args, **kwargs: P.kwargs) -> "Future[R]":
+        carrier = tracing.inject_context()
+        unsampled = tracing._UNSAMPLED.get()
+        if tracing.trace is None and not carrier and not unsampled:
+            # OTel を読み込んでいなければ、ワーカーで送信するスパンもない
+            return super().submit(fn, *args, **kwargs)
+        task = functools.partial(tracing._run_in_context, carrier, unsampled, fn)
+        return cast("Future[R]", super().submit(task, *args, **kwargs))
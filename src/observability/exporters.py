@@ -0,0 +1,381 @@
+"""OTel SDK に依存するスパン送信・診断用のクラスとメトリクスの送信設定。
+
+OTel SDK の import は時間がかかるため、このモジュールは ``tracing.init_tracer()`` の
+呼び出し時（または ``tracing`` 経由でクラスが参照されたとき）に初めて読み込まれる。
+OTel SDK がインストールされていない環境では import できない。
+
+クラス:
+    BoundedBatchSpanProcessor: 上限付きキューで非同期に送信するスパンプロセッサ
+    RingBufferSpanExporter:    直近のスパンをメモリに保持する診断用エクスポータ
+"""
+
+import heapq
+import importlib
+import logging
+import os
+import threading
+import time
+import weakref
+from collections import deque
+from collections.abc import Iterable, Mapping
+from typing import Any, NamedTuple
+
+# fmt: off
+from opentelemetry import context, trace  # type: ignore[import-not-found]
+from opentelemetry.context import _SUPPRESS_INSTRUMENTATION_KEY  # type: ignore[import-not-found]
+from opentelemetry.sdk.metrics.export import (  # type: ignore[import-not-found]
+    ConsoleMetricExporter,
+    PeriodicExportingMetricReader,
+)
+from opentelemetry.sdk.trace import SpanProcessor  # type: ignore[import-not-found]
+from opentelemetry.sdk.trace.export import (  # type: ignore[import-not-found]
+    SpanExporter,
+    SpanExportResult,
+)
+
+# fmt: on
+from .tracing import BatchConfig
+
+logger = logging.getLogger(__name__)
+
+# ---------------------------------------------------------------------------
+# スパンのバッチ送信
+# ---------------------------------------------------------------------------
+
+# OTLP の送信プロトコルとエクスポータの実装モジュール（必要になるまで import しない）
+_OTLP_EXPORTER_MODULES = {
+    "grpc": "opentelemetry.exporter.otlp.proto.grpc.trace_exporter",
+    "http/protobuf": "opentelemetry.exporter.otlp.proto.http.trace_exporter",
+}
+
+
+class BoundedBatchSpanProcessor(SpanProcessor):  # type: ignore[misc]
+    """キュー長に上限を持ち、満杯時は呼び出し元を待たせずにスパンを破棄するプロセッサ。
+
+    ``on_end`` は短いロックでキューに積むだけで、送信はバックグラウンドスレッドで行う。
+    破棄・送信成功・送信失敗の件数を ``stats()`` で取得できる。
+    fork した子プロセスでは送信スレッドを起動し直すため、子プロセスのスパンも送信される。
+    """
+
+    def __init__(self, exporter: Any, config: BatchConfig | None = None) -> None:
+        self._exporter = exporter
+        self._config = config or BatchConfig()
+        self._queue: deque[Any] = deque()
+        self._lock = threading.Lock()
+        self._export_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._shutdown = False
+        self.dropped_spans = 0
+        self.exported_spans = 0
+        self.failed_spans = 0
+        self._start_worker()
+        # 子プロセスでの再初期化はプロセッサの寿命を延ばさないよう弱参照で登録する
+        reinit = weakref.WeakMethod(self._at_fork_reinit)
+        os.register_at_fork(after_in_child=lambda: _call_weak(reinit))
+
+    def _start_worker(self) -> None:
+        self._worker = threading.Thread(
+            target=self._run, name="BoundedBatchSpanProcessor", daemon=True
+        )
+        self._worker.start()
+
+    def _at_fork_reinit(self) -> None:
+        """fork した子プロセスで、ロックとキューを作り直して送信スレッドを起動する。
+
+        子プロセスには送信スレッドが引き継がれず、ロックも fork 時の状態のままとなるため。
+        親から引き継いだスパンは親プロセスが送信するため、子プロセスでは破棄する。
+        """
+        self._queue = deque()
+        self._lock = threading.Lock()
+        self._export_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self.dropped_spans = 0
+        self.exported_spans = 0
+        self.failed_spans = 0
+        if not self._shutdown:
+            self._start_worker()
+
+    def on_start(self, span: Any, parent_context: Any = None) -> None:
+        """スパン開始時は何もしない。"""
+
+    def on_end(self, span: Any) -> None:
+        """サンプリングされたスパンを送信キューに積む（満杯なら破棄する）。"""
+        if not span.context.trace_flags.sampled:
+            return
+        config = self._config
+        with self._lock:
+            if self._shutdown:
+                self.dropped_spans += 1
+                return
+            if len(self._queue) >= config.max_queue_size:
+                self.dropped_spans += 1
+                if config.drop_policy == "drop_newest":
+                    return
+                self._queue.popleft()
+            self._queue.append(span)
+            full = len(self._queue) >= config.max_export_batch_size
+        if full:
+            self._wakeup.set()
+
+    def _run(self) -> None:
+        """送信スレッド。一定間隔、またはキューがバッチサイズに達するたびに送信する。"""
+        delay = self._config.schedule_delay_millis / 1000
+        while not self._shutdown:
+            self._wakeup.wait(delay)
+            self._wakeup.clear()
+            self._export_pending()
+        self._export_pending()
+
+    def _export_pending(self, deadline: float | None = None) -> bool:
+        """キューが空になるまでバッチ単位で送信する。期限を過ぎたら False を返す。"""
+        batch_size = self._config.max_export_batch_size
+        with self._export_lock:
+            while True:
+                if deadline is not None and time.monotonic() > deadline:
+                    return False
+                with self._lock:
+                    count = min(len(self._queue), batch_size)
+                    batch = [self._queue.popleft() for _ in range(count)]
+                if not batch:
+                    return True
+                self._export(batch)
+
+    def _export(self, batch: list[Any]) -> None:
+        """1 バッチを送信する。送信処理自体は計装しない。"""
+        token = context.attach(context.set_value(_SUPPRESS_INSTRUMENTATION_KEY, True))
+        try:
+            result = self._exporter.export(batch)
+        except Exception:
+            logger.exception("スパンの送信に失敗しました")
+            result = None
+        finally:
+            context.detach(token)
+        if result == SpanExportResult.SUCCESS:
+            self.exported_spans += len(batch)
+        else:
+            self.failed_spans += len(batch)
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        """キューに残っているスパンを送信する。"""
+        return self._export_pending(time.monotonic() + timeout_millis / 1000)
+
+    def shutdown(self) -> None:
+        """残りを送信して送信スレッドとエクスポータを停止する。"""
+        with self._lock:
+            if self._shutdown:
+                return
+            self._shutdown = True
+        self._wakeup.set()
+        self._worker.join(self._config.export_timeout_millis / 1000)
+        self._exporter.shutdown()
+
+    def stats(self) -> dict[str, int]:
+        """送信待ち・破棄・送信成功・送信失敗の件数を返す。"""
+        with self._lock:
+            queued = len(self._queue)
+        return {
+            "queued": queued,
+            "dropped": self.dropped_spans,
+            "exported": self.exported_spans,
+            "failed": self.failed_spans,
+        }
+
+
+def _call_weak(method: "weakref.WeakMethod[Any]") -> None:
+    """弱参照先のメソッドがまだ存在すれば呼び出す。"""
+    bound = method()
+    if bound is not None:
+        bound()
+
+
+def create_otlp_exporter(
+    protocol: str = "http/protobuf",
+    endpoint: str | None = None,
+    headers: Mapping[str, str] | None = None,
+    timeout_millis: float = 30000.0,
+) -> Any:
+    """OTLP スパンエクスポータを生成する。
+
+    エクスポータのパッケージは呼び出し時に import する。未インストールの場合は
+    警告を出して ``None`` を返す。
+
+    Args:
+        protocol: ``"grpc"`` または ``"http/protobuf"``。
+        endpoint: 送信先。省略時は ``OTEL_EXPORTER_OTLP_*`` 環境変数またはエクスポータの既定値。
+            ``http/protobuf`` ではパスを含む完全な URL（``.../v1/traces``）を指定する。
+        headers: 送信時に付与するヘッダ（認証トークン等）。
+        timeout_millis: 1 回の送信のタイムアウト（ミリ秒）。
+
+    Raises:
+        ValueError: 未対応のプロトコルが指定された場合。
+    """
+    module_name = _OTLP_EXPORTER_MODULES.get(protocol)
+    if module_name is None:
+        raise ValueError(f"protocol must be one of {tuple(_OTLP_EXPORTER_MODULES)}: {protocol}")
+    try:
+        module = importlib.import_module(module_name)
+    except ImportError:
+        logger.warning("OTLP エクスポータ（%s）未インストール — OTLP 送信無効", protocol)
+        return None
+    return module.OTLPSpanExporter(
+        endpoint=endpoint, headers=dict(headers) if headers else None, timeout=timeout_millis / 1000
+    )
+
+
+# ---------------------------------------------------------------------------
+# インメモリのリングバッファ（ローカル診断用）
+# ---------------------------------------------------------------------------
+
+# latency_percentiles() が既定で算出するパーセンタイル
+_DIAGNOSIS_PERCENTILES = (50, 95, 99)
+
+# エラーとみなす実行結果属性（デコレータの status_key）
+_STATUS_KEYS = ("tool.status", "agent.status")
+
+
+class SpanRecord(NamedTuple):
+    """リングバッファに保持するスパンの要約。"""
+
+    name: str
+    start_ns: int
+    duration_ns: int
+    error: bool
+    trace_id: int
+    span_id: int
+    tool: str | None = None
+
+    @property
+    def duration_ms(self) -> float:
+        """所要時間（ミリ秒）。"""
+        return self.duration_ns / 1e6
+
+
+class RingBufferSpanExporter(SpanExporter):  # type: ignore[misc]
+    """直近 ``capacity`` 件のスパンを要約してメモリに保持するエクスポータ。
+
+    コレクタを置かずに、稼働中のプロセス内でレイテンシの劣化やエラーを調べるために使う。
+    追加は ``deque(maxlen=...)`` への append のみで、古いスパンから自動的に捨てる。
+    """
+
+    def __init__(self, capacity: int = 10000) -> None:
+        if capacity <= 0:
+            raise ValueError(f"capacity must be > 0: {capacity}")
+        self._records: deque[SpanRecord] = deque(maxlen=capacity)
+
+    def export(self, spans: Iterable[Any]) -> Any:
+        """終了したスパンを要約して追加する。"""
+        for span in spans:
+            attributes = span.attributes or {}
+            end = span.end_time or span.start_time
+            self._records.append(
+                SpanRecord(
+                    name=span.name,
+                    start_ns=span.start_time,
+                    duration_ns=end - span.start_time,
+                    error=span.status.status_code == trace.StatusCode.ERROR
+                    or any(attributes.get(key) == "error" for key in _STATUS_KEYS),
+                    trace_id=span.context.trace_id,
+                    span_id=span.context.span_id,
+                    tool=attributes.get("tool.name"),
+                )
+            )
+        return SpanExportResult.SUCCESS
+
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        """保持のみのため何もしない。"""
+        return True
+
+    def shutdown(self) -> None:
+        """保持のみのため何もしない。"""
+
+    def clear(self) -> None:
+        """保持しているスパンを消去する。"""
+        self._records.clear()
+
+    def records(self, name: str | None = None) -> list[SpanRecord]:
+        """保持しているスパンを終了順に返す。``name`` 指定時はそのスパン名のみ。"""
+        # deque のコピーは C 実装内で完結するため、追加と並行してもロック不要
+        records = list(self._records)
+        if name is None:
+            return records
+        return [record for record in records if record.name == name]
+
+    def slowest(self, limit: int = 10, name: str | None = None) -> list[SpanRecord]:
+        """所要時間の長い順に最大 ``limit`` 件を返す。"""
+        return heapq.nlargest(limit, self.records(name), key=lambda record: record.duration_ns)
+
+    def latency_percentiles(
+        self, percentiles: Iterable[int] = _DIAGNOSIS_PERCENTILES
+    ) -> dict[str, dict[str, float]]:
+        """スパン名ごとの所要時間のパーセンタイル（ミリ秒）を返す。
+
+        Returns:
+            ``{スパン名: {"count": 件数, "p50": ..., "p95": ..., "p99": ...}}``
+        """
+        durations: dict[str, list[int]] = {}
+        for record in self.records():
+            durations.setdefault(record.name, []).append(record.duration_ns)
+        summary: dict[str, dict[str, float]] = {}
+        for name, values in sorted(durations.items()):
+            values.sort()
+            stats: dict[str, float] = {"count": len(values)}
+            for pct in percentiles:
+                index = min(len(values) - 1, len(values) * pct // 100)
+                stats[f"p{pct}"] = values[index] / 1e6
+            summary[name] = stats
+        return summary
+
+    def error_rates(self) -> dict[str, float]:
+        """ツール名（``tool.name``）ごとのエラー率を返す。"""
+        totals: dict[str, list[int]] = {}
+        for record in self.records():
+            if record.tool is None:
+                continue
+            counts = totals.setdefault(record.tool, [0, 0])
+            counts[0] += 1
+            counts[1] += record.error
+        return {tool: errors / total for tool, (total, errors) in sorted(totals.items())}
+
+
+# ---------------------------------------------------------------------------
+# メトリクスの送信（記録はデコレータが行う — tracing.configure_metrics を参照）
+# ---------------------------------------------------------------------------
+
+# OTLP のメトリクスエクスポータの実装モジュール
+_OTLP_METRIC_EXPORTER_MODULES = {
+    "grpc": "opentelemetry.exporter.otlp.proto.grpc.metric_exporter",
+    "http/protobuf": "opentelemetry.exporter.otlp.proto.http.metric_exporter",
+}
+
+
+def _metric_readers(
+    enable_console_export: bool,
+    enable_otlp_export: bool,
+    otlp_protocol: str,
+    otlp_endpoint: str | None,
+    otlp_headers: Mapping[str, str] | None,
+    interval_millis: float,
+) -> list[Any]:
+    """トレースと同じ送信先にメトリクスを定期送信するリーダーを生成する。"""
+    exporters: list[Any] = []
+    if enable_console_export:
+        exporters.append(ConsoleMetricExporter())
+    if enable_otlp_export:
+        if otlp_protocol == "http/protobuf" and otlp_endpoint is not None:
+            otlp_endpoint = otlp_endpoint.removesuffix("/v1/traces") + "/v1/metrics"
+        try:
+            module = importlib.import_module(_OTLP_METRIC_EXPORTER_MODULES[otlp_protocol])
+        except ImportError:
+            logger.warning(
+                "OTLP エクスポータ（%s）未インストール — メトリクス送信無効", otlp_protocol
+            )
+        else:
+            exporters.append(
+                module.OTLPMetricExporter(
+                    endpoint=otlp_endpoint, headers=dict(otlp_headers) if otlp_headers else None
+                )
+            )
+    return [
+        PeriodicExportingMetricReader(exporter, export_interval_millis=interval_millis)
+        for exporter in exporters
+    ]
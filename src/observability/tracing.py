@@ -15,12 +15,53 @@ https://opentelemetry.io/docs/specs/semconv/gen-ai/
     trace_agent_operation: エージェント操作のトレース
     trace_tool_execution:  ツール実行のトレース
     trace_llm_call:        LLM 呼び出しのトレース
+
+サンプリング:
+    init_tracer(sample_ratio=..., rate_limits=...) または configure_sampling() で
+    ルートスパンの比率サンプリングとスパン名ごとのレート制限を設定できる。
+    サンプリングされなかった呼び出しはスパンを生成せず、元の関数をそのまま呼び出す。
+
+メトリクス:
+    init_tracer(enable_metrics=True) または configure_metrics() で、デコレータの呼び出しごとに
+    gen_ai.client.operation.duration / gen_ai.client.token.usage と
+    ツール・エージェントの呼び出し回数を記録する。メトリクスはサンプリングの判定より前に
+    記録するため、サンプリングでスパンを記録しなかった呼び出しも集計に含まれる。
+
+コンテキストの伝播:
+    ContextThreadPoolExecutor / ContextProcessPoolExecutor は送信時のスパンをワーカーへ
+    引き継ぐ。子プロセスには context_env() で W3C Trace Context（TRACEPARENT）を渡し、
+    子プロセス側の init_tracer() がそれを親として引き継ぐ。
 """
 
+import contextvars
 import functools
+import importlib.util
+import inspect
+import json
 import logging
-from collections.abc import Callable
-from typing import Any, ParamSpec, TypeVar
+import os
+import random
+import re
+import sys
+import threading
+import time
+import weakref
+from collections.abc import (
+    AsyncGenerator,
+    AsyncIterable,
+    Callable,
+    Generator,
+    Iterable,
+    Iterator,
+    Mapping,
+)
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, ParamSpec, TypeVar, cast
+
+if TYPE_CHECKING:
+    from .exporters import BoundedBatchSpanProcessor, RingBufferSpanExporter
 
 logger = logging.getLogger(__name__)
 
@@ -42,22 +83,370 @@ SERVICE_NAME = __name__.split(".")[0]
 _TRACER_NAME = f"{SERVICE_NAME}.observability"
 
 # ---------------------------------------------------------------------------
-# OTel SDK のオプショナルインポート
+# OTel SDK のオプショナル・遅延インポート
+# OTel の import は数十〜百ミリ秒かかるため、モジュール読み込み時には有無のみを確認し、
+# init_tracer() または計装対象の最初の呼び出しまで import しない。
 # ---------------------------------------------------------------------------
 
-_HAS_OTEL = False
 
-# fmt: off
-try:
-    from opentelemetry import trace  # type: ignore[import-not-found]
-    from opentelemetry.sdk.resources import Resource  # type: ignore[import-not-found]
-    from opentelemetry.sdk.trace import TracerProvider  # type: ignore[import-not-found]
-    from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter  # type: ignore[import-not-found]
+def _find_otel() -> bool:
+    """OTel SDK がインストールされているかを import せずに確認する。"""
+    try:
+        return importlib.util.find_spec("opentelemetry.sdk") is not None
+    except (ImportError, ValueError):
+        return False
+
+
+_HAS_OTEL = _find_otel()
+
+# opentelemetry.trace モジュール（_load_otel() で設定する）
+trace: Any = None
+
+# デコレータが使うトレーサー（最初の get_tracer() 呼び出しで確定する）
+_tracer: Any = None
+
+
+def _load_otel() -> bool:
+    """OTel API を import する。import できなければ以降はトレーシング無効とする。"""
+    global _HAS_OTEL, trace
+    if trace is None and _HAS_OTEL:
+        try:
+            from opentelemetry import trace as otel_trace  # type: ignore[import-not-found]
+        except ImportError:
+            logger.warning("OpenTelemetry の import に失敗しました — トレーシング無効")
+            _HAS_OTEL = False
+        else:
+            trace = otel_trace
+    return trace is not None
+
+
+# 読み込みに時間のかかるクラスは、参照時に定義元のモジュールから読み込む
+# （送信・診断用のクラスは OTel SDK に、プロセスプールは multiprocessing に依存する）
+_LAZY_ATTRIBUTES = {
+    "BoundedBatchSpanProcessor": "exporters",
+    "RingBufferSpanExporter": "exporters",
+    "SpanRecord": "exporters",
+    "create_otlp_exporter": "exporters",
+    "ContextProcessPoolExecutor": "executors",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """``exporters`` / ``executors`` のクラスを遅延インポートで参照できるようにする。"""
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is not None:
+        module = importlib.import_module(f".{module_name}", __package__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# ---------------------------------------------------------------------------
+# サンプリング
+# ---------------------------------------------------------------------------
+
+
+class _TokenBucket:
+    """スパン名ごとのレート制限に使うトークンバケット。
+
+    ``rate`` 個/秒でトークンを補充し、最大 ``max(1, rate)`` 個まで貯める。
+    """
+
+    __slots__ = ("rate", "capacity", "tokens", "updated", "lock")
+
+    def __init__(self, rate: float) -> None:
+        self.rate = rate
+        self.capacity = max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> bool:
+        """トークンを 1 つ消費できれば True を返す。"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens < 1.0:
+                return False
+            self.tokens -= 1.0
+            return True
+
+
+class _Sampling:
+    """ルートスパンのサンプリング設定。
+
+    親スパンを持つ呼び出しは親のサンプリング判定に従い、ここでの判定は行わない。
+    """
+
+    __slots__ = ("ratio", "buckets", "enabled")
+
+    def __init__(self, ratio: float = 1.0, rate_limits: Mapping[str, float] | None = None) -> None:
+        if not 0.0 <= ratio <= 1.0:
+            raise ValueError(f"sample_ratio must be in [0.0, 1.0]: {ratio}")
+        limits = dict(rate_limits or {})
+        for name, rate in limits.items():
+            if rate <= 0.0:
+                raise ValueError(f"rate limit must be > 0.0: {name}={rate}")
+        self.ratio = ratio
+        self.buckets = {name: _TokenBucket(rate) for name, rate in limits.items()}
+        # False の間はサンプリング判定を一切行わない（既定の全件記録）
+        self.enabled = ratio < 1.0 or bool(self.buckets)
+
+    def sample_root(self, name: str) -> bool:
+        """ルートスパン ``name`` を記録するか判定する。"""
+        if self.ratio < 1.0 and random.random() >= self.ratio:
+            return False
+        bucket = self.buckets.get(name)
+        return bucket is None or bucket.acquire()
+
+
+_sampling = _Sampling()
+
+# サンプリングされなかったルート呼び出しの実行中は True（配下の呼び出しも記録しない）
+_UNSAMPLED: ContextVar[bool] = ContextVar("_UNSAMPLED", default=False)
+
+
+def configure_sampling(
+    sample_ratio: float = 1.0,
+    rate_limits: Mapping[str, float] | None = None,
+) -> None:
+    """デコレータのヘッドサンプリングを設定する。
+
+    判定はルート（親スパンのない）呼び出しでのみ行い、子の呼び出しは親の判定に従う。
+    サンプリングされなかった呼び出しはスパンも属性も生成しない。
+
+    Args:
+        sample_ratio: ルートスパンを記録する比率（0.0〜1.0）。
+        rate_limits: スパン名ごとの 1 秒あたりの最大記録数
+            （``trace_llm_call`` のスパン名は ``gen_ai.chat.<モデル名>``）。
+
+    Raises:
+        ValueError: 比率が範囲外、またはレートが正でない場合。
+    """
+    global _sampling
+    _sampling = _Sampling(sample_ratio, rate_limits)
+
+
+# ---------------------------------------------------------------------------
+# メトリクス（GenAI Semantic Conventions）
+# デコレータのラッパーがサンプリングの判定とは関係なく記録するため、スパンを記録しなかった
+# 呼び出しも集計に含まれる。集計は MeterProvider のプロセス内集計に任せる。
+# ---------------------------------------------------------------------------
+
+# LLM 呼び出しのメトリクス属性（デコレート時に決まる値のみで、系列数が増え続けない）
+_LLM_METRIC_KEYS = ("gen_ai.operation.name", "gen_ai.request.model", "gen_ai.system")
+
+
+class _Instruments:
+    """デコレータが記録するメトリクスの計器。"""
+
+    __slots__ = ("duration", "tokens", "tool_calls", "agent_operations")
+
+    def __init__(self, meter: Any) -> None:
+        self.duration = meter.create_histogram(
+            "gen_ai.client.operation.duration", unit="s", description="GenAI operation duration"
+        )
+        self.tokens = meter.create_histogram(
+            "gen_ai.client.token.usage", unit="{token}", description="Number of tokens used"
+        )
+        self.tool_calls = meter.create_counter(
+            "tool.calls", unit="{call}", description="Number of tool executions"
+        )
+        self.agent_operations = meter.create_counter(
+            "agent.operations", unit="{operation}", description="Number of agent operations"
+        )
 
-    _HAS_OTEL = True
-except ImportError:
-    pass
-# fmt: on
+
+# configure_metrics() で設定した計器（None の間はメトリクスを記録しない）
+_instruments: _Instruments | None = None
+
+
+def configure_metrics(meter_provider: Any = None) -> None:
+    """デコレータが記録するメトリクスの MeterProvider を設定する。
+
+    ``init_tracer(enable_metrics=True)`` から呼ばれる。MeterProvider を独自に構成する場合は
+    直接呼び出す。``None`` を渡すと以降は記録しない。
+
+    記録するメトリクス:
+        - gen_ai.client.operation.duration: LLM 呼び出しの所要時間（秒、ヒストグラム）
+        - gen_ai.client.token.usage: 入力・出力トークン数（ヒストグラム、``gen_ai.token.type``）
+        - tool.calls: ツール実行回数（``tool.name`` / ``tool.status``）
+        - agent.operations: エージェント操作回数（``gen_ai.agent.operation`` / ``agent.status``）
+    """
+    global _instruments
+    if meter_provider is None:
+        _instruments = None
+    else:
+        _instruments = _Instruments(meter_provider.get_meter(_TRACER_NAME))
+
+
+class _CallMetric:
+    """ツール・エージェントの呼び出し回数を結果の状態別に数える。"""
+
+    __slots__ = ("counter", "success", "error")
+
+    def __init__(
+        self, counter: str, attributes: Mapping[str, Any], status_key: str, success_value: str
+    ) -> None:
+        self.counter = counter
+        self.success = {**attributes, status_key: success_value}
+        self.error = {**attributes, status_key: "error"}
+
+    def record(
+        self, instruments: _Instruments, started: float, error: BaseException | None, result: Any
+    ) -> None:
+        """呼び出し 1 回分を数える。"""
+        counter = getattr(instruments, self.counter)
+        counter.add(1, self.success if error is None else self.error)
+
+
+class _LLMMetric:
+    """LLM 呼び出しの所要時間とトークン数を記録する。"""
+
+    __slots__ = ("attributes",)
+
+    def __init__(self, attributes: Mapping[str, Any]) -> None:
+        self.attributes = {key: attributes[key] for key in _LLM_METRIC_KEYS}
+
+    def record(
+        self, instruments: _Instruments, started: float, error: BaseException | None, result: Any
+    ) -> None:
+        """非ストリーミング応答の呼び出し 1 回分を記録する。"""
+        usage = None
+        if error is None and not isinstance(result, str | bytes):
+            usage = _response_attributes(result)
+        self.record_usage(instruments, started, error, usage)
+
+    def record_usage(
+        self,
+        instruments: _Instruments,
+        started: float,
+        error: BaseException | None,
+        usage: Mapping[str, Any] | None,
+    ) -> None:
+        """所要時間と、``usage``（応答から取り出した属性）のトークン数を記録する。"""
+        attributes = self.attributes
+        if error is not None:
+            attributes = {**attributes, "error.type": type(error).__qualname__}
+        instruments.duration.record(time.perf_counter() - started, attributes)
+        if not usage:
+            return
+        for token_type in ("input", "output"):
+            count = usage.get(f"gen_ai.usage.{token_type}_tokens")
+            if count is not None:
+                instruments.tokens.record(count, {**attributes, "gen_ai.token.type": token_type})
+
+
+_Metric = _CallMetric | _LLMMetric
+
+
+def _measure(
+    metric: _Metric,
+    instruments: _Instruments,
+    func: Callable[..., Any],
+    args: tuple[Any, ...],
+    kwargs: dict[str, Any],
+) -> Any:
+    """スパンを記録しない呼び出しを、メトリクスだけ記録して実行する。"""
+    started = time.perf_counter()
+    try:
+        result = func(*args, **kwargs)
+    except Exception as exc:
+        metric.record(instruments, started, exc, None)
+        raise
+    metric.record(instruments, started, None, result)
+    return result
+
+
+async def _measure_async(
+    metric: _Metric,
+    instruments: _Instruments,
+    func: Callable[..., Any],
+    args: tuple[Any, ...],
+    kwargs: dict[str, Any],
+) -> Any:
+    """``_measure`` のコルーチン関数版。"""
+    started = time.perf_counter()
+    try:
+        result = await func(*args, **kwargs)
+    except Exception as exc:
+        metric.record(instruments, started, exc, None)
+        raise
+    metric.record(instruments, started, None, result)
+    return result
+
+
+# ---------------------------------------------------------------------------
+# スパンのバッチ送信
+# ---------------------------------------------------------------------------
+
+# キューが満杯のときの破棄方針
+DROP_POLICIES = ("drop_newest", "drop_oldest")
+
+
+@dataclass(frozen=True)
+class BatchConfig:
+    """バッチ送信の設定。
+
+    Attributes:
+        max_queue_size: 送信待ちスパンの上限。超えた分は ``drop_policy`` に従い破棄する。
+        max_export_batch_size: 1 回の送信に含めるスパンの上限。
+        schedule_delay_millis: 送信間隔（ミリ秒）。キューがバッチサイズに達したら即時送信する。
+        export_timeout_millis: 1 回の送信のタイムアウト（ミリ秒）。
+        drop_policy: キュー満杯時に新しいスパンを捨てる ``"drop_newest"``、
+            または古いスパンを捨てる ``"drop_oldest"``。
+    """
+
+    max_queue_size: int = 2048
+    max_export_batch_size: int = 512
+    schedule_delay_millis: float = 5000.0
+    export_timeout_millis: float = 30000.0
+    drop_policy: str = "drop_newest"
+
+    def __post_init__(self) -> None:
+        if self.max_queue_size <= 0:
+            raise ValueError(f"max_queue_size must be > 0: {self.max_queue_size}")
+        if not 0 < self.max_export_batch_size <= self.max_queue_size:
+            raise ValueError(
+                "max_export_batch_size must be in (0, max_queue_size]: "
+                f"{self.max_export_batch_size}"
+            )
+        if self.schedule_delay_millis <= 0 or self.export_timeout_millis <= 0:
+            raise ValueError("schedule_delay_millis / export_timeout_millis must be > 0")
+        if self.drop_policy not in DROP_POLICIES:
+            raise ValueError(f"drop_policy must be one of {DROP_POLICIES}: {self.drop_policy}")
+
+
+# init_tracer() が登録したプロセッサ（get_export_stats() で集計する）
+_span_processors: list["BoundedBatchSpanProcessor"] = []
+
+
+def _shutdown_span_processors() -> None:
+    """前回の ``init_tracer()`` が登録したプロセッサを停止し、集計の対象から外す。"""
+    while _span_processors:
+        _span_processors.pop().shutdown()
+
+
+def get_export_stats() -> dict[str, int]:
+    """``init_tracer()`` が設定したエクスポータの送信待ち・破棄・送信成功・送信失敗件数の合計。"""
+    totals = {"queued": 0, "dropped": 0, "exported": 0, "failed": 0}
+    for processor in _span_processors:
+        for key, value in processor.stats().items():
+            totals[key] += value
+    return totals
+
+
+# ---------------------------------------------------------------------------
+# インメモリのリングバッファ（ローカル診断用）
+# ---------------------------------------------------------------------------
+
+# init_tracer(ring_buffer_size=...) で設定したリングバッファ
+_ring_buffer: "RingBufferSpanExporter | None" = None
+
+
+def get_ring_buffer() -> "RingBufferSpanExporter | None":
+    """``init_tracer()`` が設定したリングバッファを返す（未設定なら ``None``）。"""
+    return _ring_buffer
 
 
 # ---------------------------------------------------------------------------
@@ -69,44 +458,592 @@ def init_tracer(
     service_name: str = SERVICE_NAME,
     *,
     enable_console_export: bool = False,
+    enable_otlp_export: bool = False,
+    otlp_protocol: str = "http/protobuf",
+    otlp_endpoint: str | None = None,
+    otlp_headers: Mapping[str, str] | None = None,
+    batch_config: BatchConfig | None = None,
+    ring_buffer_size: int = 0,
+    enable_metrics: bool = False,
+    metric_export_interval_millis: float = 60000.0,
+    metric_readers: Iterable[Any] = (),
+    sample_ratio: float = 1.0,
+    rate_limits: Mapping[str, float] | None = None,
+    propagate_env: bool = True,
 ) -> None:
     """TracerProvider を初期化する。
 
     OTel SDK がインストールされていない場合は何もしない。
-    現状はコンソール出力（``enable_console_export=True`` 時）のみ対応。
-    OTLP 送信が必要な場合は ``BatchSpanProcessor`` + ``OTLPSpanExporter``
-    を追加する拡張が必要。
+    再度呼び出した場合は、前回設定したエクスポータのプロセッサを停止してから設定し直す。
+    エクスポータは ``BoundedBatchSpanProcessor`` 経由で送信するため、送信先が遅い・
+    停止している場合もスパンの生成側は待たされず、キューが満杯になった分は破棄して
+    ``get_export_stats()`` の ``dropped`` に計上する。
 
     Args:
         service_name: サービス名（リソース属性に設定）。
         enable_console_export: True の場合、コンソールへもスパンを出力する。
+        enable_otlp_export: True の場合、OTLP でスパンを送信する。
+        otlp_protocol: ``"grpc"`` または ``"http/protobuf"``。
+        otlp_endpoint: OTLP の送信先（``create_otlp_exporter`` を参照）。
+        otlp_headers: OTLP 送信時に付与するヘッダ。
+        batch_config: キュー長・バッチサイズ・送信間隔・タイムアウト・破棄方針。
+        ring_buffer_size: 正の値の場合、直近のスパンをこの件数までメモリに保持する
+            （``get_ring_buffer()`` で参照する）。
+        enable_metrics: True の場合、MeterProvider を設定し、デコレータの呼び出しごとに
+            GenAI メトリクス（``configure_metrics`` を参照）を記録する。コンソール・OTLP
+            送信が有効であれば、メトリクスも同じ送信先へ定期送信する。
+        metric_export_interval_millis: メトリクスの送信間隔（ミリ秒）。
+        metric_readers: 追加の MetricReader（Prometheus 連携やテスト用）。
+        sample_ratio: デコレータがルートスパンを記録する比率（0.0〜1.0）。
+        rate_limits: スパン名ごとの 1 秒あたりの最大記録数（ルートスパンのみ）。
+        propagate_env: True の場合、環境変数 ``TRACEPARENT`` / ``TRACESTATE`` が示すスパン
+            （親プロセスが ``context_env()`` で渡したもの）を、このプロセスのスパンの親とする。
+
+    Raises:
+        ValueError: サンプリング設定、または OTLP のプロトコルが不正な場合。
     """
-    if not _HAS_OTEL:
+    global _ring_buffer
+    configure_sampling(sample_ratio, rate_limits)
+    if not _load_otel():
         logger.info("OpenTelemetry SDK 未インストール — トレーシング無効")
         return
+    _shutdown_span_processors()
+    # 前回の Provider のリングバッファは新しいスパンを受け取らないため、設定し直すまで参照させない
+    _ring_buffer = None
+
+    # fmt: off
+    from opentelemetry import metrics  # type: ignore[import-not-found]
+    from opentelemetry.sdk.metrics import MeterProvider  # type: ignore[import-not-found]
+    from opentelemetry.sdk.resources import Resource  # type: ignore[import-not-found]
+    from opentelemetry.sdk.trace import TracerProvider  # type: ignore[import-not-found]
+    from opentelemetry.sdk.trace.export import (  # type: ignore[import-not-found]
+        ConsoleSpanExporter,
+        SimpleSpanProcessor,
+    )
+
+    # fmt: on
+    from .exporters import (
+        BoundedBatchSpanProcessor,
+        RingBufferSpanExporter,
+        _metric_readers,
+        create_otlp_exporter,
+    )
 
     resource = Resource.create({"service.name": service_name})
     provider = TracerProvider(resource=resource)
+    config = batch_config or BatchConfig()
 
+    exporters: list[Any] = []
     if enable_console_export:
-        provider.add_span_processor(BatchSpanProcessor(ConsoleSpanExporter()))
+        exporters.append(ConsoleSpanExporter())
+    if enable_otlp_export:
+        exporter = create_otlp_exporter(
+            otlp_protocol, otlp_endpoint, otlp_headers, config.export_timeout_millis
+        )
+        if exporter is not None:
+            exporters.append(exporter)
+    for exporter in exporters:
+        processor = BoundedBatchSpanProcessor(exporter, config)
+        provider.add_span_processor(processor)
+        _span_processors.append(processor)
+    if ring_buffer_size > 0:
+        # 追加は deque への append のみのため、バッチ化せず終了時に同期で渡す
+        _ring_buffer = RingBufferSpanExporter(ring_buffer_size)
+        provider.add_span_processor(SimpleSpanProcessor(_ring_buffer))
+    if enable_metrics:
+        readers = _metric_readers(
+            enable_console_export,
+            enable_otlp_export,
+            otlp_protocol,
+            otlp_endpoint,
+            otlp_headers,
+            metric_export_interval_millis,
+        )
+        meter_provider = MeterProvider(
+            metric_readers=[*readers, *metric_readers], resource=resource
+        )
+        metrics.set_meter_provider(meter_provider)
+        configure_metrics(meter_provider)
 
-    # OTLP エクスポータは未設定。プロジェクトの要件に応じて拡張すること。
     trace.set_tracer_provider(provider)
+    if propagate_env:
+        _attach_env_context(os.environ)
     logger.info("TracerProvider 初期化完了: service=%s", service_name)
 
 
 def get_tracer() -> Any:
     """トレーサーのインスタンスを取得する。
 
-    OTel SDK 未導入時は ``None`` を返す。
+    初回呼び出し時に OTel API を import する。OTel SDK 未導入時は ``None`` を返す。
+    ``init_tracer()`` より前に取得したトレーサーも、初期化後は設定された
+    TracerProvider に委譲する。
 
     Returns:
         trace.Tracer または None。
     """
-    if not _HAS_OTEL:
-        return None
-    return trace.get_tracer(_TRACER_NAME)
+    global _tracer
+    if _tracer is None and _load_otel():
+        _tracer = trace.get_tracer(_TRACER_NAME)
+    return _tracer
+
+
+# サンプリング判定の結果
+_TRACE = 0  # スパンを生成する
+_PASSTHROUGH = 1  # 親の判定に従い記録しない
+_UNSAMPLED_ROOT = 2  # ルートとして記録しないと判定した（配下も記録しない）
+
+
+def _decide(name: str) -> int:
+    """サンプリング有効時に、この呼び出しを記録するか判定する。"""
+    if _UNSAMPLED.get():
+        return _PASSTHROUGH
+    parent = trace.get_current_span().get_span_context()
+    if parent.is_valid:
+        return _TRACE if parent.trace_flags.sampled else _PASSTHROUGH
+    return _TRACE if _sampling.sample_root(name) else _UNSAMPLED_ROOT
+
+
+class _UnsampledScope:
+    """ブロック内の呼び出しを記録しない（``_UNSAMPLED`` を立てる）コンテキスト。"""
+
+    __slots__ = ("token",)
+
+    def __enter__(self) -> None:
+        self.token = _UNSAMPLED.set(True)
+
+    def __exit__(self, *exc_info: object) -> None:
+        _UNSAMPLED.reset(self.token)
+
+
+def _instrument(
+    func: Callable[P, R],
+    name: str,
+    attributes: dict[str, Any],
+    status_key: str,
+    success_value: str,
+    metric: _Metric,
+    on_result: Callable[[Any, Any], None] | None = None,
+    on_call: Callable[[Any, tuple[Any, ...], dict[str, Any]], None] | None = None,
+) -> Callable[P, R]:
+    """``func`` をスパンで囲むラッパーを生成する。
+
+    スパン名と属性はデコレート時に確定させ、呼び出しごとには組み立てない。
+    トレーサーは最初の呼び出し時に取得する（デコレート時には OTel を import しない）。
+    サンプリングが有効な場合、記録しない呼び出しはスパンを生成せずに ``func`` を呼ぶ。
+    メトリクスが設定されていれば、スパンを記録しない呼び出しも ``metric`` で記録する。
+
+    コルーチン関数・非同期ジェネレータ関数・ジェネレータ関数はそれぞれ同種のラッパーで
+    包み、スパンを ``await`` / ``yield`` をまたいで完了まで開いたままにする。
+    ``on_result(span, result)`` は関数・コルーチンの正常終了時に呼ばれ、戻り値から
+    属性を追加できる。``on_call(span, args, kwargs)`` はスパンの開始直後に呼ばれ、
+    引数から属性を追加できる（記録しない呼び出しでは呼ばれない）。
+    """
+    if inspect.iscoroutinefunction(func):
+        wrapper: Callable[..., Any] = _instrument_coroutine(
+            func, name, attributes, status_key, success_value, metric, on_result, on_call
+        )
+    elif inspect.isasyncgenfunction(func):
+        wrapper = _instrument_async_generator(
+            func, name, attributes, status_key, success_value, metric, on_call
+        )
+    elif inspect.isgeneratorfunction(func):
+        wrapper = _instrument_generator(
+            func, name, attributes, status_key, success_value, metric, on_call
+        )
+    else:
+        wrapper = _instrument_function(
+            func, name, attributes, status_key, success_value, metric, on_result, on_call
+        )
+    return cast("Callable[P, R]", functools.wraps(func)(wrapper))
+
+
+def _instrument_function(
+    func: Callable[..., Any],
+    name: str,
+    attributes: dict[str, Any],
+    status_key: str,
+    success_value: str,
+    metric: _Metric,
+    on_result: Callable[[Any, Any], None] | None = None,
+    on_call: Callable[[Any, tuple[Any, ...], dict[str, Any]], None] | None = None,
+) -> Callable[..., Any]:
+    """同期関数用のラッパーを生成する。"""
+
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        tracer = _tracer or get_tracer()
+        if tracer is None:
+            return func(*args, **kwargs)
+        instruments = _instruments
+        if _sampling.enabled:
+            decision = _decide(name)
+            if decision != _TRACE and instruments is not None:
+                with _UnsampledScope():
+                    return _measure(metric, instruments, func, args, kwargs)
+            if decision == _PASSTHROUGH:
+                return func(*args, **kwargs)
+            if decision == _UNSAMPLED_ROOT:
+                with _UnsampledScope():
+                    return func(*args, **kwargs)
+
+        started = time.perf_counter()
+        with tracer.start_as_current_span(name, attributes=attributes) as span:
+            if on_call is not None:
+                on_call(span, args, kwargs)
+            try:
+                result = func(*args, **kwargs)
+                span.set_attribute(status_key, success_value)
+                if on_result is not None:
+                    on_result(span, result)
+            except Exception as exc:
+                span.set_attribute(status_key, "error")
+                span.record_exception(exc)
+                if instruments is not None:
+                    metric.record(instruments, started, exc, None)
+                raise
+            if instruments is not None:
+                metric.record(instruments, started, None, result)
+            return result
+
+    return wrapper
+
+
+def _instrument_coroutine(
+    func: Callable[..., Any],
+    name: str,
+    attributes: dict[str, Any],
+    status_key: str,
+    success_value: str,
+    metric: _Metric,
+    on_result: Callable[[Any, Any], None] | None = None,
+    on_call: Callable[[Any, tuple[Any, ...], dict[str, Any]], None] | None = None,
+) -> Callable[..., Any]:
+    """コルーチン関数用のラッパーを生成する。スパンは ``await`` 完了時に閉じる。"""
+
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        tracer = _tracer or get_tracer()
+        if tracer is None:
+            return await func(*args, **kwargs)
+        instruments = _instruments
+        if _sampling.enabled:
+            decision = _decide(name)
+            if decision != _TRACE and instruments is not None:
+                with _UnsampledScope():
+                    return await _measure_async(metric, instruments, func, args, kwargs)
+            if decision == _PASSTHROUGH:
+                return await func(*args, **kwargs)
+            if decision == _UNSAMPLED_ROOT:
+                with _UnsampledScope():
+                    return await func(*args, **kwargs)
+
+        # コンテキストはタスクごとに独立しているため、並行実行中の他の呼び出しと混ざらない
+        started = time.perf_counter()
+        with tracer.start_as_current_span(name, attributes=attributes) as span:
+            if on_call is not None:
+                on_call(span, args, kwargs)
+            try:
+                result = await func(*args, **kwargs)
+                span.set_attribute(status_key, success_value)
+                if on_result is not None:
+                    on_result(span, result)
+            except Exception as exc:
+                span.set_attribute(status_key, "error")
+                span.record_exception(exc)
+                if instruments is not None:
+                    metric.record(instruments, started, exc, None)
+                raise
+            if instruments is not None:
+                metric.record(instruments, started, None, result)
+            return result
+
+    return wrapper
+
+
+def _resume_scope(span: Any) -> Any:
+    """ジェネレータを 1 ステップ進める間だけスパン（または非記録状態）を有効にする。"""
+    if span is None:
+        return _UnsampledScope()
+    return trace.use_span(span, record_exception=False, set_status_on_exception=False)
+
+
+def _instrument_generator(
+    func: Callable[..., Any],
+    name: str,
+    attributes: dict[str, Any],
+    status_key: str,
+    success_value: str,
+    metric: _Metric,
+    on_call: Callable[[Any, tuple[Any, ...], dict[str, Any]], None] | None = None,
+) -> Callable[..., Any]:
+    """ジェネレータ関数用のラッパーを生成する。
+
+    スパンは最初の ``next()`` で開始し、ジェネレータの終了（枯渇・例外・``close()``）で
+    閉じる。``yield`` で呼び出し元に制御を返している間はスパンを現在のコンテキストから
+    外すため、呼び出し元のスパンの親子関係を乱さない。``send()`` / ``throw()`` も中継する。
+    メトリクスはジェネレータの終了時に記録する。
+    """
+
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        tracer = _tracer or get_tracer()
+        if tracer is None:
+            decision = _PASSTHROUGH
+        else:
+            decision = _decide(name) if _sampling.enabled else _TRACE
+        instruments = _instruments if tracer is not None else None
+        if decision == _PASSTHROUGH and instruments is None:
+            return (yield from func(*args, **kwargs))
+
+        started = time.perf_counter()
+        span = tracer.start_span(name, attributes=attributes) if decision == _TRACE else None
+        if span is not None and on_call is not None:
+            on_call(span, args, kwargs)
+        gen = func(*args, **kwargs)
+        sent: Any = None
+        thrown: BaseException | None = None
+        error: BaseException | None = None
+        try:
+            while True:
+                with _resume_scope(span):
+                    try:
+                        if thrown is None:
+                            value = gen.send(sent)
+                        else:
+                            value, thrown = gen.throw(thrown), None
+                    except StopIteration as stop:
+                        if span is not None:
+                            span.set_attribute(status_key, success_value)
+                        return stop.value
+                try:
+                    sent = yield value
+                except GeneratorExit:
+                    # 呼び出し元が途中で反復をやめた（正常な打ち切り）
+                    with _resume_scope(span):
+                        gen.close()
+                    if span is not None:
+                        span.set_attribute(status_key, success_value)
+                    raise
+                except BaseException as exc:
+                    sent, thrown = None, exc
+        except Exception as exc:
+            error = exc
+            if span is not None:
+                span.set_attribute(status_key, "error")
+                span.record_exception(exc)
+            raise
+        finally:
+            if span is not None:
+                span.end()
+            if instruments is not None:
+                metric.record(instruments, started, error, None)
+
+    return wrapper
+
+
+def _instrument_async_generator(
+    func: Callable[..., Any],
+    name: str,
+    attributes: dict[str, Any],
+    status_key: str,
+    success_value: str,
+    metric: _Metric,
+    on_call: Callable[[Any, tuple[Any, ...], dict[str, Any]], None] | None = None,
+) -> Callable[..., Any]:
+    """非同期ジェネレータ関数用のラッパーを生成する（ジェネレータ版と同じ方針）。"""
+
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        tracer = _tracer or get_tracer()
+        if tracer is None:
+            decision = _PASSTHROUGH
+        else:
+            decision = _decide(name) if _sampling.enabled else _TRACE
+        instruments = _instruments if tracer is not None else None
+        if decision == _PASSTHROUGH and instruments is None:
+            async for item in func(*args, **kwargs):
+                yield item
+            return
+
+        started = time.perf_counter()
+        span = tracer.start_span(name, attributes=attributes) if decision == _TRACE else None
+        if span is not None and on_call is not None:
+            on_call(span, args, kwargs)
+        agen = func(*args, **kwargs)
+        sent: Any = None
+        thrown: BaseException | None = None
+        error: BaseException | None = None
+        try:
+            while True:
+                with _resume_scope(span):
+                    try:
+                        if thrown is None:
+                            value = await agen.asend(sent)
+                        else:
+                            value, thrown = await agen.athrow(thrown), None
+                    except StopAsyncIteration:
+                        if span is not None:
+                            span.set_attribute(status_key, success_value)
+                        return
+                try:
+                    sent = yield value
+                except GeneratorExit:
+                    with _resume_scope(span):
+                        await agen.aclose()
+                    if span is not None:
+                        span.set_attribute(status_key, success_value)
+                    raise
+                except BaseException as exc:
+                    sent, thrown = None, exc
+        except Exception as exc:
+            error = exc
+            if span is not None:
+                span.set_attribute(status_key, "error")
+                span.record_exception(exc)
+            raise
+        finally:
+            if span is not None:
+                span.end()
+            if instruments is not None:
+                metric.record(instruments, started, error, None)
+
+    return wrapper
+
+
+# ---------------------------------------------------------------------------
+# コンテキストの伝播（スレッドプール・プロセスプール・サブプロセス）
+# 現在のスパンは contextvars で保持するため、ワーカースレッドや子プロセスには引き継がれず、
+# 並列処理のスパンが別々のルートスパンになる。以下で明示的に引き継ぐ。
+# ---------------------------------------------------------------------------
+
+# 子プロセスへ W3C Trace Context を渡す環境変数
+TRACEPARENT_ENV = "TRACEPARENT"
+TRACESTATE_ENV = "TRACESTATE"
+
+# W3C Trace Context の伝播器（最初の使用時に生成する）
+_propagator: Any = None
+
+# init_tracer() が環境変数から引き継いだコンテキストの attach トークン
+_env_context_token: Any = None
+
+
+def _get_propagator() -> Any:
+    """W3C Trace Context の伝播器を返す（初回のみ OTel から import する）。"""
+    global _propagator
+    if _propagator is None:
+        # fmt: off
+        from opentelemetry.trace.propagation.tracecontext import (  # type: ignore[import-not-found]
+            TraceContextTextMapPropagator,
+        )
+
+        # fmt: on
+        _propagator = TraceContextTextMapPropagator()
+    return _propagator
+
+
+def inject_context() -> dict[str, str]:
+    """現在のスパンを W3C Trace Context（``traceparent`` / ``tracestate``）として返す。
+
+    有効なスパンがない場合は空の辞書を返す。OTel が読み込まれていなければ現在のスパンは
+    存在しないため、OTel を import せずに空の辞書を返す。
+    """
+    carrier: dict[str, str] = {}
+    if trace is None and "opentelemetry.trace" not in sys.modules:
+        return carrier
+    if _load_otel():
+        _get_propagator().inject(carrier)
+    return carrier
+
+
+def context_env(env: Mapping[str, str] | None = None) -> dict[str, str]:
+    """現在のスパンを子プロセスに引き継ぐ環境変数を返す。
+
+    ``env``（省略時は ``os.environ``）の複製に ``TRACEPARENT`` / ``TRACESTATE`` を設定する。
+    子プロセスで ``init_tracer()`` を呼ぶと、子プロセスのスパンは現在のスパンの子となる。
+    現在のスパンがなければ ``env`` の値をそのまま引き継ぐ。
+
+    使用方法::
+
+        subprocess.run(["python", "-m", "tool"], env=context_env(), check=True)
+    """
+    result = dict(os.environ if env is None else env)
+    carrier = inject_context()
+    if "traceparent" in carrier:
+        result[TRACEPARENT_ENV] = carrier["traceparent"]
+        if "tracestate" in carrier:
+            result[TRACESTATE_ENV] = carrier["tracestate"]
+        else:
+            result.pop(TRACESTATE_ENV, None)
+    return result
+
+
+def _attach_env_context(environ: Mapping[str, str]) -> None:
+    """環境変数 ``TRACEPARENT`` のスパンを、このプロセスの親コンテキストとして設定する。"""
+    global _env_context_token
+    traceparent = environ.get(TRACEPARENT_ENV)
+    if not traceparent or _env_context_token is not None:
+        return
+    carrier = {"traceparent": traceparent}
+    tracestate = environ.get(TRACESTATE_ENV)
+    if tracestate:
+        carrier["tracestate"] = tracestate
+    parent = _get_propagator().extract(carrier)
+    if not trace.get_current_span(parent).get_span_context().is_valid:
+        logger.warning("不正な %s を無視します: %r", TRACEPARENT_ENV, traceparent)
+        return
+
+    from opentelemetry import context as otel_context  # type: ignore[import-not-found]
+
+    _env_context_token = otel_context.attach(parent)
+    logger.info("親プロセスのトレースを引き継ぎました: %s", traceparent)
+
+
+class ContextThreadPoolExecutor(ThreadPoolExecutor):
+    """送信時のコンテキストでタスクを実行する ``ThreadPoolExecutor``。
+
+    ``submit()`` / ``map()`` を呼んだ時点の contextvars（現在のスパンとサンプリングの
+    判定）を複製してワーカースレッドで実行するため、タスク内のスパンは送信元のスパンの子となり、
+    サンプリングされなかった呼び出しから送信したタスクは記録されない。
+    """
+
+    def submit(self, fn: Callable[P, R], /, *args: P.args, **kwargs: P.kwargs) -> "Future[R]":
+        task = functools.partial(contextvars.copy_context().run, fn)
+        return super().submit(task, *args, **kwargs)
+
+
+def _run_in_context(
+    carrier: dict[str, str],
+    unsampled: bool,
+    fn: Callable[..., R],
+    /,
+    *args: Any,
+    **kwargs: Any,
+) -> R:
+    """ワーカープロセスで、送信元のスパン（またはサンプリングの判定）を復元して実行する。
+
+    ワーカープロセスは終了時に TracerProvider を停止しないため、タスクごとに送信しておく。
+    """
+    try:
+        if unsampled:
+            with _UnsampledScope():
+                return fn(*args, **kwargs)
+        if not carrier or not _load_otel():
+            return fn(*args, **kwargs)
+
+        from opentelemetry import context as otel_context  # type: ignore[import-not-found]
+
+        token = otel_context.attach(_get_propagator().extract(carrier))
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            otel_context.detach(token)
+    finally:
+        _flush_spans()
+
+
+def _flush_spans() -> None:
+    """TracerProvider が保持している未送信のスパンを送信する（OTel 未読み込みなら何もしない）。"""
+    if trace is None:
+        return
+    force_flush = getattr(trace.get_tracer_provider(), "force_flush", None)
+    if force_flush is not None:
+        force_flush()
 
 
 # ---------------------------------------------------------------------------
@@ -142,34 +1079,171 @@ def trace_agent_operation(
     """
 
     def decorator(func: Callable[P, R]) -> Callable[P, R]:
-        tracer = get_tracer()
-        if tracer is None:
+        if not _HAS_OTEL:
             return func
 
-        @functools.wraps(func)
-        def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
-            name = operation_name or func.__qualname__
-            with tracer.start_as_current_span(
-                name,
-                attributes={
-                    "gen_ai.agent.operation": name,
-                    "gen_ai.system": SERVICE_NAME,
-                },
-            ) as span:
-                try:
-                    result = func(*args, **kwargs)
-                    span.set_attribute("agent.status", "success")
-                    return result
-                except Exception as exc:
-                    span.set_attribute("agent.status", "error")
-                    span.record_exception(exc)
-                    raise
-
-        return wrapper
+        name = operation_name or func.__qualname__
+        attributes = {
+            "gen_ai.agent.operation": name,
+            "gen_ai.system": SERVICE_NAME,
+        }
+        metric = _CallMetric(
+            "agent_operations", {"gen_ai.agent.operation": name}, "agent.status", "success"
+        )
+        return _instrument(func, name, attributes, "agent.status", "success", metric)
 
     return decorator
 
 
+# ---------------------------------------------------------------------------
+# ツールの引数・戻り値の取得
+# 大きなペイロードをそのまま直列化すると呼び出しごとのコストが大きいため、
+# 記録中のスパンに対してのみ、上限までの部分だけを直列化する。
+# ---------------------------------------------------------------------------
+
+# 引数・戻り値の属性 1 つあたりの既定の最大文字数
+DEFAULT_CAPTURE_MAX_LENGTH = 1024
+
+# 値に含まれていれば伏せる秘密情報のパターン（ci/policy_check.py の SECRET_PATTERNS に準じる。
+# 秘密鍵は鍵本体を残さないよう、終端行（切り詰められていれば文字列の末尾）までを対象とする）
+REDACT_VALUE_PATTERNS: tuple[str, ...] = (
+    r"AKIA[0-9A-Z]{16}",  # AWS Access Key ID
+    r"-----BEGIN\s+(RSA|DSA|EC|OPENSSH)\s+PRIVATE\s+KEY-----[\s\S]*?(-----END[^-]*-----|\Z)",
+    r"ghp_[A-Za-z0-9_]{36,}",  # GitHub Personal Access Token
+    r"sk-[A-Za-z0-9]{32,}",  # 汎用 API キー
+)
+
+# 名前が一致する引数・辞書キーの値は内容を見ずに伏せる（大文字小文字を区別しない部分一致。
+# token は max_tokens / total_tokens 等の件数を伏せないよう、名前の末尾に限る）
+REDACT_KEY_PATTERN = (
+    r"passw(or)?d|secret|token$|api[_-]?key|authorization|credential|private[_-]?key|cookie"
+)
+
+_REDACTED = "[REDACTED]"
+_TRUNCATED = "…[truncated]"
+
+# 切り詰め位置をまたぐ秘密情報も伏せられるよう、上限からこの文字数先まで照合してから切り詰める
+_REDACT_LOOKAHEAD = 256
+
+# 入れ子の辿る深さの上限
+_CAPTURE_MAX_DEPTH = 6
+
+_redact_values = re.compile("|".join(f"(?:{p})" for p in REDACT_VALUE_PATTERNS))
+_redact_keys = re.compile(REDACT_KEY_PATTERN, re.IGNORECASE)
+
+
+def configure_redaction(
+    value_patterns: Iterable[str] = REDACT_VALUE_PATTERNS,
+    key_pattern: str = REDACT_KEY_PATTERN,
+) -> None:
+    """引数・戻り値の取得時に伏せる値のパターンとキー名のパターンを設定する。
+
+    Raises:
+        re.error: パターンが正規表現として不正な場合。
+    """
+    global _redact_values, _redact_keys
+    patterns = list(value_patterns)
+    # パターンがなければ何にも一致しない正規表現とする
+    _redact_values = re.compile("|".join(f"(?:{p})" for p in patterns) if patterns else "(?!)")
+    _redact_keys = re.compile(key_pattern, re.IGNORECASE)
+
+
+class _Pruner:
+    """直列化する前に、値を文字数の予算内に収まる JSON 互換の値に変換する。
+
+    予算を使い切った以降の要素は ``"…"`` に置き換えるため、巨大な引数でも処理量は
+    予算に比例する。名前が ``_redact_keys`` に一致する辞書キーの値と、文字列中の
+    ``_redact_values`` に一致する部分は、JSON のエスケープ前の値に対して伏せる。
+    """
+
+    __slots__ = ("remaining",)
+
+    def __init__(self, budget: int) -> None:
+        self.remaining = budget
+
+    def prune(self, value: Any, depth: int = 0) -> Any:
+        if value is None or isinstance(value, bool | int | float):
+            self.remaining -= 8
+            return value
+        if isinstance(value, str):
+            text = _redact_values.sub(_REDACTED, value[: max(self.remaining, 0)])
+            self.remaining -= len(text) + 2
+            return text
+        if isinstance(value, bytes | bytearray):
+            return self.prune(f"<{len(value)} bytes>")
+        if depth >= _CAPTURE_MAX_DEPTH:
+            return self.prune("…")
+        if isinstance(value, Mapping):
+            mapping: dict[str, Any] = {}
+            for key, item in value.items():
+                if self.remaining <= 0:
+                    mapping["…"] = "…"
+                    break
+                text = str(key)
+                name = self.prune(text)
+                if _redact_keys.search(text):
+                    mapping[name] = _REDACTED
+                else:
+                    mapping[name] = self.prune(item, depth + 1)
+            return mapping
+        if isinstance(value, list | tuple | set | frozenset):
+            items: list[Any] = []
+            for item in value:
+                if self.remaining <= 0:
+                    items.append("…")
+                    break
+                items.append(self.prune(item, depth + 1))
+            return items
+        return self.prune(repr(value))
+
+
+def _serialize(value: Any, max_length: int) -> str:
+    """``value`` の秘密情報を伏せて JSON 文字列にし、``max_length`` 文字に切り詰める。"""
+    pruned = _Pruner(max_length + _REDACT_LOOKAHEAD).prune(value)
+    text = json.dumps(pruned, ensure_ascii=False)
+    if len(text) > max_length:
+        return text[:max_length] + _TRUNCATED
+    return text
+
+
+def _argument_capture(
+    func: Callable[..., Any], max_length: int
+) -> Callable[[Any, tuple[Any, ...], dict[str, Any]], None]:
+    """引数を引数名つきで ``tool.arguments`` 属性に記録する ``on_call`` を生成する。"""
+    signature = inspect.signature(func)
+
+    def capture(span: Any, args: tuple[Any, ...], kwargs: dict[str, Any]) -> None:
+        if not span.is_recording():
+            return
+        try:
+            try:
+                arguments = dict(signature.bind_partial(*args, **kwargs).arguments)
+            except TypeError:
+                # 引数が合わない呼び出しは関数側で例外となるため、そのまま記録する
+                arguments = {"args": args, "kwargs": kwargs}
+            arguments.pop("self", None)
+            arguments.pop("cls", None)
+            span.set_attribute("tool.arguments", _serialize(arguments, max_length))
+        except Exception:
+            logger.debug("ツールの引数を記録できませんでした", exc_info=True)
+
+    return capture
+
+
+def _result_capture(max_length: int) -> Callable[[Any, Any], None]:
+    """戻り値を ``tool.result`` 属性に記録する ``on_result`` を生成する。"""
+
+    def capture(span: Any, result: Any) -> None:
+        if not span.is_recording():
+            return
+        try:
+            span.set_attribute("tool.result", _serialize(result, max_length))
+        except Exception:
+            logger.debug("ツールの戻り値を記録できませんでした", exc_info=True)
+
+    return capture
+
+
 # ---------------------------------------------------------------------------
 # デコレータ: ツール実行
 # ---------------------------------------------------------------------------
@@ -177,6 +1251,10 @@ def trace_agent_operation(
 
 def trace_tool_execution(
     tool_name: str | None = None,
+    *,
+    capture_args: bool = False,
+    capture_result: bool = False,
+    max_attribute_length: int = DEFAULT_CAPTURE_MAX_LENGTH,
 ) -> Callable[[Callable[P, R]], Callable[P, R]]:
     """ツール実行をトレースするデコレータ。
 
@@ -187,48 +1265,503 @@ def trace_tool_execution(
     記録する属性:
         - tool.name: ツール名
         - tool.status: 実行結果（"success" / "error"）
-        - ツールの入力パラメータ（機密情報・認証情報は除外すること）
+        - tool.arguments: 引数名と値の JSON（``capture_args=True`` の場合）
+        - tool.result: 戻り値の JSON（``capture_result=True`` の場合。ジェネレータ関数を除く）
+
+    引数・戻り値は記録中のスパンに対してのみ直列化し、サンプリングされなかった呼び出しでは
+    直列化しない。秘密情報は名前が ``REDACT_KEY_PATTERN`` に一致する引数・辞書キーの値と、
+    ``REDACT_VALUE_PATTERNS`` に一致する文字列を ``[REDACTED]`` に置き換えてから
+    ``max_attribute_length`` 文字に切り詰める（切り詰めた場合は末尾に ``…[truncated]``）。
 
     Args:
         tool_name: スパン名。省略時は関数の修飾名を使用する。
+        capture_args: True の場合、引数を ``tool.arguments`` に記録する。
+        capture_result: True の場合、戻り値を ``tool.result`` に記録する。
+        max_attribute_length: ``tool.arguments`` / ``tool.result`` の最大文字数。
 
     Returns:
         デコレートされた関数。
 
+    Raises:
+        ValueError: ``max_attribute_length`` が正でない場合。
+
     使用方法::
 
-        @trace_tool_execution("shell.run_command")
+        @trace_tool_execution("shell.run_command", capture_args=True)
         def run_shell_command(cmd: str) -> str:
             ...
     """
+    if max_attribute_length <= 0:
+        raise ValueError(f"max_attribute_length must be > 0: {max_attribute_length}")
 
     def decorator(func: Callable[P, R]) -> Callable[P, R]:
-        tracer = get_tracer()
-        if tracer is None:
+        if not _HAS_OTEL:
             return func
 
-        @functools.wraps(func)
-        def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
-            name = tool_name or func.__qualname__
-            with tracer.start_as_current_span(
-                name,
-                attributes={
-                    "tool.name": name,
-                    "gen_ai.system": SERVICE_NAME,
-                },
-            ) as span:
+        name = tool_name or func.__qualname__
+        attributes = {
+            "tool.name": name,
+            "gen_ai.system": SERVICE_NAME,
+        }
+        on_call = _argument_capture(func, max_attribute_length) if capture_args else None
+        on_result = _result_capture(max_attribute_length) if capture_result else None
+        metric = _CallMetric("tool_calls", {"tool.name": name}, "tool.status", "success")
+        return _instrument(
+            func, name, attributes, "tool.status", "success", metric, on_result, on_call
+        )
+
+    return decorator
+
+
+# ---------------------------------------------------------------------------
+# LLM レスポンスの解析・ストリーミング計測
+# ---------------------------------------------------------------------------
+
+# トークン間レイテンシのパーセンタイル算出に保持する標本数の上限（リザーバサンプリング）
+_LATENCY_RESERVOIR_SIZE = 1024
+
+# 記録するトークン間レイテンシのパーセンタイル
+_LATENCY_PERCENTILES = (50, 90, 99)
+
+
+def _field(obj: Any, key: str) -> Any:
+    """属性または辞書キーから値を取り出す（どちらもなければ None）。"""
+    if isinstance(obj, Mapping):
+        return obj.get(key)
+    return getattr(obj, key, None)
+
+
+def _response_attributes(response: Any) -> dict[str, Any]:
+    """LLM API のレスポンス（またはストリームのチャンク）から記録可能な属性を取り出す。
+
+    Anthropic 形式（``usage.input_tokens`` / ``stop_reason``）と
+    OpenAI 形式（``usage.prompt_tokens`` / ``finish_reason``）に対応する。
+    """
+    attributes: dict[str, Any] = {}
+    usage = _field(response, "usage")
+    if usage is not None:
+        input_tokens = _field(usage, "input_tokens")
+        if input_tokens is None:
+            input_tokens = _field(usage, "prompt_tokens")
+        output_tokens = _field(usage, "output_tokens")
+        if output_tokens is None:
+            output_tokens = _field(usage, "completion_tokens")
+        if isinstance(input_tokens, int):
+            attributes["gen_ai.usage.input_tokens"] = input_tokens
+        if isinstance(output_tokens, int):
+            attributes["gen_ai.usage.output_tokens"] = output_tokens
+    model = _field(response, "model")
+    if isinstance(model, str):
+        attributes["gen_ai.response.model"] = model
+    finish_reason = _field(response, "stop_reason") or _field(response, "finish_reason")
+    if isinstance(finish_reason, str):
+        attributes["gen_ai.response.finish_reason"] = finish_reason
+    return attributes
+
+
+def _record_response(span: Any, response: Any) -> None:
+    """非ストリーミング応答の使用量・モデル名・終了理由をスパンに記録する。"""
+    if isinstance(response, str | bytes):
+        return
+    attributes = _response_attributes(response)
+    if attributes:
+        span.set_attributes(attributes)
+
+
+class _StreamStats:
+    """ストリーミング応答のレイテンシとトークン数を逐次集計する。
+
+    チャンク自体は保持せず、トークン間レイテンシは最大
+    ``_LATENCY_RESERVOIR_SIZE`` 件のリザーバに標本化する。
+    """
+
+    __slots__ = (
+        "started",
+        "first",
+        "last",
+        "tokens",
+        "gaps",
+        "gap_count",
+        "reported",
+        "finished",
+    )
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.first: float | None = None
+        self.last = self.started
+        self.tokens = 0
+        self.gaps: list[float] = []
+        self.gap_count = 0
+        # チャンクに含まれていた使用量・終了理由（最後に見えた値を採用する）
+        self.reported: dict[str, Any] = {}
+        # _finish_stream で記録済みか（破棄時のフックとの二重記録を防ぐ）
+        self.finished = False
+
+    def on_chunk(self, span: Any, chunk: Any, token_counter: Callable[[Any], int] | None) -> None:
+        """チャンク 1 件を受け取った時点の計測を行う（``span`` が None ならイベントは省く）。"""
+        now = time.perf_counter()
+        if self.first is None:
+            self.first = now
+            if span is not None:
+                span.add_event(
+                    "gen_ai.content.first_token",
+                    {"gen_ai.response.time_to_first_token": now - self.started},
+                )
+        else:
+            gap = now - self.last
+            self.gap_count += 1
+            if len(self.gaps) < _LATENCY_RESERVOIR_SIZE:
+                self.gaps.append(gap)
+            else:
+                slot = random.randrange(self.gap_count)
+                if slot < _LATENCY_RESERVOIR_SIZE:
+                    self.gaps[slot] = gap
+        self.last = now
+        self.tokens += 1 if token_counter is None else token_counter(chunk)
+        if not isinstance(chunk, str | bytes):
+            self.reported.update(_response_attributes(chunk))
+
+    def attributes(self) -> dict[str, Any]:
+        """スパンに記録する集計値を返す。"""
+        attributes: dict[str, Any] = {"gen_ai.usage.output_tokens": self.tokens}
+        if self.first is not None:
+            attributes["gen_ai.response.time_to_first_token"] = self.first - self.started
+            duration = self.last - self.first
+            if duration > 0:
+                attributes["gen_ai.response.tokens_per_second"] = self.tokens / duration
+        if self.gaps:
+            ordered = sorted(self.gaps)
+            for pct in _LATENCY_PERCENTILES:
+                index = min(len(ordered) - 1, len(ordered) * pct // 100)
+                attributes[f"gen_ai.response.inter_token_latency.p{pct}"] = ordered[index]
+        # API が使用量を報告した場合はそちらを優先する
+        attributes.update(self.reported)
+        return attributes
+
+
+# ストリーム終了時にメトリクスを記録する関数（例外と、スパンに記録する集計値を受け取る）
+_StreamFinish = Callable[[BaseException | None, Mapping[str, Any]], None]
+
+
+def _traced_stream(
+    chunks: Iterable[Any],
+    span: Any,
+    stats: _StreamStats,
+    token_counter: Callable[[Any], int] | None,
+    on_finish: _StreamFinish | None = None,
+) -> Generator[Any, Any, Any]:
+    """同期ストリームを中継しながら計測し、終了時にスパンを閉じる。
+
+    ``span`` が None の場合（サンプリングで記録しない呼び出し）は各ステップを非記録状態で
+    進め、``on_finish`` へのメトリクスの記録のみを行う。
+    """
+    iterator = iter(chunks)
+    status = "error"
+    error: BaseException | None = None
+    try:
+        while True:
+            with _resume_scope(span):
+                try:
+                    chunk = next(iterator)
+                except StopIteration:
+                    status = "stop"
+                    return
+            stats.on_chunk(span, chunk, token_counter)
+            try:
+                yield chunk
+            except GeneratorExit:
+                status = "cancelled"
+                close = getattr(iterator, "close", None)
+                if close is not None:
+                    with _resume_scope(span):
+                        close()
+                raise
+    except Exception as exc:
+        error = exc
+        if span is not None:
+            span.record_exception(exc)
+        raise
+    finally:
+        _finish_stream(span, stats, status, error, on_finish)
+
+
+async def _traced_async_stream(
+    chunks: AsyncIterable[Any],
+    span: Any,
+    stats: _StreamStats,
+    token_counter: Callable[[Any], int] | None,
+    on_finish: _StreamFinish | None = None,
+) -> AsyncGenerator[Any, None]:
+    """非同期ストリームを中継しながら計測し、終了時にスパンを閉じる（同期版と同じ方針）。"""
+    iterator = aiter(chunks)
+    status = "error"
+    error: BaseException | None = None
+    try:
+        while True:
+            with _resume_scope(span):
                 try:
+                    chunk = await anext(iterator)
+                except StopAsyncIteration:
+                    status = "stop"
+                    return
+            stats.on_chunk(span, chunk, token_counter)
+            try:
+                yield chunk
+            except GeneratorExit:
+                status = "cancelled"
+                aclose = getattr(iterator, "aclose", None)
+                if aclose is not None:
+                    with _resume_scope(span):
+                        await aclose()
+                raise
+    except Exception as exc:
+        error = exc
+        if span is not None:
+            span.record_exception(exc)
+        raise
+    finally:
+        _finish_stream(span, stats, status, error, on_finish)
+
+
+def _unsampled_stream(chunks: Iterable[Any]) -> Generator[Any, Any, Any]:
+    """サンプリングされなかったストリームを、各ステップを非記録状態で進めながら中継する。"""
+    iterator = iter(chunks)
+    try:
+        while True:
+            with _UnsampledScope():
+                try:
+                    chunk = next(iterator)
+                except StopIteration as stop:
+                    return stop.value
+            yield chunk
+    finally:
+        close = getattr(iterator, "close", None)
+        if close is not None:
+            with _UnsampledScope():
+                close()
+
+
+async def _unsampled_async_stream(chunks: AsyncIterable[Any]) -> AsyncGenerator[Any, None]:
+    """非同期ストリーム版の ``_unsampled_stream``。"""
+    iterator = aiter(chunks)
+    try:
+        while True:
+            with _UnsampledScope():
+                try:
+                    chunk = await anext(iterator)
+                except StopAsyncIteration:
+                    return
+            yield chunk
+    finally:
+        aclose = getattr(iterator, "aclose", None)
+        if aclose is not None:
+            with _UnsampledScope():
+                await aclose()
+
+
+def _unsampled_result(result: Any) -> Any:
+    """サンプリングされなかった呼び出しの戻り値がストリームなら、非記録状態で進めるよう包む。"""
+    if isinstance(result, AsyncIterable):
+        return _unsampled_async_stream(result)
+    if isinstance(result, Iterator):
+        return _unsampled_stream(result)
+    return result
+
+
+def _finish_stream(
+    span: Any,
+    stats: _StreamStats,
+    status: str,
+    error: BaseException | None = None,
+    on_finish: _StreamFinish | None = None,
+) -> None:
+    """ストリームの集計値と終了理由を記録してスパンを閉じる（2 回目以降の呼び出しは無視する）。"""
+    if stats.finished:
+        return
+    stats.finished = True
+    attributes = stats.attributes()
+    if status == "stop":
+        # API が報告した終了理由（"end_turn" 等）があればそれを優先する
+        attributes.setdefault("gen_ai.response.finish_reason", status)
+    else:
+        attributes["gen_ai.response.finish_reason"] = status
+    if span is not None:
+        span.set_attributes(attributes)
+        span.end()
+    if on_finish is not None:
+        on_finish(error, attributes)
+
+
+def _abandon_stream(span: Any, stats: _StreamStats, on_finish: _StreamFinish | None) -> None:
+    """最後まで読まれず閉じられもせずに破棄されたストリームのスパンを閉じる。
+
+    ``weakref.finalize`` から呼ばれる。一度も反復されなかったジェネレータは破棄されても
+    ``finally`` が実行されないため、このフックがないとスパンが送信されずに残り続ける。
+    """
+    _finish_stream(span, stats, "abandoned", None, on_finish)
+
+
+def _instrument_stream(
+    func: Callable[P, R],
+    name: str,
+    attributes: dict[str, Any],
+    metric: _LLMMetric,
+    token_counter: Callable[[Any], int] | None,
+) -> Callable[P, R]:
+    """ストリーミング応答を返す LLM 呼び出し用のラッパーを生成する。
+
+    関数の呼び出し時点でスパンを開始し、戻り値の（非同期）イテレータを計測用の
+    ジェネレータで包んで返す。スパンはストリームの終了（枯渇・例外・``close()``）で閉じ、
+    終了せずに破棄された場合は終了理由 ``"abandoned"`` で閉じる。
+    戻り値がイテレータでない場合は通常の呼び出しとして記録する。
+    メトリクスが設定されていれば、スパンを記録しない呼び出しもストリームを計測して記録する。
+    """
+
+    def start() -> tuple[int, Any]:
+        """サンプリング判定を行い、判定と（記録する場合は）開始したスパンを返す。
+
+        ``_UNSAMPLED_ROOT`` の場合、呼び出し元は関数の呼び出しとストリームの各ステップを
+        ``_UnsampledScope`` の中で行い、配下の呼び出しも記録しないようにする。
+        """
+        tracer = _tracer or get_tracer()
+        if tracer is None:
+            return _PASSTHROUGH, None
+        decision = _decide(name) if _sampling.enabled else _TRACE
+        if decision != _TRACE:
+            return decision, None
+        return decision, tracer.start_span(name, attributes=attributes)
+
+    def finisher(stats: _StreamStats, instruments: _Instruments | None) -> _StreamFinish | None:
+        """メトリクスが設定されていれば、ストリーム終了時に記録する関数を返す。"""
+        if instruments is None:
+            return None
+        return functools.partial(metric.record_usage, instruments, stats.started)
+
+    def finish_plain(span: Any, result: Any, on_finish: _StreamFinish | None) -> Any:
+        """イテレータ以外が返ったときは非ストリーミング応答として記録する。"""
+        if span is not None:
+            span.set_attribute("gen_ai.response.finish_reason", "stop")
+            _record_response(span, result)
+            span.end()
+        if on_finish is not None:
+            usage = {} if isinstance(result, str | bytes) else _response_attributes(result)
+            on_finish(None, usage)
+        return result
+
+    def fail(span: Any, exc: Exception, on_finish: _StreamFinish | None) -> None:
+        if span is not None:
+            span.set_attribute("gen_ai.response.finish_reason", "error")
+            span.record_exception(exc)
+            span.end()
+        if on_finish is not None:
+            on_finish(exc, {})
+
+    def wrap_result(
+        result: Any, span: Any, stats: _StreamStats, on_finish: _StreamFinish | None
+    ) -> Any:
+        """戻り値がストリームなら計測用のジェネレータで包む。"""
+        stream: Any
+        if isinstance(result, AsyncIterable):
+            stream = _traced_async_stream(result, span, stats, token_counter, on_finish)
+        elif isinstance(result, Iterator):
+            stream = _traced_stream(result, span, stats, token_counter, on_finish)
+        else:
+            return finish_plain(span, result, on_finish)
+        # スパンは呼び出し時点で開始済みのため、呼び出し元が反復も close() もせずに
+        # 破棄した場合に備えて閉じるフックを付けておく
+        weakref.finalize(stream, _abandon_stream, span, stats, on_finish)
+        return stream
+
+    if inspect.isasyncgenfunction(func):
+
+        async def async_gen_wrapper(*args: Any, **kwargs: Any) -> Any:
+            decision, span = start()
+            instruments = _instruments
+            if span is None and instruments is None:
+                chunks = func(*args, **kwargs)
+                if decision == _UNSAMPLED_ROOT:
+                    chunks = _unsampled_async_stream(chunks)
+                async for chunk in chunks:
+                    yield chunk
+                return
+            stats = _StreamStats()
+            stream = _traced_async_stream(
+                func(*args, **kwargs), span, stats, token_counter, finisher(stats, instruments)
+            )
+            try:
+                async for chunk in stream:
+                    yield chunk
+            finally:
+                # 呼び出し元が途中でやめた場合もストリームを閉じてスパンを終了させる
+                await stream.aclose()
+
+        wrapper: Callable[..., Any] = async_gen_wrapper
+
+    elif inspect.isgeneratorfunction(func):
+
+        def gen_wrapper(*args: Any, **kwargs: Any) -> Any:
+            decision, span = start()
+            instruments = _instruments
+            if span is None and instruments is None:
+                if decision == _UNSAMPLED_ROOT:
+                    return (yield from _unsampled_stream(func(*args, **kwargs)))
+                return (yield from func(*args, **kwargs))
+            stats = _StreamStats()
+            on_finish = finisher(stats, instruments)
+            return (
+                yield from _traced_stream(
+                    func(*args, **kwargs), span, stats, token_counter, on_finish
+                )
+            )
+
+        wrapper = gen_wrapper
+
+    elif inspect.iscoroutinefunction(func):
+
+        async def coroutine_wrapper(*args: Any, **kwargs: Any) -> Any:
+            decision, span = start()
+            instruments = _instruments
+            if span is None and instruments is None:
+                if decision == _UNSAMPLED_ROOT:
+                    with _UnsampledScope():
+                        return _unsampled_result(await func(*args, **kwargs))
+                return await func(*args, **kwargs)
+            stats = _StreamStats()
+            on_finish = finisher(stats, instruments)
+            try:
+                with _resume_scope(span):
+                    result = await func(*args, **kwargs)
+            except Exception as exc:
+                fail(span, exc, on_finish)
+                raise
+            return wrap_result(result, span, stats, on_finish)
+
+        wrapper = coroutine_wrapper
+
+    else:
+
+        def function_wrapper(*args: Any, **kwargs: Any) -> Any:
+            decision, span = start()
+            instruments = _instruments
+            if span is None and instruments is None:
+                if decision == _UNSAMPLED_ROOT:
+                    with _UnsampledScope():
+                        return _unsampled_result(func(*args, **kwargs))
+                return func(*args, **kwargs)
+            stats = _StreamStats()
+            on_finish = finisher(stats, instruments)
+            try:
+                with _resume_scope(span):
                     result = func(*args, **kwargs)
-                    span.set_attribute("tool.status", "success")
-                    return result
-                except Exception as exc:
-                    span.set_attribute("tool.status", "error")
-                    span.record_exception(exc)
-                    raise
+            except Exception as exc:
+                fail(span, exc, on_finish)
+                raise
+            return wrap_result(result, span, stats, on_finish)
 
-        return wrapper
+        wrapper = function_wrapper
 
-    return decorator
+    return cast("Callable[P, R]", functools.wraps(func)(wrapper))
 
 
 # ---------------------------------------------------------------------------
@@ -238,10 +1771,15 @@ def trace_tool_execution(
 
 def trace_llm_call(
     model_name: str | None = None,
+    *,
+    stream: bool = False,
+    token_counter: Callable[[Any], int] | None = None,
 ) -> Callable[[Callable[P, R]], Callable[P, R]]:
     """LLM 呼び出しをトレースするデコレータ。
 
     GenAI Semantic Conventions に準拠した属性を付与する。
+    使用量・モデル名・終了理由は戻り値の ``usage`` / ``model`` /
+    ``stop_reason``（または ``finish_reason``）から取得する（属性・辞書キーのどちらも可）。
 
     記録する属性 (OTel GenAI Semantic Conventions 準拠):
         - gen_ai.operation.name: 操作種別（"chat"）
@@ -250,8 +1788,22 @@ def trace_llm_call(
         - gen_ai.usage.input_tokens: 入力トークン数（設定時）
         - gen_ai.usage.output_tokens: 出力トークン数（設定時）
 
+    ``stream=True`` では、関数が返す（非同期）イテレータ、またはジェネレータ関数が
+    生成するチャンクをバッファせずに中継しながら、以下を追加で記録する。
+    スパンはストリームの終了まで開いたままとなる。
+
+        - gen_ai.response.time_to_first_token: 呼び出しから最初のチャンクまでの秒数
+          （同名の属性を持つ ``gen_ai.content.first_token`` イベントも記録する）
+        - gen_ai.response.inter_token_latency.p50 / p90 / p99: チャンク間隔（秒）
+        - gen_ai.response.tokens_per_second: 最初のチャンク以降の出力速度
+        - gen_ai.usage.output_tokens: 出力トークン数（API が報告しない場合は計数値）
+        - gen_ai.response.finish_reason: ``"stop"`` / ``"error"`` / ``"cancelled"``
+          （途中で ``close()`` された場合）、または API が報告した終了理由
+
     Args:
         model_name: LLM モデル名。省略時は ``"unknown"``。
+        stream: True の場合、ストリーミング応答として計測する。
+        token_counter: チャンクのトークン数を返す関数。省略時はチャンク 1 件を 1 と数える。
 
     Returns:
         デコレートされた関数。
@@ -261,33 +1813,34 @@ def trace_llm_call(
         @trace_llm_call("claude-3-opus")
         def call_claude(prompt: str) -> str:
             ...
+
+        @trace_llm_call("claude-3-opus", stream=True)
+        async def stream_claude(prompt: str) -> AsyncIterator[str]:
+            ...
     """
 
     def decorator(func: Callable[P, R]) -> Callable[P, R]:
-        tracer = get_tracer()
-        if tracer is None:
+        if not _HAS_OTEL:
             return func
 
-        @functools.wraps(func)
-        def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
-            name = model_name or "unknown"
-            with tracer.start_as_current_span(
-                f"gen_ai.chat.{name}",
-                attributes={
-                    "gen_ai.request.model": name,
-                    "gen_ai.system": SERVICE_NAME,
-                    "gen_ai.operation.name": "chat",
-                },
-            ) as span:
-                try:
-                    result = func(*args, **kwargs)
-                    span.set_attribute("gen_ai.response.finish_reason", "stop")
-                    return result
-                except Exception as exc:
-                    span.set_attribute("gen_ai.response.finish_reason", "error")
-                    span.record_exception(exc)
-                    raise
-
-        return wrapper
+        name = model_name or "unknown"
+        attributes = {
+            "gen_ai.request.model": name,
+            "gen_ai.system": SERVICE_NAME,
+            "gen_ai.operation.name": "chat",
+        }
+        span_name = f"gen_ai.chat.{name}"
+        metric = _LLMMetric(attributes)
+        if stream:
+            return _instrument_stream(func, span_name, attributes, metric, token_counter)
+        return _instrument(
+            func,
+            span_name,
+            attributes,
+            "gen_ai.response.finish_reason",
+            "stop",
+            metric,
+            _record_response,
+        )
 
     return decorator
@@ -0,0 +1,235 @@
+"""エージェント定義ファイルの model 設定を一括更新する。
+
+project-config.yml の ``ai_models``（``default`` とエージェントごとの ``overrides``）を 1 回だけ
+読み込み、``.github/agents/`` と ``agents/`` のすべての ``*.agent.md`` の frontmatter を
+メモリ上で書き換える。内容が変わるファイルのみを、一時ファイルからの置き換えで原子的に書き込む。
+
+同じエージェントは両方のディレクトリで同じモデルに揃える。ファイル名のハイフンは
+アンダースコアとして扱う（``test-engineer.agent.md`` と ``test_engineer.agent.md`` は同じ
+エージェント ``test_engineer``）。片方のディレクトリにしかないエージェントは警告する。
+参考資料の ``agents/`` には frontmatter を追加せず、既存の ``model:`` 行のみを揃える。
+
+使い方::
+
+    python -m project_config.agent_models             # 更新する
+    python -m project_config.agent_models --dry-run   # 差分を表示するのみ
+    python -m project_config.agent_models --check     # 更新が必要なら終了コード 1（CI 用）
+"""
+
+from __future__ import annotations
+
+import argparse
+import difflib
+import os
+import re
+import sys
+import tempfile
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from .loader import load_config
+
+if TYPE_CHECKING:
+    from collections.abc import Collection, Iterable
+
+# 更新対象のディレクトリ（リポジトリルートからの相対パス）
+AGENT_DIRS = (".github/agents", "agents")
+
+# 参考資料のディレクトリ（frontmatter の model: 行がある場合のみ更新する）
+REFERENCE_DIRS = ("agents",)
+
+AGENT_SUFFIX = ".agent.md"
+
+_MODEL_LINE = re.compile(r"^model\s*:")
+
+
+class AgentUpdate(NamedTuple):
+    """1 つのエージェントファイルの更新内容。
+
+    Attributes:
+        path: エージェントファイル。
+        key: エージェント名（``overrides`` のキー）。
+        model: 設定するモデル。
+        before: 更新前の内容。
+        after: 更新後の内容。
+    """
+
+    path: Path
+    key: str
+    model: str
+    before: str
+    after: str
+
+    @property
+    def changed(self) -> bool:
+        return self.before != self.after
+
+    def diff(self, root: Path) -> str:
+        """更新前後の unified diff。"""
+        name = self.path.relative_to(root).as_posix()
+        return "".join(
+            difflib.unified_diff(
+                self.before.splitlines(keepends=True),
+                self.after.splitlines(keepends=True),
+                f"a/{name}",
+                f"b/{name}",
+            )
+        )
+
+
+def agent_key(path: Path) -> str:
+    """ファイル名からエージェント名を求める（``test-engineer.agent.md`` → ``test_engineer``）。"""
+    return path.name[: -len(AGENT_SUFFIX)].replace("-", "_")
+
+
+def resolve_model(ai_models: dict[str, Any], key: str) -> str:
+    """エージェント ``key`` のモデル（``overrides`` になければ ``default``）。
+
+    Raises:
+        ValueError: ``default`` が設定されていない場合。
+    """
+    overrides = ai_models.get("overrides") or {}
+    model = overrides.get(key) or ai_models.get("default")
+    if not model:
+        raise ValueError("ai_models.default is not set in project-config.yml")
+    return str(model)
+
+
+def set_model(text: str, model: str, *, insert: bool = True) -> str:
+    """frontmatter の ``model:`` を ``model`` にした内容を返す。
+
+    frontmatter に ``model:`` がなければ末尾に追加し、frontmatter がなければ先頭に追加する
+    （``insert=False`` ではどちらも追加せず、そのまま返す）。本文中の ``model:`` は変更しない。
+    """
+    lines = text.splitlines(keepends=True)
+    newline = "\r\n" if lines and lines[0].endswith("\r\n") else "\n"
+    entry = f"model: {model}{newline}"
+    if not lines or lines[0].rstrip("\r\n") != "---":
+        return f"---{newline}{entry}---{newline}{newline}{text}" if insert else text
+    for end in range(1, len(lines)):
+        if lines[end].rstrip("\r\n") == "---":
+            break
+    else:
+        raise ValueError("frontmatter is not closed with '---'")
+    for index in range(1, end):
+        if _MODEL_LINE.match(lines[index]):
+            lines[index] = entry
+            break
+    else:
+        if not insert:
+            return text
+        lines.insert(end, entry)
+    return "".join(lines)
+
+
+def find_agent_files(root: Path) -> dict[str, list[Path]]:
+    """エージェント名ごとに、各ディレクトリのエージェントファイルを集める。"""
+    agents: dict[str, list[Path]] = {}
+    for directory in AGENT_DIRS:
+        for path in sorted((root / directory).glob(f"*{AGENT_SUFFIX}")):
+            agents.setdefault(agent_key(path), []).append(path)
+    return agents
+
+
+def unsynced_agents(root: Path, agents: dict[str, list[Path]]) -> list[str]:
+    """存在するディレクトリのうち、一部にしかないエージェント名。"""
+    present = [root / d for d in AGENT_DIRS if (root / d).is_dir()]
+    return sorted(key for key, paths in agents.items() if {p.parent for p in paths} != set(present))
+
+
+def plan_updates(
+    agents: dict[str, list[Path]],
+    ai_models: dict[str, Any],
+    reference_dirs: Collection[Path] = (),
+) -> list[AgentUpdate]:
+    """すべてのエージェントファイルの更新内容を求める（書き込みはしない）。
+
+    ``reference_dirs`` のファイルは既存の ``model:`` 行のみを更新し、frontmatter を追加しない。
+
+    Raises:
+        ValueError: ``ai_models.default`` がない、または frontmatter が閉じていない場合。
+    """
+    updates = []
+    for key, paths in sorted(agents.items()):
+        model = resolve_model(ai_models, key)
+        for path in paths:
+            with path.open(encoding="utf-8", newline="") as stream:
+                before = stream.read()
+            try:
+                after = set_model(before, model, insert=path.parent not in reference_dirs)
+            except ValueError as exc:
+                raise ValueError(f"{path}: {exc}") from None
+            updates.append(AgentUpdate(path, key, model, before, after))
+    return updates
+
+
+def write_atomic(path: Path, text: str) -> None:
+    """同じディレクトリの一時ファイルに書き込んでから置き換える（権限は元のファイルを引き継ぐ）。"""
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as stream:
+            stream.write(text)
+            stream.flush()
+            os.fsync(stream.fileno())
+        os.chmod(tmp, path.stat().st_mode & 0o7777)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def apply_updates(updates: Iterable[AgentUpdate]) -> list[AgentUpdate]:
+    """内容が変わるファイルのみを書き込み、書き込んだ更新を返す。"""
+    written = []
+    for update in updates:
+        if update.changed:
+            write_atomic(update.path, update.after)
+            written.append(update)
+    return written
+
+
+def main(argv: list[str] | None = None) -> int:
+    """エージェントファイルを更新する（``--dry-run`` では差分の表示のみ）。"""
+    parser = argparse.ArgumentParser(description="エージェント定義の model 設定を一括更新する")
+    parser.add_argument("--root", type=Path, default=Path(__file__).resolve().parents[2])
+    parser.add_argument("--config", type=Path, help="既定は <root>/project-config.yml")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--dry-run", action="store_true", help="差分を表示し、書き込まない")
+    mode.add_argument("--check", action="store_true", help="更新が必要なら終了コード 1")
+    args = parser.parse_args(argv)
+
+    root = args.root.resolve()
+    agents = find_agent_files(root)
+    try:
+        config = load_config(args.config or root / "project-config.yml")
+        updates = plan_updates(
+            agents, config.get("ai_models") or {}, {root / d for d in REFERENCE_DIRS}
+        )
+    except (OSError, ValueError) as exc:
+        print(f"❌ {exc}", file=sys.stderr)
+        return 1
+    if not updates:
+        print(
+            f"❌ エージェントファイルが見つかりません（{' / '.join(AGENT_DIRS)}）", file=sys.stderr
+        )
+        return 1
+
+    unsynced = unsynced_agents(root, agents)
+    for key in unsynced:
+        print(f"⚠️  {key} は一部のディレクトリにのみ存在します", file=sys.stderr)
+
+    changed = [u for u in updates if u.changed]
+    if args.dry_run or args.check:
+        for update in changed:
+            sys.stdout.write(update.diff(root))
+        print(f"{len(changed)} / {len(updates)} 個のエージェントファイルに更新が必要です")
+        return 1 if args.check and (changed or unsynced) else 0
+
+    for update in apply_updates(updates):
+        print(f"  ✅ {update.path.relative_to(root).as_posix()} → {update.model}")
+    print(f"✅ 完了: {len(changed)} 個のエージェントファイルを更新しました（{len(updates)} 個中）")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,390 @@
+"""project-config.yml の読み込み。
+
+設定ファイルを 1 回だけ解析し、全キー（``source.modules`` のような入れ子のリストを含む）を
+辞書として返す。解析結果はファイルの更新時刻とサイズをキーにプロセス内でキャッシュする。
+
+シェルスクリプトからは、全キーをシェル変数として 1 回の呼び出しで読み込む::
+
+    eval "$(PYTHONPATH=src python3 -m project_config.loader shell)"
+    echo "$CFG_PROJECT_NAME" "$CFG_SOURCE_MODULES_0_NAME" "$CFG_SOURCE_MODULES_COUNT"
+
+変数名はキーを ``.`` 区切りでたどった経路を大文字にし、英数字以外を ``_`` に置き換えて
+``CFG_`` を付けたもの。リストは要素ごとに添字を付け、要素数を ``<変数名>_COUNT`` とする。
+シェル変数の値はスカラーの元の表記のまま（``3.10`` を ``3.1`` に、``yes`` を ``true`` に
+しない）とし、PyYAML の有無で結果が変わらないようにする（``load_config(raw=True)``）。
+
+PyYAML はオプショナル依存。未インストールの場合は、このテンプレートの設定ファイルが
+使う YAML のサブセット（ブロックのマッピング・シーケンス、フローの ``[...]`` / ``{...}``、
+``|`` / ``>`` のブロックスカラー、コメント）を解析する組み込みのパーサーを使う。
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import shlex
+import sys
+from pathlib import Path
+from typing import Any
+
+try:
+    import yaml  # type: ignore[import-untyped]
+
+    _HAS_YAML = True
+except ImportError:
+    _HAS_YAML = False
+
+DEFAULT_CONFIG = Path(__file__).resolve().parents[2] / "project-config.yml"
+
+# シェル変数名の接頭辞
+SHELL_PREFIX = "CFG_"
+
+# (パス, raw) → ((更新時刻, サイズ), 解析結果)
+_cache: dict[tuple[Path, bool], tuple[tuple[int, int], dict[str, Any]]] = {}
+
+
+def load_config(path: str | Path = DEFAULT_CONFIG, *, raw: bool = False) -> dict[str, Any]:
+    """設定ファイルを解析して返す。
+
+    ファイルの更新時刻とサイズが前回と同じであれば、解析せずにキャッシュを返す。
+    返す辞書はキャッシュと共有するため、変更しないこと。
+
+    Args:
+        path: 設定ファイルのパス。
+        raw: True の場合、スカラーを型に変換せず元の表記の文字列とする（引用符は外す。
+            値のないキーは空文字列）。PyYAML では ``BaseLoader`` で読み込む。
+
+    Returns:
+        設定の辞書（空のファイルなら空の辞書）。
+
+    Raises:
+        OSError: ファイルを読めない場合。
+        ValueError: 設定ファイルのトップレベルがマッピングではない場合。
+    """
+    path = Path(path).resolve()
+    stat = path.stat()
+    key = (stat.st_mtime_ns, stat.st_size)
+    cached = _cache.get((path, raw))
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    text = path.read_text(encoding="utf-8")
+    if _HAS_YAML:
+        data = yaml.load(text, Loader=yaml.BaseLoader) if raw else yaml.safe_load(text)
+    else:
+        data = parse_yaml(text, raw=raw)
+    if data is None or data == "":
+        data = {}
+    if not isinstance(data, dict):
+        raise ValueError(f"top level of {path} must be a mapping")
+    _cache[(path, raw)] = (key, data)
+    return data
+
+
+def clear_cache() -> None:
+    """解析結果のキャッシュを破棄する。"""
+    _cache.clear()
+
+
+def get(config: dict[str, Any], key: str, default: Any = None) -> Any:
+    """``.`` 区切りのキー（リストは添字）で値を取り出す。
+
+    Example::
+
+        get(config, "source.modules.0.name")  # -> "core"
+    """
+    value: Any = config
+    for part in key.split("."):
+        if isinstance(value, dict) and part in value:
+            value = value[part]
+        elif isinstance(value, list) and part.isdigit() and int(part) < len(value):
+            value = value[int(part)]
+        else:
+            return default
+    return value
+
+
+def flatten(config: Any, prefix: str = "") -> dict[str, Any]:
+    """入れ子の設定を ``.`` 区切りのキーと末端の値の辞書に展開する。
+
+    リストは添字をキーとし、要素数を ``<キー>.count`` として加える。
+    空のマッピングと ``null`` は ``None`` とする。
+    """
+    items: dict[str, Any] = {}
+    if isinstance(config, dict) and config:
+        for name, value in config.items():
+            items.update(flatten(value, f"{prefix}.{name}" if prefix else str(name)))
+    elif isinstance(config, list):
+        for index, value in enumerate(config):
+            items.update(flatten(value, f"{prefix}.{index}"))
+        items[f"{prefix}.count"] = len(config)
+    elif prefix:
+        items[prefix] = None if config == {} else config
+    return items
+
+
+def _shell_value(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+def shell_name(key: str, prefix: str = SHELL_PREFIX) -> str:
+    """キーに対応するシェル変数名を返す。"""
+    return prefix + re.sub(r"[^A-Za-z0-9]", "_", key).upper()
+
+
+def to_shell(config: dict[str, Any], prefix: str = SHELL_PREFIX) -> str:
+    """全キーを ``eval`` で読み込めるシェル変数の代入文にする。
+
+    値を元の表記のまま出力するには ``load_config(raw=True)`` の結果を渡す。
+    """
+    return "".join(
+        f"{shell_name(key, prefix)}={shlex.quote(_shell_value(value))}\n"
+        for key, value in flatten(config).items()
+    )
+
+
+# ---------------------------------------------------------------------------
+# 組み込みの YAML パーサー（PyYAML 未インストール時）
+# ---------------------------------------------------------------------------
+
+_INT = re.compile(r"[-+]?[0-9]+")
+_FLOAT = re.compile(r"[-+]?([0-9]+\.[0-9]*|\.[0-9]+)([eE][-+]?[0-9]+)?")
+
+
+def _strip_comment(text: str) -> str:
+    """引用符の外にある ``#`` 以降（行頭または空白の直後のもの）を取り除く。"""
+    quote = ""
+    for i, char in enumerate(text):
+        if quote:
+            if char == quote:
+                quote = ""
+        elif char in "\"'":
+            quote = char
+        elif char == "#" and (i == 0 or text[i - 1] in " \t"):
+            return text[:i].rstrip()
+    return text.rstrip()
+
+
+def _split_top(text: str, sep: str) -> list[str]:
+    """引用符と括弧の外にある ``sep`` で分割する。"""
+    parts: list[str] = []
+    depth, quote, start = 0, "", 0
+    for i, char in enumerate(text):
+        if quote:
+            if char == quote:
+                quote = ""
+        elif char in "\"'":
+            quote = char
+        elif char in "[{":
+            depth += 1
+        elif char in "]}":
+            depth -= 1
+        elif char == sep and depth == 0:
+            parts.append(text[start:i])
+            start = i + 1
+    parts.append(text[start:])
+    return parts
+
+
+def _split_key(text: str) -> tuple[str, str] | None:
+    """``key: value`` を分割する（マッピングの行でなければ ``None``）。"""
+    quote = ""
+    for i, char in enumerate(text):
+        if quote:
+            if char == quote:
+                quote = ""
+        elif char in "\"'" and i == 0:
+            quote = char
+        elif char == ":" and (i + 1 == len(text) or text[i + 1] in " \t"):
+            return _unquote(text[:i].strip()), text[i + 1 :].strip()
+        elif char in "[{" and i == 0:
+            return None
+    return None
+
+
+def _unquote(text: str) -> str:
+    if len(text) >= 2 and text[0] == text[-1] == '"':
+        return str(json.loads(text))
+    if len(text) >= 2 and text[0] == text[-1] == "'":
+        return text[1:-1].replace("''", "'")
+    return text
+
+
+def _scalar(text: str, raw: bool = False) -> Any:
+    """フロースタイルの値を解析する（``raw`` では型に変換しない）。"""
+    text = text.strip()
+    if text.startswith("[") and text.endswith("]"):
+        inner = text[1:-1].strip()
+        return [_scalar(item, raw) for item in _split_top(inner, ",")] if inner else []
+    if text.startswith("{") and text.endswith("}"):
+        mapping: dict[str, Any] = {}
+        inner = text[1:-1].strip()
+        for item in _split_top(inner, ",") if inner else []:
+            pair = _split_key(item.strip())
+            if pair is None:
+                raise ValueError(f"invalid flow mapping entry: {item!r}")
+            mapping[pair[0]] = _scalar(pair[1], raw)
+        return mapping
+    if text.startswith(('"', "'")):
+        return _unquote(text)
+    if raw:
+        return text
+    lowered = text.lower()
+    if lowered in ("", "~", "null"):
+        return None
+    if lowered in ("true", "false"):
+        return lowered == "true"
+    if _INT.fullmatch(text):
+        return int(text)
+    if _FLOAT.fullmatch(text):
+        return float(text)
+    return text
+
+
+class _Parser:
+    """インデントに基づくブロック構造の解析器。"""
+
+    def __init__(self, text: str, raw: bool = False) -> None:
+        # raw: スカラーを型に変換せず元の表記のままとする（PyYAML の BaseLoader と同じ）
+        self.as_text = raw
+        self.raw = text.splitlines()
+        # 構造を持つ行: (行番号, インデント, コメントを除いた本文)
+        self.lines: list[tuple[int, int, str]] = []
+        for number, line in enumerate(self.raw):
+            body = _strip_comment(line)
+            if body.strip():
+                self.lines.append((number, len(body) - len(body.lstrip(" ")), body.strip()))
+        self.pos = 0
+
+    def parse(self) -> Any:
+        if not self.lines:
+            return None
+        value = self.block(self.lines[0][1])
+        if self.pos < len(self.lines):
+            raise ValueError(f"unexpected indentation at line {self.lines[self.pos][0] + 1}")
+        return value
+
+    def block(self, indent: int) -> Any:
+        text = self.lines[self.pos][2]
+        if text == "-" or text.startswith("- "):
+            return self.sequence(indent)
+        return self.mapping(indent)
+
+    def nested(self, indent: int) -> Any:
+        """``key:`` / ``-`` の後に続く入れ子の値を解析する。"""
+        empty = "" if self.as_text else None
+        if self.pos >= len(self.lines):
+            return empty
+        _, child, text = self.lines[self.pos]
+        if child > indent or (child == indent and text.startswith("-")):
+            return self.block(child)
+        return empty
+
+    def mapping(self, indent: int) -> dict[str, Any]:
+        result: dict[str, Any] = {}
+        while self.pos < len(self.lines):
+            number, current, text = self.lines[self.pos]
+            if current < indent:
+                break
+            if current > indent:
+                raise ValueError(f"unexpected indentation at line {number + 1}")
+            if text.startswith("- ") or text == "-":
+                break
+            pair = _split_key(text)
+            if pair is None:
+                raise ValueError(f"expected 'key: value' at line {number + 1}")
+            key, rest = pair
+            self.pos += 1
+            if rest in ("|", ">", "|-", ">-", "|+", ">+"):
+                result[key] = self.block_scalar(rest, indent, number)
+            elif rest:
+                result[key] = _scalar(rest, self.as_text)
+            else:
+                result[key] = self.nested(indent)
+        return result
+
+    def sequence(self, indent: int) -> list[Any]:
+        result: list[Any] = []
+        while self.pos < len(self.lines):
+            number, current, text = self.lines[self.pos]
+            if current != indent or not (text == "-" or text.startswith("- ")):
+                break
+            content = text[1:].lstrip()
+            if not content:
+                self.pos += 1
+                result.append(self.nested(indent))
+            elif _split_key(content) is not None:
+                # "- key: value" はマッピングの 1 行目として、内容の位置をインデントとする
+                self.lines[self.pos] = (number, indent + len(text) - len(content), content)
+                result.append(self.mapping(self.lines[self.pos][1]))
+            else:
+                self.pos += 1
+                result.append(_scalar(content, self.as_text))
+        return result
+
+    def block_scalar(self, style: str, indent: int, number: int) -> str:
+        """``|`` / ``>`` のブロックスカラーを元の行から取り出す。"""
+        # 内容のインデントより浅い行（コメントのみの行を含む）は次の構造に属する
+        while self.pos < len(self.lines) and self.lines[self.pos][1] > indent:
+            self.pos += 1
+        end = self.lines[self.pos][0] if self.pos < len(self.lines) else len(self.raw)
+        body = self.raw[number + 1 : end]
+        while body and not body[-1].strip():
+            body.pop()
+        width = min((len(line) - len(line.lstrip(" ")) for line in body if line.strip()), default=0)
+        lines = [line[width:] for line in body]
+        text = "\n".join(lines) if style[0] == "|" else " ".join(line.strip() for line in lines)
+        return text if style.endswith("-") or not lines else text + "\n"
+
+
+def parse_yaml(text: str, *, raw: bool = False) -> Any:
+    """YAML のサブセットを解析する（PyYAML を使わない）。
+
+    ``raw=True`` ではスカラーを型に変換せず、元の表記の文字列とする。
+
+    Raises:
+        ValueError: サポートしない構文、または不正なインデントの場合。
+    """
+    return _Parser(text, raw).parse()
+
+
+# ---------------------------------------------------------------------------
+# コマンドライン
+# ---------------------------------------------------------------------------
+
+
+def main(argv: list[str] | None = None) -> int:
+    """設定をシェル変数・JSON・単一の値として出力する。"""
+    parser = argparse.ArgumentParser(description="project-config.yml を読み込む")
+    parser.add_argument("--config", type=Path, default=DEFAULT_CONFIG)
+    commands = parser.add_subparsers(dest="command", required=True)
+    shell = commands.add_parser("shell", help="全キーをシェル変数の代入文として出力する")
+    shell.add_argument("--prefix", default=SHELL_PREFIX)
+    commands.add_parser("json", help="設定を JSON として出力する")
+    get_cmd = commands.add_parser("get", help="1 つのキーの値を出力する")
+    get_cmd.add_argument("key")
+    get_cmd.add_argument("--default", default="")
+    args = parser.parse_args(argv)
+
+    try:
+        # シェル向けの出力（shell / get）は型に変換しない元の表記とする
+        config = load_config(args.config, raw=args.command != "json")
+    except (OSError, ValueError) as exc:
+        print(f"project_config: {exc}", file=sys.stderr)
+        return 1
+    if args.command == "shell":
+        sys.stdout.write(to_shell(config, args.prefix))
+    elif args.command == "json":
+        print(json.dumps(config, ensure_ascii=False, indent=2, default=str))
+    else:
+        value = get(config, args.key)
+        print(args.default if value is None else _shell_value(value))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
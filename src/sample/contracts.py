@@ -0,0 +1,248 @@
+"""Design by Contract の検査を切り替えるための契約レイヤー。
+
+``assert`` による契約は、常に実行される（失敗しなくてもメッセージの f-string を組み立てる）か、
+``python -O`` で黙って消えるかのどちらかしかない。このモジュールは契約をデコレータとして宣言し、
+検査の度合いをモードで選べるようにする。
+
+モード:
+  - ``full``     : すべての契約を毎回検査する（既定）
+  - ``sampled``  : 個々の呼び出しの契約は N 回に 1 回だけ検査する。境界の契約は毎回検査する
+  - ``boundary`` : 境界（バッチの入口など ``boundary=True`` を指定した契約）のみ検査する
+  - ``off``      : 検査しない
+
+モードは起動時に環境変数 ``CONTRACT_MODE``（``sampled`` の間隔は ``CONTRACT_SAMPLE_EVERY``）
+または ``configure_contracts()`` で選ぶ。デコレータはデコレートした時点のモードで検査の有無を
+決めるため、検査しない契約のデコレータは元の関数・クラスをそのまま返し、呼び出しごとの
+オーバーヘッドはない。したがってモードは契約付きのモジュールを import する前に設定すること。
+一方、関数内で ``boundary_checks_enabled()`` を参照する検査（バッチの列全体の検査など）は
+呼び出し時のモードに従うため、import 後にモードを変更すると両者が食い違う。
+
+``python -O`` で起動した場合の既定は ``off``（``assert`` と同じく検査しない）。
+
+違反は ``ContractViolationError``（``AssertionError`` のサブクラス）として送出するため、
+``AssertionError`` を捕捉する既存のコードやテストはそのまま動作する。
+
+使い方::
+
+    @precondition(lambda x: x > 0.0, lambda x: f"x must be > 0.0, got {x}")
+    @postcondition(lambda r: r >= 0.0, "postcondition failed")
+    def f(x: float) -> float: ...
+
+    @dataclass
+    @invariant(lambda self: self.value >= 0.0, "value must be >= 0.0")
+    class Entity:
+        value: float
+"""
+
+import functools
+import itertools
+import os
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any, ParamSpec, TypeVar
+
+P = ParamSpec("P")
+R = TypeVar("R")
+C = TypeVar("C", bound=type)
+
+# 契約違反時のメッセージ。呼び出し可能なら違反時にのみ評価して文字列を得る
+Message = str | Callable[..., str]
+
+CONTRACT_MODES = ("full", "sampled", "boundary", "off")
+
+
+class ContractViolationError(AssertionError):
+    """事前条件・事後条件・不変条件の違反。"""
+
+
+@dataclass(frozen=True)
+class ContractConfig:
+    """契約の検査設定。
+
+    Attributes:
+        mode: ``CONTRACT_MODES`` のいずれか。
+        sample_every: ``sampled`` モードで個々の呼び出しの契約を検査する間隔
+            （N 回に 1 回。最初の呼び出しは常に検査する）。
+    """
+
+    mode: str = "full"
+    sample_every: int = 100
+
+    def __post_init__(self) -> None:
+        if self.mode not in CONTRACT_MODES:
+            raise ValueError(f"contract mode must be one of {CONTRACT_MODES}: {self.mode}")
+        if self.sample_every <= 0:
+            raise ValueError(f"sample_every must be > 0: {self.sample_every}")
+
+
+def _config_from_env() -> ContractConfig:
+    """環境変数から起動時の設定を読む。"""
+    mode = os.environ.get("CONTRACT_MODE") or ("full" if __debug__ else "off")
+    return ContractConfig(mode, int(os.environ.get("CONTRACT_SAMPLE_EVERY", "100")))
+
+
+_config = _config_from_env()
+
+
+def configure_contracts(mode: str = "full", *, sample_every: int = 100) -> None:
+    """契約の検査モードを設定する。
+
+    設定はこれ以降にデコレートされる関数・クラスに適用される。デコレート済みの契約は
+    デコレート時のモードのまま変わらないが、``boundary_checks_enabled()`` は直ちに新しい
+    モードを返す。import 後に呼ぶと一部の検査にのみ反映されるため、契約付きのモジュールを
+    import する前（起動時）に呼ぶこと。
+
+    Args:
+        mode: ``"full"``、``"sampled"``、``"boundary"``、``"off"`` のいずれか。
+        sample_every: ``sampled`` モードの検査間隔。
+
+    Raises:
+        ValueError: モードが不正、または間隔が正でない場合。
+    """
+    global _config
+    _config = ContractConfig(mode, sample_every)
+
+
+def get_contract_config() -> ContractConfig:
+    """現在の契約の検査設定を返す。"""
+    return _config
+
+
+def boundary_checks_enabled() -> bool:
+    """境界の契約を検査するか（``off`` 以外）。
+
+    関数の中で列全体をまとめて検査する場合など、デコレータを使わない境界の検査で用いる。
+    デコレータと異なり、呼び出し時点のモードを返す（``configure_contracts()`` を参照）。
+    """
+    return _config.mode != "off"
+
+
+# ---------------------------------------------------------------------------
+# 検査の判定
+# ---------------------------------------------------------------------------
+
+
+def _gate(boundary: bool) -> Callable[[], bool] | None:
+    """デコレート時のモードから、呼び出しごとに検査するかの判定関数を返す。
+
+    検査しない場合は ``None``、毎回検査する場合は常に True を返す関数を返す。
+    """
+    mode = _config.mode
+    if mode == "off" or (mode == "boundary" and not boundary):
+        return None
+    if mode == "full" or boundary:
+        return _always
+    calls = itertools.count()
+    every = _config.sample_every
+    return lambda: next(calls) % every == 0
+
+
+def _always() -> bool:
+    return True
+
+
+def _violation(message: Message, *args: Any, **kwargs: Any) -> ContractViolationError:
+    """違反時にのみメッセージを組み立てて例外を生成する。"""
+    return ContractViolationError(message if isinstance(message, str) else message(*args, **kwargs))
+
+
+# ---------------------------------------------------------------------------
+# デコレータ
+# ---------------------------------------------------------------------------
+
+
+def precondition(
+    check: Callable[..., bool], message: Message, *, boundary: bool = False
+) -> Callable[[Callable[P, R]], Callable[P, R]]:
+    """関数の事前条件を宣言する。
+
+    Args:
+        check: 関数と同じ引数を受け取り、条件を満たせば True を返す関数。
+        message: 違反時のメッセージ。関数なら同じ引数で違反時にのみ呼び出す。
+        boundary: 境界の契約とする（``boundary`` モードでも検査し、``sampled`` モードでも
+            間引かない）。
+
+    Raises:
+        ContractViolationError: 呼び出し時に条件を満たさない場合。
+    """
+
+    def decorate(func: Callable[P, R]) -> Callable[P, R]:
+        gate = _gate(boundary)
+        if gate is None:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            if gate() and not check(*args, **kwargs):
+                raise _violation(message, *args, **kwargs)
+            return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+def postcondition(
+    check: Callable[[Any], bool], message: Message, *, boundary: bool = False
+) -> Callable[[Callable[P, R]], Callable[P, R]]:
+    """関数の事後条件を宣言する。
+
+    Args:
+        check: 戻り値を受け取り、条件を満たせば True を返す関数。
+        message: 違反時のメッセージ。関数なら戻り値を渡して違反時にのみ呼び出す。
+        boundary: 境界の契約とする（``precondition`` と同じ）。
+
+    Raises:
+        ContractViolationError: 戻り値が条件を満たさない場合。
+    """
+
+    def decorate(func: Callable[P, R]) -> Callable[P, R]:
+        gate = _gate(boundary)
+        if gate is None:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            result = func(*args, **kwargs)
+            if gate() and not check(result):
+                raise _violation(message, result)
+            return result
+
+        return wrapper
+
+    return decorate
+
+
+def invariant(
+    check: Callable[[Any], bool], message: Message, *, boundary: bool = False
+) -> Callable[[C], C]:
+    """クラスの不変条件を宣言する（インスタンス生成時に検査する）。
+
+    ``__post_init__`` として検査を組み込むため、dataclass では ``@dataclass`` の内側
+    （下）に置く。複数の不変条件は上に書いたものから順に検査する。
+
+    Args:
+        check: インスタンスを受け取り、条件を満たせば True を返す関数。
+        message: 違反時のメッセージ。関数ならインスタンスを渡して違反時にのみ呼び出す。
+        boundary: 境界の契約とする（``precondition`` と同じ）。
+
+    Raises:
+        ContractViolationError: 生成したインスタンスが条件を満たさない場合。
+    """
+
+    def decorate(cls: C) -> C:
+        gate = _gate(boundary)
+        if gate is None:
+            return cls
+        following = cls.__dict__.get("__post_init__")
+
+        def post_init(self: Any) -> None:
+            if gate() and not check(self):
+                raise _violation(message, self)
+            if following is not None:
+                following(self)
+
+        cls.__post_init__ = post_init  # type: ignore[attr-defined]
+        return cls
+
+    return decorate
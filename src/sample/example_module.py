@@ -4,31 +4,66 @@
 
 1. **型アノテーション**: すべての関数引数・戻り値に型を付与し、mypy strict に準拠する
 2. **Design by Contract**: docstring に事前条件・事後条件・不変条件を明記する
-3. **アサーション**: 実行時に契約違反を即座に検出する防御的プログラミング
+3. **実行時の契約検査**: 契約違反を即座に検出する防御的プログラミング。
+   検査の度合いは ``sample.contracts`` のモードで切り替える
+4. **列指向のバッチ処理**: 大量データでは契約を列全体に対する 1 回の検査として記述する
+5. **省メモリ表現**: ``__slots__`` 版と struct-of-arrays 版でも同じ不変条件を保つ
 
 プロジェクトのドメインに合わせてカスタマイズすること:
   - ``ExampleEntity`` をドメインのエンティティ名に変更する
   - ``process()`` をドメインのビジネスロジックに置き換える
+  - ``process_batch()`` は ``process()`` の列指向版として同じ契約を保つ
   - docstring の契約記述パターンはそのまま踏襲する
 """
 
+import sys
+from array import array
+from collections.abc import Iterable, Sequence
 from dataclasses import dataclass
+from typing import Any, overload
+
+from .contracts import (
+    ContractViolationError,
+    boundary_checks_enabled,
+    invariant,
+    postcondition,
+    precondition,
+)
+
+# NumPy はオプショナル依存。未インストールの場合、process_batch() は array('d') 上の
+# ループで同じ結果を返す。
+try:
+    import numpy as np
+
+    _HAS_NUMPY = True
+except ImportError:
+    _HAS_NUMPY = False
 
 # ---------------------------------------------------------------------------
 # データクラス: ドメインエンティティのサンプル
 # ---------------------------------------------------------------------------
 
 
+# ExampleEntity 系のクラスが共有する不変条件。メッセージは違反時にのみ組み立てる。
+# CUSTOMIZE: 不変条件をドメインに合わせて調整すること。
+_value_non_negative = invariant(
+    lambda self: self.value >= 0.0, lambda self: f"value must be >= 0.0, got {self.value}"
+)
+_name_not_empty = invariant(lambda self: bool(self.name), "name must not be empty")
+
+
 # CUSTOMIZE: ExampleEntity をプロジェクトのドメインエンティティ名に変更すること。
 #   例: Order, Task, Document, Measurement など。
-#   不変条件のアサーション（__post_init__）もドメインに合わせて調整する。
 @dataclass
+@_value_non_negative
+@_name_not_empty
 class ExampleEntity:
     """ドメインエンティティのサンプルデータクラス。
 
     このクラスは Spec-Driven Development における **不変条件（Invariant）** の
-    記述方法を示す。``__post_init__`` でアサーションを配置し、
-    インスタンス生成時に不変条件を強制する。
+    記述方法を示す。``@invariant`` で宣言した不変条件は ``__post_init__`` として
+    組み込まれ、インスタンス生成時に強制される（契約の検査モードが ``off`` /
+    ``boundary`` の場合は検査しない）。
 
     不変条件 (Invariant):
         - ``value`` は 0.0 以上であること
@@ -39,26 +74,72 @@ class ExampleEntity:
         value: エンティティの数値。0.0 以上であること。
 
     Raises:
-        AssertionError: 不変条件に違反した場合。
+        ContractViolationError: 不変条件に違反した場合（``AssertionError`` のサブクラス）。
 
     Example::
 
         entity = ExampleEntity(name="sample", value=10.0)  # OK
-        entity = ExampleEntity(name="", value=10.0)         # AssertionError
-        entity = ExampleEntity(name="sample", value=-1.0)   # AssertionError
+        entity = ExampleEntity(name="", value=10.0)         # ContractViolationError
+        entity = ExampleEntity(name="sample", value=-1.0)   # ContractViolationError
     """
 
     name: str
     value: float
 
-    def __post_init__(self) -> None:
-        """不変条件を検証する。
 
-        インスタンス生成時に自動的に呼び出され、
-        すべてのフィールドが不変条件を満たしているかを確認する。
-        """
-        assert self.value >= 0.0, f"value must be >= 0.0, got {self.value}"
-        assert self.name, "name must not be empty"
+# ---------------------------------------------------------------------------
+# 省メモリ版のエンティティ: 大量のインスタンスを保持する場合のサンプル
+# ---------------------------------------------------------------------------
+
+
+@_value_non_negative
+@_name_not_empty
+class _ExampleEntityInvariant:
+    """``ExampleEntity`` と同じ不変条件を持つスロット版エンティティの共通基底。"""
+
+    __slots__ = ()
+
+    name: str
+    value: float
+
+
+@dataclass(slots=True)
+class SlottedExampleEntity(_ExampleEntityInvariant):
+    """``__slots__`` を持つ ``ExampleEntity``。
+
+    インスタンスごとの ``__dict__`` を持たないため、1 件あたりのメモリが小さい。
+    属性の追加はできない。不変条件は ``ExampleEntity`` と同一。
+
+    Attributes:
+        name: エンティティの識別名。空文字列は許可しない。
+        value: エンティティの数値。0.0 以上であること。
+
+    Raises:
+        ContractViolationError: 不変条件に違反した場合。
+    """
+
+    name: str
+    value: float
+
+
+@dataclass(slots=True, frozen=True)
+class FrozenExampleEntity(_ExampleEntityInvariant):
+    """``__slots__`` を持つ不変（frozen）の ``ExampleEntity``。
+
+    生成後に属性を変更できないため、生成時の不変条件の検証が常に有効であり、
+    ハッシュ可能（dict のキーや set の要素に使える）。
+
+    Raises:
+        ContractViolationError: 不変条件に違反した場合。
+        dataclasses.FrozenInstanceError: 属性を変更しようとした場合。
+    """
+
+    name: str
+    value: float
+
+
+# process() / ExampleEntityBatch が受け付けるエンティティ
+AnyExampleEntity = ExampleEntity | SlottedExampleEntity | FrozenExampleEntity
 
 
 # ---------------------------------------------------------------------------
@@ -68,11 +149,18 @@ class ExampleEntity:
 
 # CUSTOMIZE: process() をプロジェクトのビジネスロジックに置き換えること。
 #   事前条件・事後条件のパターンはそのまま踏襲する。
-def process(entity: ExampleEntity, multiplier: float) -> float:
+@precondition(
+    lambda entity, multiplier: multiplier > 0.0,
+    lambda entity, multiplier: f"multiplier must be > 0.0, got {multiplier}",
+)
+@postcondition(
+    lambda result: result >= 0.0, lambda result: f"postcondition failed: result={result}"
+)
+def process(entity: AnyExampleEntity, multiplier: float) -> float:
     """エンティティの value に multiplier を適用し結果を返す。
 
     この関数は **事前条件（Precondition）** と **事後条件（Postcondition）** の
-    記述方法を示す。アサーションで契約を実行時にも検証する。
+    記述方法を示す。契約はデコレータで宣言し、検査モードに応じて実行時に検証する。
 
     事前条件 (Precondition):
         - ``multiplier`` は 0.0 より大きいこと
@@ -88,20 +176,246 @@ def process(entity: ExampleEntity, multiplier: float) -> float:
         ``entity.value * multiplier`` の計算結果（0.0 以上）。
 
     Raises:
-        AssertionError: 事前条件または事後条件に違反した場合。
+        ContractViolationError: 事前条件または事後条件に違反した場合。
 
     Example::
 
         entity = ExampleEntity(name="item", value=5.0)
         result = process(entity, 2.0)  # -> 10.0
     """
-    # --- 事前条件の検証 ---
-    assert multiplier > 0.0, f"multiplier must be > 0.0, got {multiplier}"
+    return entity.value * multiplier
+
+
+# ---------------------------------------------------------------------------
+# 列指向のバッチ処理: 大量のエンティティに対する契約付き処理のサンプル
+# ---------------------------------------------------------------------------
+
+
+def _first_violation(ok: Sequence[bool] | Any) -> int:
+    """``ok`` が偽となる最初の位置を返す（違反がなければ -1）。"""
+    if _HAS_NUMPY and isinstance(ok, np.ndarray):
+        bad = np.flatnonzero(~ok)
+        return int(bad[0]) if bad.size else -1
+    return next((i for i, flag in enumerate(ok) if not flag), -1)
+
+
+def _require_column(ok: Sequence[bool] | Any, column: Any, message: str) -> None:
+    """列全体の検査で ``ok`` が偽となった最初の位置を、値と位置を添えて違反として送出する。"""
+    index = _first_violation(ok)
+    if index >= 0:
+        raise ContractViolationError(f"{message}{column[index]} at index {index}")
+
+
+class _InternedNames(Sequence[str]):
+    """名前表と番号の列から名前を引く読み取り専用のビュー。"""
+
+    __slots__ = ("_ids", "_table")
+
+    def __init__(self, table: list[str], ids: "array[int]") -> None:
+        self._table = table
+        self._ids = ids
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    @overload
+    def __getitem__(self, index: int) -> str: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[str]: ...
+
+    def __getitem__(self, index: int | slice) -> str | list[str]:
+        if isinstance(index, slice):
+            return [self._table[i] for i in self._ids[index]]
+        return self._table[self._ids[index]]
+
+
+class ExampleEntityBatch:
+    """``ExampleEntity`` の列指向（struct-of-arrays）コレクション。
+
+    ``value`` は ``array('d')``（連続した倍精度浮動小数点数）に、``name`` は重複を
+    除いた名前表（インターン済み）への番号として ``array('I')`` に格納する。
+    エンティティごとのオブジェクトを生成しないため、1 件あたり 12 バイト程度
+    （+ 異なる名前ごとの文字列）で保持でき、``process_batch()`` で一括処理できる。
+
+    不変条件 (Invariant):
+        - ``names`` と ``values`` の長さが等しいこと
+        - すべての ``value`` が 0.0 以上であること
+        - すべての ``name`` が空文字列ではないこと
+
+    Attributes:
+        names: エンティティの識別名の列（読み取り専用のビュー）。
+        values: エンティティの数値の列。
+        name_table: 重複を除いた名前の一覧（登場順）。
+
+    Raises:
+        ContractViolationError: 不変条件に違反した場合（違反した位置をメッセージに含む）。
+            契約の検査モードが ``off`` の場合は検査しない。
+
+    Example::
+
+        batch = ExampleEntityBatch(["a", "b", "a"], array("d", [1.0, 2.0, 3.0]))
+        batch[1]        # -> ExampleEntity(name="b", value=2.0)
+        batch.name_table  # -> ["a", "b"]
+    """
+
+    __slots__ = ("_ids", "_index", "name_table", "values")
+
+    def __init__(self, names: Iterable[str], values: Iterable[float] | Any = ()) -> None:
+        self.name_table: list[str] = []
+        self._index: dict[str, int] = {}
+        self._ids = array("I", map(self._intern, names))
+        if _HAS_NUMPY and isinstance(values, np.ndarray):
+            # NumPy 配列は要素ごとに変換せずバイト列として一括で取り込む
+            self.values = array("d", np.ascontiguousarray(values, np.float64).tobytes())
+        elif isinstance(values, array) and values.typecode == "d":
+            self.values = values
+        else:
+            self.values = array("d", values)
+        if boundary_checks_enabled():
+            self._check_invariants()
+
+    def _intern(self, name: str) -> int:
+        """名前表での番号を返す（未登録なら追加する）。"""
+        index = self._index.get(name)
+        if index is None:
+            index = self._index[name] = len(self.name_table)
+            self.name_table.append(sys.intern(str(name)))
+        return index
+
+    def _check_invariants(self) -> None:
+        """不変条件を列全体に対する検査として確認する。"""
+        if len(self._ids) != len(self.values):
+            raise ContractViolationError(
+                f"names and values must have the same length, "
+                f"got {len(self._ids)} and {len(self.values)}"
+            )
+        _require_column(
+            np.frombuffer(self.values) >= 0.0 if _HAS_NUMPY else [v >= 0.0 for v in self.values],
+            self.values,
+            "value must be >= 0.0, got ",
+        )
+        # 名前は表に登録済みの重複しない値のみを検査すればよい
+        empty = self._index.get("")
+        if empty is not None:
+            raise ContractViolationError(
+                f"name must not be empty at index {self._ids.index(empty)}"
+            )
+
+    @classmethod
+    def from_entities(cls, entities: Iterable[AnyExampleEntity]) -> "ExampleEntityBatch":
+        """エンティティの列から生成する。"""
+        batch = cls(())
+        batch.extend(entities)
+        return batch
+
+    @property
+    def names(self) -> Sequence[str]:
+        """エンティティの識別名の列。"""
+        return _InternedNames(self.name_table, self._ids)
+
+    def append(self, name: str, value: float) -> None:
+        """エンティティを 1 件追加する。"""
+        if boundary_checks_enabled():
+            if not value >= 0.0:
+                raise ContractViolationError(
+                    f"value must be >= 0.0, got {value} at index {len(self)}"
+                )
+            if not name:
+                raise ContractViolationError(f"name must not be empty at index {len(self)}")
+        self._ids.append(self._intern(name))
+        self.values.append(value)
+
+    def extend(self, entities: Iterable[AnyExampleEntity]) -> None:
+        """エンティティの列を追加する。
+
+        境界の検査が有効な場合は ``append()`` と同じく各エンティティを検査し、違反した位置を
+        報告する（``boundary`` モードではエンティティの生成時に不変条件を検査しないため）。
+        """
+        if boundary_checks_enabled():
+            for entity in entities:
+                self.append(entity.name, entity.value)
+            return
+        for entity in entities:
+            self._ids.append(self._intern(entity.name))
+            self.values.append(entity.value)
+
+    def nbytes(self) -> int:
+        """列と名前表が保持するデータのおおよそのバイト数。"""
+        table = sum(sys.getsizeof(name) for name in self.name_table)
+        return self._ids.itemsize * len(self._ids) + self.values.itemsize * len(self) + table
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __getitem__(self, index: int) -> ExampleEntity:
+        return ExampleEntity(name=self.name_table[self._ids[index]], value=self.values[index])
+
+
+# CUSTOMIZE: process_batch() は process() の列指向版である。process() を置き換えた場合は
+#   同じ事前条件・事後条件を列全体の検査として記述すること。
+@precondition(
+    lambda entities, multiplier: multiplier > 0.0,
+    lambda entities, multiplier: f"multiplier must be > 0.0, got {multiplier}",
+    boundary=True,
+)
+def process_batch(entities: ExampleEntityBatch | Sequence[float] | Any, multiplier: float) -> Any:
+    """全エンティティの value に multiplier を一括で適用する。
+
+    ``process()`` の列指向版。NumPy がインストールされていれば 1 回のベクトル演算で
+    計算し、契約も列全体に対する 1 回の検査として確認する。NumPy がない場合は
+    ``array('d')`` 上のループで同じ結果を返す。
+
+    契約はバッチの入口（境界）の契約であり、検査モードが ``sampled`` / ``boundary`` でも
+    毎回検査する（``off`` の場合のみ検査しない）。
+
+    事前条件 (Precondition):
+        - ``multiplier`` は 0.0 より大きいこと
+        - すべての value が 0.0 以上であること（``ExampleEntity`` の不変条件）
+
+    事後条件 (Postcondition):
+        - すべての戻り値が 0.0 以上であること
+
+    Args:
+        entities: ``ExampleEntityBatch``、または value の列（NumPy 配列・数値のシーケンス）。
+        multiplier: 乗数。0.0 より大きいこと。
+
+    Returns:
+        各 value に multiplier を掛けた列。NumPy があれば ``numpy.ndarray``、
+        なければ ``array('d')``。
+
+    Raises:
+        ContractViolationError: 事前条件または事後条件に違反した場合
+            （違反した位置をメッセージに含む）。
+
+    Example::
+
+        process_batch(np.array([1.0, 2.5]), 2.0)  # -> array([2., 5.])
+    """
+    values = entities.values if isinstance(entities, ExampleEntityBatch) else entities
+    check = boundary_checks_enabled()
+
+    if _HAS_NUMPY:
+        column = np.asarray(values, dtype=np.float64)
+        # --- 事前条件の検証 ---
+        if check:
+            _require_column(column >= 0.0, column, "value must be >= 0.0, got ")
 
-    # --- ビジネスロジック ---
-    result = entity.value * multiplier
+        # --- ビジネスロジック ---（オーバーフローは process() と同じく inf とし、警告しない）
+        with np.errstate(over="ignore"):
+            result = column * multiplier
 
-    # --- 事後条件の検証 ---
-    assert result >= 0.0, f"postcondition failed: result={result}"
+        # --- 事後条件の検証 ---
+        if check:
+            _require_column(result >= 0.0, result, "postcondition failed: result=")
+        return result
 
-    return result
+    items = values if isinstance(values, array) else array("d", values)
+    if check:
+        _require_column([v >= 0.0 for v in items], items, "value must be >= 0.0, got ")
+    result_column = array("d", [v * multiplier for v in items])
+    if check:
+        _require_column(
+            [r >= 0.0 for r in result_column], result_column, "postcondition failed: result="
+        )
+    return result_column
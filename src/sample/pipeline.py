@@ -0,0 +1,285 @@
+"""大きな入力ファイルを一定のメモリで処理するストリーミングパイプラインのサンプル。
+
+CSV / JSONL のレコードを一定件数ずつのチャンクとして読み込み、``ExampleEntityBatch`` に
+変換して（チャンク単位で不変条件を検証する）、``process_batch()`` で一括処理し、結果を
+チャンクごとに書き出す。各段はジェネレータでつながっているため、保持するのは処理中の
+チャンクのみであり、メモリ使用量は入力の大きさに依存しない。
+
+``workers`` を指定するとチャンクをプロセスプールで並列に処理する。同時に処理中とする
+チャンク数には上限（``max_in_flight``）を設け、結果は入力の順序で書き出す。
+
+入力形式（拡張子で判定する。``.jsonl`` 以外は CSV とみなす）:
+  - CSV   : ヘッダ行に ``name`` と ``value`` の列を持つ
+  - JSONL : 1 行に 1 つの ``{"name": ..., "value": ...}``
+
+出力は入力と同じ規則で、``name`` と ``result`` を持つ CSV / JSONL とする。
+
+使い方::
+
+    python -m sample.pipeline input.csv output.csv --multiplier 2.0 --workers 4
+
+CUSTOMIZE: レコードの形式と ``process_batch()`` をプロジェクトのものに置き換えること。
+"""
+
+import argparse
+import csv
+import json
+from array import array
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import IO, Any, NamedTuple
+
+from .contracts import ContractViolationError
+from .example_module import ExampleEntityBatch, process_batch
+
+# 1 チャンクあたりのレコード数の既定値
+DEFAULT_CHUNK_SIZE = 65536
+
+
+class Chunk(NamedTuple):
+    """入力の一部分。
+
+    Attributes:
+        start: チャンク先頭のレコード番号（0 始まり、ヘッダ行を除く）。
+        batch: チャンクのレコード。
+    """
+
+    start: int
+    batch: ExampleEntityBatch
+
+
+def _is_jsonl(path: Path) -> bool:
+    return path.suffix.lower() == ".jsonl"
+
+
+# ---------------------------------------------------------------------------
+# 読み込み
+# ---------------------------------------------------------------------------
+
+
+def _csv_rows(stream: IO[str]) -> Iterator[tuple[str, str]]:
+    """CSV の各行から ``(name, value)`` を取り出す（空行は読み飛ばす）。
+
+    Raises:
+        ValueError: ヘッダに ``name`` / ``value`` がない、または列の足りない行がある場合。
+    """
+    reader = csv.reader(stream)
+    header = next(reader, None)
+    if header is None:
+        return
+    try:
+        name_col, value_col = header.index("name"), header.index("value")
+    except ValueError:
+        raise ValueError(f"CSV header must contain 'name' and 'value': {header}") from None
+    width = max(name_col, value_col) + 1
+    for row in reader:
+        if not row:
+            continue
+        if len(row) < width:
+            raise ValueError(
+                f"CSV line {reader.line_num} has {len(row)} fields, expected at least {width}"
+            )
+        yield row[name_col], row[value_col]
+
+
+def _jsonl_rows(stream: IO[str]) -> Iterator[tuple[str, Any]]:
+    """JSONL の各行から ``(name, value)`` を取り出す（空行は読み飛ばす）。"""
+    for line in stream:
+        if line.strip():
+            record = json.loads(line)
+            yield record["name"], record["value"]
+
+
+def read_chunks(path: str | Path, *, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Chunk]:
+    """入力ファイルを ``chunk_size`` 件ずつのチャンクとして読み込む。
+
+    各チャンクは ``ExampleEntityBatch`` の生成時に不変条件を検証する。
+
+    Args:
+        path: CSV または JSONL のファイル。
+        chunk_size: 1 チャンクあたりのレコード数。
+
+    Yields:
+        入力の先頭から順にチャンク。
+
+    Raises:
+        ValueError: ``chunk_size`` が正でない、またはレコードを解釈できない場合。
+        ContractViolationError: レコードが不変条件に違反した場合
+            （チャンク先頭のレコード番号をメッセージに含む）。
+    """
+    if chunk_size <= 0:
+        raise ValueError(f"chunk_size must be > 0: {chunk_size}")
+    path = Path(path)
+    with path.open(encoding="utf-8", newline="") as stream:
+        rows = _jsonl_rows(stream) if _is_jsonl(path) else _csv_rows(stream)
+        start = 0
+        while True:
+            try:
+                records = list(islice(rows, chunk_size))
+                names = [name for name, _ in records]
+                values = array("d", [float(value) for _, value in records])
+            except (ValueError, KeyError, TypeError) as exc:
+                raise ValueError(
+                    f"invalid record in chunk starting at record {start}: {exc}"
+                ) from exc
+            if not records:
+                return
+            try:
+                batch = ExampleEntityBatch(names, values)
+            except ContractViolationError as exc:
+                raise ContractViolationError(f"{exc} (chunk starting at record {start})") from exc
+            yield Chunk(start, batch)
+            start += len(records)
+
+
+# ---------------------------------------------------------------------------
+# 処理
+# ---------------------------------------------------------------------------
+
+
+def _process_chunk(batch: ExampleEntityBatch, multiplier: float) -> list[float]:
+    """1 チャンクを処理する（プロセスプールのワーカーで実行する）。"""
+    return list(process_batch(batch, multiplier).tolist())
+
+
+def process_chunks(
+    chunks: Iterable[Chunk],
+    multiplier: float,
+    *,
+    workers: int = 0,
+    max_in_flight: int | None = None,
+) -> Iterator[tuple[Chunk, list[float]]]:
+    """チャンクごとに ``process_batch()`` を適用する。
+
+    ``workers`` が 1 以上の場合はプロセスプールで並列に処理する。入力から先読みして
+    処理中とするチャンクは ``max_in_flight`` 個までとし、結果は入力の順序で返す。
+
+    Args:
+        chunks: 処理するチャンク。
+        multiplier: ``process_batch()`` に渡す乗数。
+        workers: ワーカープロセス数。0 の場合は呼び出し元のプロセスで処理する。
+        max_in_flight: 同時に処理中とするチャンク数の上限（既定は ``workers * 2``）。
+
+    Yields:
+        入力の順序で ``(チャンク, 結果)``。
+
+    Raises:
+        ValueError: ``workers`` が負、または ``max_in_flight`` が正でない場合。
+        ContractViolationError: 事前条件または事後条件に違反した場合。
+    """
+    if workers < 0:
+        raise ValueError(f"workers must be >= 0: {workers}")
+    if workers == 0:
+        for chunk in chunks:
+            yield chunk, _process_chunk(chunk.batch, multiplier)
+        return
+
+    limit = workers * 2 if max_in_flight is None else max_in_flight
+    if limit <= 0:
+        raise ValueError(f"max_in_flight must be > 0: {limit}")
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        in_flight: deque[tuple[Chunk, Future[list[float]]]] = deque()
+        try:
+            for chunk in chunks:
+                if len(in_flight) >= limit:
+                    done, future = in_flight.popleft()
+                    yield done, future.result()
+                in_flight.append((chunk, pool.submit(_process_chunk, chunk.batch, multiplier)))
+            while in_flight:
+                done, future = in_flight.popleft()
+                yield done, future.result()
+        finally:
+            # 途中で中断された場合は未着手のチャンクを破棄する
+            for _, future in in_flight:
+                future.cancel()
+
+
+# ---------------------------------------------------------------------------
+# 書き出し
+# ---------------------------------------------------------------------------
+
+
+def write_results(results: Iterable[tuple[Chunk, list[float]]], path: str | Path) -> int:
+    """結果をチャンクごとに書き出す。
+
+    Args:
+        results: ``process_chunks()`` の結果。
+        path: 出力先（``.jsonl`` なら JSONL、それ以外は CSV）。
+
+    Returns:
+        書き出したレコード数。
+    """
+    path = Path(path)
+    count = 0
+    with path.open("w", encoding="utf-8", newline="") as stream:
+        if _is_jsonl(path):
+            for chunk, values in results:
+                stream.writelines(
+                    json.dumps({"name": name, "result": value}) + "\n"
+                    for name, value in zip(chunk.batch.names[:], values, strict=True)
+                )
+                count += len(values)
+        else:
+            writer = csv.writer(stream)
+            writer.writerow(("name", "result"))
+            for chunk, values in results:
+                writer.writerows(zip(chunk.batch.names[:], values, strict=True))
+                count += len(values)
+    return count
+
+
+def run_pipeline(
+    source: str | Path,
+    destination: str | Path,
+    multiplier: float,
+    *,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    workers: int = 0,
+    max_in_flight: int | None = None,
+) -> int:
+    """入力ファイルを読み込み、処理し、結果を書き出す。
+
+    Args:
+        source: 入力ファイル（CSV / JSONL）。
+        destination: 出力ファイル（CSV / JSONL）。
+        multiplier: ``process_batch()`` に渡す乗数。
+        chunk_size: 1 チャンクあたりのレコード数。
+        workers: ワーカープロセス数（0 の場合は並列化しない）。
+        max_in_flight: 同時に処理中とするチャンク数の上限。
+
+    Returns:
+        書き出したレコード数。
+    """
+    chunks = read_chunks(source, chunk_size=chunk_size)
+    results = process_chunks(chunks, multiplier, workers=workers, max_in_flight=max_in_flight)
+    return write_results(results, destination)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """コマンドラインからパイプラインを実行する。"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0] if __doc__ else None)
+    parser.add_argument("source", type=Path)
+    parser.add_argument("destination", type=Path)
+    parser.add_argument("--multiplier", type=float, required=True)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--workers", type=int, default=0)
+    parser.add_argument("--max-in-flight", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    count = run_pipeline(
+        args.source,
+        args.destination,
+        args.multiplier,
+        chunk_size=args.chunk_size,
+        workers=args.workers,
+        max_in_flight=args.max_in_flight,
+    )
+    print(f"processed {count} records: {args.destination}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
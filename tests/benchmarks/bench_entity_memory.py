@@ -0,0 +1,97 @@
+"""ExampleEntity の表現ごとのメモリ使用量を比較するベンチマーク。
+
+同一の (name, value) の列を以下の表現で保持し、1 件あたりのバイト数を比較する。
+
+1. ``dataclass``  : ``ExampleEntity``（インスタンスごとに ``__dict__`` を持つ）
+2. ``slots``      : ``SlottedExampleEntity``
+3. ``frozen``     : ``FrozenExampleEntity``（slots + frozen）
+4. ``columnar``   : ``ExampleEntityBatch``（``array('d')`` + インターン済みの名前表）
+
+オブジェクト表現はリストで保持するため、リストの参照（1 件 8 バイト）も含む。
+名前の文字列はすべての表現で共有されるため計上しない（名前表の分は ``columnar`` に含まれる）。
+
+使い方:
+    python tests/benchmarks/bench_entity_memory.py
+    python tests/benchmarks/bench_entity_memory.py --entities 1000000 --names 1000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import tracemalloc
+from array import array
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src"))
+
+from sample.example_module import (  # noqa: E402
+    ExampleEntity,
+    ExampleEntityBatch,
+    FrozenExampleEntity,
+    SlottedExampleEntity,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+REPRESENTATIONS: dict[str, Callable[[list[str], array[float]], object]] = {
+    "dataclass": lambda names, values: [
+        ExampleEntity(n, v) for n, v in zip(names, values, strict=True)
+    ],
+    "slots": lambda names, values: [
+        SlottedExampleEntity(n, v) for n, v in zip(names, values, strict=True)
+    ],
+    "frozen": lambda names, values: [
+        FrozenExampleEntity(n, v) for n, v in zip(names, values, strict=True)
+    ],
+    # 値の列は引数の array をそのまま保持するため、比較のために複製して計上する
+    "columnar": lambda names, values: ExampleEntityBatch(names, array("d", values)),
+}
+
+
+def make_columns(entities: int, names: int, seed: int) -> tuple[list[str], array[float]]:
+    """``names`` 種類の名前と非負の値からなる列を生成する。"""
+    rng = random.Random(seed)
+    table = [f"entity-{i}" for i in range(names)]
+    return (
+        [rng.choice(table) for _ in range(entities)],
+        array("d", (rng.uniform(0.0, 1e6) for _ in range(entities))),
+    )
+
+
+def bytes_per_entity(name: str, names: list[str], values: array[float]) -> float:
+    """表現 ``name`` で列を保持したときの 1 件あたりの確保バイト数。"""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        held = REPRESENTATIONS[name](names, values)
+        used = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    del held
+    return used / len(values)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """ベンチマークを実行し、結果を表形式で出力する。"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entities", type=int, default=200_000)
+    parser.add_argument("--names", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    names, values = make_columns(args.entities, args.names, args.seed)
+    print(f"entities: {args.entities}, distinct names: {args.names}")
+    baseline = None
+    for name in REPRESENTATIONS:
+        per_entity = bytes_per_entity(name, names, values)
+        baseline = baseline or per_entity
+        print(f"  {name:<10} {per_entity:8.1f} B/entity  x{baseline / per_entity:.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
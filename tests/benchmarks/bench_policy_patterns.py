@@ -0,0 +1,169 @@
+"""policy_check のパターン照合方式を比較するマイクロベンチマーク。
+
+以下の 3 方式で同一の合成コーパスをスキャンし、所要時間と結果の一致を確認する。
+
+1. ``legacy``   : 旧実装。パターンごとに ``re.search``、URL は行ごとに検索
+2. ``combined`` : 全パターンを名前付きグループの選択（``|``）に結合し 1 パスで走査
+3. ``engine``   : ``PatternEngine``（事前コンパイル + リテラル接頭辞フィルタ + URL 1 パス）
+
+使い方:
+    python tests/benchmarks/bench_policy_patterns.py
+    python tests/benchmarks/bench_policy_patterns.py --files 500 --lines 400 --repeat 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import re
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "ci"))
+
+import policy_check as pc  # noqa: E402
+
+# ダミーの秘密情報と許可リスト外の URL（本ファイル自体が検出されないよう実行時に組み立てる）
+FAKE_SECRETS = ["AKIA" + "Z" * 16, "ghp_" + "x" * 36]
+FAKE_URL = "https" + "://api.unknown-host.net"
+
+# URL を含む行は全体の 1 割程度（実際のコードより多めに設定している）
+CODE_LINES = [
+    "def handler(event: dict) -> dict:",
+    "    result = compute(event['value'], factor=2)",
+    f"    # see {FAKE_URL}/wiki/handler",
+    '    url = "https://github.com/org/repo"',
+    f'    endpoint = "{FAKE_URL}/v1/items"',
+    "    return {'status': 'ok', 'items': result}",
+    "",
+    "class Worker:",
+    '    """Background worker."""',
+    "    retries = 3",
+    "    timeout_sec: float = 30.0",
+    "    def run(self, queue: Queue[Task]) -> None:",
+    "        for task in queue.drain(max_items=self.batch_size):",
+    "            self.logger.info('processing %s', task.task_id)",
+    "            outcome = self.executor.submit(task).result(timeout=self.timeout_sec)",
+    "            if outcome.failed and self.retries > 0:",
+    "                queue.put(task.with_attempt(task.attempt + 1))",
+    "        self.metrics.increment('worker.batches')",
+    "import logging",
+    "from collections.abc import Iterable",
+    "logger = logging.getLogger(__name__)",
+    "    value: int = field(default=0, metadata={'unit': 'ms'})",
+    "    raise ValueError(f'unexpected state: {state!r}')",
+    "    assert isinstance(items, Iterable), 'items must be iterable'",
+    "",
+    "",
+]
+
+Strategy = Callable[[str, str], list[object]]
+
+
+def make_corpus(files: int, lines: int, seed: int) -> list[str]:
+    """合成コードファイルの本文を生成する。"""
+    rng = random.Random(seed)
+    corpus = []
+    for i in range(files):
+        body = [rng.choice(CODE_LINES) for _ in range(lines)]
+        if i % 50 == 0:
+            body.append(f'TOKEN = "{rng.choice(FAKE_SECRETS)}"')
+        corpus.append("\n".join(body))
+    return corpus
+
+
+def legacy_scan(text: str, suffix: str) -> list[object]:
+    """旧実装（パターンごとの re.search と行単位の URL 検索）。"""
+    found: list[object] = []
+    for pat in pc.FORBIDDEN_IMPORT_PATTERNS:
+        if re.search(pat, text, flags=re.MULTILINE):
+            found.append(pat)
+    for lineno, line in enumerate(text.splitlines(), start=1):
+        if pc.is_comment_line(line, suffix):
+            continue
+        if re.search(pc.URL_PATTERN, line) and not any(
+            re.search(pat, line) for pat in pc.URL_ALLOWLIST_PATTERNS
+        ):
+            found.append(lineno)
+    for pat in pc.SECRET_PATTERNS:
+        if re.search(pat, text):
+            found.append(pat)
+    for pat in pc.FORBIDDEN_PATTERNS:
+        if re.search(pat, text, flags=re.MULTILINE):
+            found.append(pat)
+    return found
+
+
+def make_combined_scan() -> Strategy:
+    """全パターンを名前付きグループの選択に結合した方式を構築する。"""
+    rules = (
+        [(pat, "m") for pat in pc.FORBIDDEN_IMPORT_PATTERNS]
+        + [(pat, "") for pat in pc.SECRET_PATTERNS]
+        + [(pat, "m") for pat in pc.FORBIDDEN_PATTERNS]
+    )
+    combined = re.compile(
+        "|".join(
+            f"(?P<p{i}>(?{flags}:{pat}))" if flags else f"(?P<p{i}>{pat})"
+            for i, (pat, flags) in enumerate(rules)
+        )
+    )
+    engine = pc.get_engine()
+
+    def scan(text: str, suffix: str) -> list[object]:
+        hits = {int(m.lastgroup[1:]) for m in combined.finditer(text) if m.lastgroup}
+        n_imports = len(pc.FORBIDDEN_IMPORT_PATTERNS)
+        found: list[object] = [rules[i][0] for i in sorted(hits) if i < n_imports]
+        found.extend(lineno for lineno, _ in engine.url_violation_lines(text, suffix))
+        found.extend(rules[i][0] for i in sorted(hits) if i >= n_imports)
+        return found
+
+    return scan
+
+
+def engine_scan(text: str, suffix: str) -> list[object]:
+    """PatternEngine による方式。"""
+    engine = pc.get_engine()
+    found: list[object] = [pat for pat, _ in engine.matching_imports(text)]
+    found.extend(lineno for lineno, _ in engine.url_violation_lines(text, suffix))
+    found.extend(pat for pat, _ in engine.matching_secrets(text))
+    found.extend(pat for pat, _ in engine.matching_forbidden(text))
+    return found
+
+
+def bench(strategy: Strategy, corpus: list[str], repeat: int) -> tuple[float, list[list[object]]]:
+    """最良の所要時間（秒）と結果を返す。"""
+    best = float("inf")
+    results: list[list[object]] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = [strategy(text, ".py") for text in corpus]
+        best = min(best, time.perf_counter() - start)
+    return best, results
+
+
+def main(argv: list[str] | None = None) -> int:
+    """ベンチマークを実行し、結果を表形式で出力する。"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=200)
+    parser.add_argument("--lines", type=int, default=300)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    corpus = make_corpus(args.files, args.lines, args.seed)
+    size_mb = sum(len(text) for text in corpus) / 1e6
+    print(f"corpus: {args.files} files, {size_mb:.1f} MB")
+
+    baseline, expected = bench(legacy_scan, corpus, args.repeat)
+    print(f"  {'legacy':<10} {baseline * 1000:9.1f} ms  x1.00")
+    for name, strategy in [("combined", make_combined_scan()), ("engine", engine_scan)]:
+        elapsed, results = bench(strategy, corpus, args.repeat)
+        status = "" if results == expected else "  (MISMATCH)"
+        print(f"  {name:<10} {elapsed * 1000:9.1f} ms  x{baseline / elapsed:.2f}{status}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,350 @@
+"""tracing デコレータの呼び出しあたりのオーバーヘッドを計測するベンチマーク。
+
+``@trace_tool_execution`` を付けた関数を以下の構成で呼び出し、デコレータなしとの差を比較する。
+
+- ``baseline``    : デコレータなし
+- ``otel-absent`` : OTel SDK 未導入（デコレータは元の関数を返す）
+- ``sampled-out`` : ``sample_ratio=0`` で全呼び出しを記録しない
+- ``no-exporter`` : TracerProvider のみ（プロセッサなし）
+- ``batch``       : ``BoundedBatchSpanProcessor`` + 何もしないエクスポータ
+- ``console``     : ``BoundedBatchSpanProcessor`` + ``ConsoleSpanExporter``（出力先は devnull）
+- ``ring-buffer`` : ``RingBufferSpanExporter``
+
+計測項目は、単一スレッドの呼び出しあたりの所要時間、マルチスレッドと asyncio での
+スループット、呼び出しあたりの Python 関数呼び出し数とメモリ確保量（tracemalloc のピーク）。
+関数呼び出し数は全体（``py_calls``）と ``src/observability`` 内のもの（``own_py_calls``）を
+数える。全体の値は OTel SDK や CPython の版で変わるため、通常のテストでは後者で判定する。
+
+``--check`` は基準値ファイル（``tracing_overhead_baseline.json``）と比較し、許容幅を
+超えて悪化した項目があれば終了コード 1 を返す。関数呼び出し数とメモリ確保量は実行環境に
+依存しないため厳しめに、所要時間は空関数の呼び出しコストを単位とした相対値で緩めに判定する。
+基準値は ``--write-baseline`` で更新する。
+
+使い方:
+    python tests/benchmarks/bench_tracing_overhead.py
+    python tests/benchmarks/bench_tracing_overhead.py --calls 50000 --threads 8
+    python tests/benchmarks/bench_tracing_overhead.py --check
+    python tests/benchmarks/bench_tracing_overhead.py --write-baseline
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, NamedTuple
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "src"))
+
+from observability import tracing  # noqa: E402
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Iterator
+    from types import FrameType
+
+BASELINE_FILE = Path(__file__).with_name("tracing_overhead_baseline.json")
+
+CONFIGS = (
+    "baseline",
+    "otel-absent",
+    "sampled-out",
+    "no-exporter",
+    "batch",
+    "console",
+    "ring-buffer",
+)
+
+# 基準値に対する許容幅（比率）
+# 所要時間は計測ごとのばらつきが大きいため 2 倍までを許容する
+TOLERANCES = {"py_calls": 0.10, "own_py_calls": 0.0, "peak_bytes": 0.25, "overhead_units": 1.0}
+
+# 許容幅に加える絶対値。own_py_calls は実行環境に依存しないため、1 回の関数呼び出しの追加も検出する
+SLACK = {"own_py_calls": 0.5}
+
+# 計装モジュール自身のソースファイルの置き場所（own_py_calls の対象）
+OWN_SOURCE_DIR = str(Path(tracing.__file__).resolve().parent) + os.sep
+
+
+class Workload(NamedTuple):
+    """計測対象の関数（同期・非同期）と後始末。"""
+
+    sync: Callable[[int], int]
+    coro: Callable[[int], Awaitable[int]]
+    close: Callable[[], None]
+
+
+def _decorate() -> tuple[Callable[[int], int], Callable[[int], Awaitable[int]]]:
+    """デコレータを適用した計測対象を返す。"""
+
+    @tracing.trace_tool_execution("bench.tool")
+    def work(x: int) -> int:
+        return x + 1
+
+    @tracing.trace_tool_execution("bench.tool")
+    async def awork(x: int) -> int:
+        return x + 1
+
+    return work, awork
+
+
+def build(config: str) -> Workload:
+    """構成 ``config`` の計測対象を組み立てる。"""
+
+    def work(x: int) -> int:
+        return x + 1
+
+    async def awork(x: int) -> int:
+        return x + 1
+
+    if config == "baseline":
+        return Workload(work, awork, lambda: None)
+    if config == "otel-absent":
+        with mock.patch.object(tracing, "_HAS_OTEL", False):
+            return Workload(*_decorate(), lambda: None)
+    if not tracing._load_otel():
+        raise RuntimeError("OpenTelemetry SDK is not installed")
+
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import (
+        ConsoleSpanExporter,
+        SimpleSpanProcessor,
+        SpanExportResult,
+    )
+
+    class NullExporter:
+        """受け取ったスパンを捨てるエクスポータ。"""
+
+        def export(self, spans: object) -> SpanExportResult:
+            return SpanExportResult.SUCCESS
+
+        def shutdown(self) -> None:
+            pass
+
+    provider = TracerProvider()
+    if config == "sampled-out":
+        tracing.configure_sampling(sample_ratio=0.0)
+    elif config == "batch":
+        provider.add_span_processor(tracing.BoundedBatchSpanProcessor(NullExporter()))
+    elif config == "console":
+        devnull = open(os.devnull, "w")  # noqa: SIM115
+        provider.add_span_processor(
+            tracing.BoundedBatchSpanProcessor(ConsoleSpanExporter(out=devnull))
+        )
+    elif config == "ring-buffer":
+        provider.add_span_processor(SimpleSpanProcessor(tracing.RingBufferSpanExporter()))
+    elif config != "no-exporter":
+        raise ValueError(f"unknown config: {config}")
+
+    # デコレータは呼び出し時にトレーサーを取得するため、計測中はこの Provider のものに差し替える
+    # （メトリクスは各構成に含めないため、計測中は記録しない）
+    previous = tracing._tracer, tracing._instruments
+    tracing._tracer = provider.get_tracer(__name__)
+    tracing._instruments = None
+
+    def close() -> None:
+        tracing._tracer, tracing._instruments = previous
+        provider.shutdown()
+        if config == "console":
+            devnull.close()
+        tracing.configure_sampling()
+
+    return Workload(*_decorate(), close)
+
+
+@contextmanager
+def workload(config: str) -> Iterator[Workload]:
+    """計測対象を組み立て、終了時に後始末する。"""
+    target = build(config)
+    try:
+        yield target
+    finally:
+        target.close()
+
+
+# ---------------------------------------------------------------------------
+# 計測
+# ---------------------------------------------------------------------------
+
+
+def time_single(func: Callable[[int], int], calls: int, repeat: int) -> float:
+    """単一スレッドでの呼び出しあたりの最良所要時間（ナノ秒）。"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        for i in range(calls):
+            func(i)
+        best = min(best, (time.perf_counter_ns() - start) / calls)
+    return best
+
+
+def throughput_threads(func: Callable[[int], int], calls: int, threads: int) -> float:
+    """``threads`` スレッドで合計 ``calls`` 回呼び出したときのスループット（回/秒）。"""
+    per_thread = calls // threads
+    barrier = threading.Barrier(threads + 1)
+
+    def run() -> None:
+        barrier.wait()
+        for i in range(per_thread):
+            func(i)
+
+    workers = [threading.Thread(target=run) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for worker in workers:
+        worker.join()
+    return per_thread * threads / (time.perf_counter() - start)
+
+
+def throughput_asyncio(coro: Callable[[int], Awaitable[int]], calls: int) -> float:
+    """asyncio のタスクとして並行に ``calls`` 回呼び出したときのスループット（回/秒）。"""
+
+    async def main() -> float:
+        start = time.perf_counter()
+        for offset in range(0, calls, 1000):
+            await asyncio.gather(*(coro(i) for i in range(offset, min(calls, offset + 1000))))
+        return calls / (time.perf_counter() - start)
+
+    return asyncio.run(main())
+
+
+def count_work(func: Callable[[int], int], calls: int = 200) -> dict[str, float]:
+    """呼び出しあたりの Python 関数呼び出し数とメモリ確保量（ピーク、バイト）。
+
+    どちらも実行速度に左右されないため、回帰判定の主な指標とする。関数呼び出し数は
+    全体と、``OWN_SOURCE_DIR`` 内で定義された関数のもの（``own_py_calls``）を返す。
+    """
+    for i in range(10):
+        func(i)
+
+    counter = [0, 0]
+
+    def profile(frame: FrameType, event: str, arg: object) -> None:
+        if event == "call":
+            counter[0] += 1
+            if frame.f_code.co_filename.startswith(OWN_SOURCE_DIR):
+                counter[1] += 1
+
+    sys.setprofile(profile)
+    try:
+        for i in range(calls):
+            func(i)
+    finally:
+        sys.setprofile(None)
+
+    tracemalloc.start()
+    try:
+        peaks = []
+        for i in range(calls):
+            current, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            func(i)
+            peaks.append(tracemalloc.get_traced_memory()[1] - current)
+    finally:
+        tracemalloc.stop()
+    peaks.sort()
+    return {
+        "py_calls": counter[0] / calls,
+        "own_py_calls": counter[1] / calls,
+        "peak_bytes": float(peaks[len(peaks) // 2]),
+    }
+
+
+def measure(
+    config: str, calls: int, repeat: int, threads: int, empty_ns: float
+) -> dict[str, float]:
+    """構成 ``config`` の全項目を計測する。"""
+    with workload(config) as target:
+        per_call = time_single(target.sync, calls, repeat)
+        result = {
+            "ns_per_call": per_call,
+            "overhead_units": per_call / empty_ns,
+            "threads_per_sec": throughput_threads(target.sync, calls, threads),
+            "asyncio_per_sec": throughput_asyncio(target.coro, calls),
+        }
+        result.update(count_work(target.sync))
+    return result
+
+
+def check(results: dict[str, dict[str, float]], baseline: dict[str, dict[str, float]]) -> list[str]:
+    """基準値から許容幅を超えて悪化した項目を返す。"""
+    regressions = []
+    for config, expected in baseline.items():
+        measured = results.get(config)
+        if measured is None:
+            continue
+        for key, tolerance in TOLERANCES.items():
+            if key not in expected or key not in measured:
+                continue
+            limit = expected[key] * (1 + tolerance) + SLACK.get(key, 1.0)
+            if measured[key] > limit:
+                regressions.append(
+                    f"{config}.{key}: {measured[key]:.1f} > {limit:.1f} "
+                    f"(baseline {expected[key]:.1f})"
+                )
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    """ベンチマークを実行し、結果を表形式で出力する。"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--config", action="append", choices=CONFIGS, help="計測する構成")
+    parser.add_argument("--check", action="store_true", help="基準値と比較する")
+    parser.add_argument("--write-baseline", action="store_true", help="基準値を更新する")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE)
+    args = parser.parse_args(argv)
+
+    configs = args.config or [
+        c for c in CONFIGS if tracing._HAS_OTEL or c in ("baseline", "otel-absent")
+    ]
+
+    def empty(x: int) -> int:
+        return x
+
+    empty_ns = time_single(empty, args.calls, args.repeat)
+    print(f"empty call: {empty_ns:.0f} ns")
+    print(
+        f"  {'config':<12} {'ns/call':>9} {'overhead':>9} {'threads/s':>11} "
+        f"{'asyncio/s':>11} {'py calls':>9} {'own':>6} {'peak B':>8}"
+    )
+    results: dict[str, dict[str, float]] = {}
+    baseline_ns = None
+    for config in configs:
+        result = measure(config, args.calls, args.repeat, args.threads, empty_ns)
+        results[config] = result
+        if config == "baseline":
+            baseline_ns = result["ns_per_call"]
+        overhead = result["ns_per_call"] - (baseline_ns or 0.0)
+        print(
+            f"  {config:<12} {result['ns_per_call']:9.0f} {overhead:+9.0f} "
+            f"{result['threads_per_sec']:11.0f} {result['asyncio_per_sec']:11.0f} "
+            f"{result['py_calls']:9.1f} {result['own_py_calls']:6.1f} {result['peak_bytes']:8.0f}"
+        )
+
+    if args.write_baseline:
+        keys = TOLERANCES.keys()
+        snapshot = {c: {k: round(r[k], 2) for k in keys} for c, r in results.items()}
+        args.baseline.write_text(json.dumps(snapshot, indent=2, sort_keys=True) + "\n")
+        print(f"baseline written: {args.baseline}")
+    if args.check:
+        regressions = check(results, json.loads(args.baseline.read_text()))
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,131 @@
+"""エージェント定義の一括更新（project_config.agent_models）のテスト。"""
+
+from pathlib import Path
+
+import pytest
+
+from project_config import agent_models, loader
+
+CONFIG = """\
+ai_models:
+  default: "Model A"
+  overrides:
+    test_engineer: "Model B"
+"""
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Path:
+    """エージェントファイルを両方のディレクトリに持つリポジトリを作る。"""
+    loader.clear_cache()
+    (tmp_path / "project-config.yml").write_text(CONFIG)
+    github = tmp_path / ".github" / "agents"
+    reference = tmp_path / "agents"
+    github.mkdir(parents=True)
+    reference.mkdir()
+    (github / "implementer.agent.md").write_text(
+        "---\nname: implementer\nmodel: Old\n---\n\n本文\nmodel: 本文中の行\n"
+    )
+    (github / "test-engineer.agent.md").write_text("---\nname: test-engineer\n---\n\n本文\n")
+    (reference / "implementer.agent.md").write_text("---\nmodel: Old\n---\n\n# Implementer\n")
+    (reference / "test_engineer.agent.md").write_text("# Test Engineer\n")
+    return tmp_path
+
+
+def _read(path: Path) -> str:
+    return path.read_text(encoding="utf-8")
+
+
+class TestSetModel:
+    """frontmatter の書き換え。"""
+
+    def test_replace_insert_prepend(self) -> None:
+        """既存の model: を置き換え、なければ追加し、frontmatter がなければ先頭に加えること。"""
+        assert agent_models.set_model("---\nmodel: x\n---\nmodel: y\n", "M") == (
+            "---\nmodel: M\n---\nmodel: y\n"
+        )
+        assert agent_models.set_model("---\nname: a\n---\n", "M") == "---\nname: a\nmodel: M\n---\n"
+        assert agent_models.set_model("# A\n", "M") == "---\nmodel: M\n---\n\n# A\n"
+        assert agent_models.set_model("---\r\nname: a\r\n---\r\n", "M") == (
+            "---\r\nname: a\r\nmodel: M\r\n---\r\n"
+        )
+
+    def test_no_insert(self) -> None:
+        """insert=False では既存の model: のみを置き換え、frontmatter や行を追加しないこと。"""
+        assert agent_models.set_model("---\nmodel: x\n---\n", "M", insert=False) == (
+            "---\nmodel: M\n---\n"
+        )
+        assert agent_models.set_model("---\nname: a\n---\n", "M", insert=False) == (
+            "---\nname: a\n---\n"
+        )
+        assert agent_models.set_model("# A\nmodel: y\n", "M", insert=False) == "# A\nmodel: y\n"
+
+    def test_unclosed_frontmatter_rejected(self) -> None:
+        """閉じていない frontmatter は ValueError となること。"""
+        with pytest.raises(ValueError, match="not closed"):
+            agent_models.set_model("---\nname: a\n", "M")
+
+
+class TestMain:
+    """コマンドラインからの実行。"""
+
+    def test_updates_both_directories(self, repo: Path) -> None:
+        """両方のディレクトリを同じモデルに揃え、本文中の model: は変更しないこと。
+
+        参考資料の agents/ は既存の model: 行のみを揃え、frontmatter を追加しない。
+        """
+        assert agent_models.main(["--root", str(repo)]) == 0
+        github, reference = repo / ".github" / "agents", repo / "agents"
+        assert _read(github / "implementer.agent.md") == (
+            "---\nname: implementer\nmodel: Model A\n---\n\n本文\nmodel: 本文中の行\n"
+        )
+        assert "model: Model B\n---" in _read(github / "test-engineer.agent.md")
+        assert _read(reference / "implementer.agent.md").startswith("---\nmodel: Model A\n---\n")
+        assert _read(reference / "test_engineer.agent.md") == "# Test Engineer\n"
+        assert not list(repo.rglob("*.tmp"))
+
+    def test_writes_only_changed_files(self, repo: Path) -> None:
+        """2 回目の実行では内容の変わらないファイルを書き込まないこと。"""
+        agent_models.main(["--root", str(repo)])
+        inodes = {p: p.stat().st_ino for p in repo.rglob("*.agent.md")}
+        assert agent_models.main(["--root", str(repo), "--check"]) == 0
+
+        updates = agent_models.plan_updates(
+            agent_models.find_agent_files(repo), {"default": "Model A"}
+        )
+        written = agent_models.apply_updates(updates)
+        assert [u.key for u in written] == ["test_engineer", "test_engineer"]
+        unchanged = repo / ".github" / "agents" / "implementer.agent.md"
+        assert unchanged.stat().st_ino == inodes[unchanged]
+
+    def test_dry_run_shows_diff(self, repo: Path, capsys: pytest.CaptureFixture[str]) -> None:
+        """--dry-run は差分を表示し、ファイルを書き込まないこと。"""
+        before = {p: _read(p) for p in repo.rglob("*.agent.md")}
+        assert agent_models.main(["--root", str(repo), "--dry-run"]) == 0
+        out = capsys.readouterr().out
+        assert "-model: Old\n+model: Model A\n" in out
+        assert "+++ b/agents/implementer.agent.md" in out
+        assert "agents/test_engineer.agent.md" not in out
+        assert "3 / 4" in out
+        assert {p: _read(p) for p in repo.rglob("*.agent.md")} == before
+        assert agent_models.main(["--root", str(repo), "--check"]) == 1
+
+    def test_unsynced_agent_reported(self, repo: Path, capsys: pytest.CaptureFixture[str]) -> None:
+        """片方のディレクトリにしかないエージェントを警告し、--check は失敗すること。"""
+        (repo / ".github" / "agents" / "orchestrator.agent.md").write_text("# O\n")
+        agent_models.main(["--root", str(repo)])
+        assert "orchestrator" in capsys.readouterr().err
+        assert agent_models.main(["--root", str(repo), "--check"]) == 1
+
+    def test_repository_is_in_sync(self) -> None:
+        """このリポジトリのエージェントファイルが project-config.yml と一致していること。"""
+        loader.clear_cache()
+        assert agent_models.main(["--check"]) == 0
+
+    def test_missing_default_rejected(self, repo: Path, capsys: pytest.CaptureFixture[str]) -> None:
+        """ai_models.default がなければ何も書き込まずに失敗すること。"""
+        (repo / "project-config.yml").write_text("ai_models:\n  overrides:\n")
+        before = {p: _read(p) for p in repo.rglob("*.agent.md")}
+        assert agent_models.main(["--root", str(repo)]) == 1
+        assert "ai_models.default" in capsys.readouterr().err
+        assert {p: _read(p) for p in repo.rglob("*.agent.md")} == before
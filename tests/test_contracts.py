@@ -0,0 +1,225 @@
+"""契約レイヤー（sample.contracts）のテスト。
+
+検査モードごとに、契約のデコレータが検査する・間引く・元の関数をそのまま返すことを検証する。
+"""
+
+import os
+import subprocess
+import sys
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+import pytest
+
+from sample import contracts
+from sample.contracts import (
+    ContractConfig,
+    ContractViolationError,
+    configure_contracts,
+    invariant,
+    postcondition,
+    precondition,
+)
+
+SRC = str(Path(__file__).resolve().parents[1] / "src")
+
+
+@pytest.fixture(autouse=True)
+def restore_config() -> Iterator[None]:
+    """テストごとに契約の設定を元に戻す。"""
+    saved = contracts.get_contract_config()
+    yield
+    contracts._config = saved
+
+
+def _positive(x: float) -> float:
+    return x
+
+
+def _decorate(boundary: bool = False) -> tuple[Callable[[float], float], list[float]]:
+    """検査の呼び出しを記録する契約付きの関数を返す。"""
+    checked: list[float] = []
+
+    def check(x: float) -> bool:
+        checked.append(x)
+        return x > 0.0
+
+    return precondition(check, lambda x: f"x must be > 0.0, got {x}", boundary=boundary)(
+        _positive
+    ), checked
+
+
+class TestModes:
+    """検査モードごとの振る舞い。"""
+
+    def test_full_checks_every_call(self) -> None:
+        """full モードではすべての呼び出しを検査すること。"""
+        configure_contracts("full")
+        func, checked = _decorate()
+        assert [func(x) for x in (1.0, 2.0, 3.0)] == [1.0, 2.0, 3.0]
+        assert checked == [1.0, 2.0, 3.0]
+        with pytest.raises(ContractViolationError, match="x must be > 0.0, got -1.0"):
+            func(-1.0)
+
+    def test_sampled_checks_one_in_n(self) -> None:
+        """sampled モードでは N 回に 1 回だけ検査し、境界の契約は毎回検査すること。"""
+        configure_contracts("sampled", sample_every=3)
+        func, checked = _decorate()
+        for x in range(1, 8):
+            func(float(x))
+        assert checked == [1.0, 4.0, 7.0]
+
+        boundary, boundary_checked = _decorate(boundary=True)
+        for x in range(1, 4):
+            boundary(float(x))
+        assert boundary_checked == [1.0, 2.0, 3.0]
+
+    def test_boundary_checks_only_boundary(self) -> None:
+        """boundary モードでは境界の契約のみ検査し、それ以外は元の関数を返すこと。"""
+        configure_contracts("boundary")
+        func, _ = _decorate()
+        assert func is _positive
+        boundary, _ = _decorate(boundary=True)
+        assert boundary is not _positive
+        with pytest.raises(ContractViolationError):
+            boundary(0.0)
+
+    def test_off_returns_bare_function(self) -> None:
+        """off モードではデコレータが元の関数・クラスをそのまま返すこと。"""
+        configure_contracts("off")
+        assert _decorate()[0] is _positive
+        assert _decorate(boundary=True)[0] is _positive
+        assert postcondition(lambda r: False, "never")(_positive) is _positive
+
+        @dataclass
+        @invariant(lambda self: False, "never")
+        class Entity:
+            value: float
+
+        assert not hasattr(Entity, "__post_init__")
+        assert Entity(-1.0).value == -1.0
+        assert not contracts.boundary_checks_enabled()
+
+    def test_reconfigure_applies_only_to_later_decorations(self) -> None:
+        """モードの変更はデコレート済みの契約には反映されず、関数内の検査には反映されること。
+
+        起動後の ``configure_contracts()`` が一部にのみ反映されるという既知の制約を固定する。
+        """
+        configure_contracts("full")
+        func, _ = _decorate()
+        configure_contracts("off")
+        assert not contracts.boundary_checks_enabled()
+        with pytest.raises(ContractViolationError):
+            func(-1.0)
+        assert _decorate()[0] is _positive
+
+    def test_invalid_config_rejected(self) -> None:
+        """不正なモード・間隔は ValueError となること。"""
+        with pytest.raises(ValueError, match="contract mode"):
+            configure_contracts("sometimes")
+        with pytest.raises(ValueError, match="sample_every"):
+            ContractConfig("sampled", 0)
+
+
+class TestDecorators:
+    """デコレータの検査内容。"""
+
+    def test_violation_is_assertion_error(self) -> None:
+        """違反は AssertionError として捕捉できること。"""
+        assert issubclass(ContractViolationError, AssertionError)
+
+    def test_message_built_only_on_violation(self) -> None:
+        """呼び出し可能なメッセージは違反時にのみ評価されること。"""
+        configure_contracts("full")
+        built: list[float] = []
+
+        def message(result: float) -> str:
+            built.append(result)
+            return f"result={result}"
+
+        func = postcondition(lambda r: r >= 0.0, message)(_positive)
+        func(1.0)
+        assert built == []
+        with pytest.raises(ContractViolationError, match="result=-2.0"):
+            func(-2.0)
+        assert built == [-2.0]
+
+    def test_invariants_checked_in_order(self) -> None:
+        """不変条件は上に書いたものから順に検査し、既存の __post_init__ も呼び出すこと。"""
+        configure_contracts("full")
+        calls: list[str] = []
+
+        @dataclass
+        @invariant(lambda self: calls.append("first") or self.value >= 0.0, "first")
+        @invariant(lambda self: calls.append("second") or self.value < 10.0, "second")
+        class Entity:
+            value: float
+
+            def __post_init__(self) -> None:
+                calls.append("own")
+
+        Entity(1.0)
+        assert calls == ["first", "second", "own"]
+        with pytest.raises(ContractViolationError, match="first"):
+            Entity(-1.0)
+        with pytest.raises(ContractViolationError, match="second"):
+            Entity(10.0)
+
+
+class TestStartupMode:
+    """起動時のモード選択（サブプロセスで import から確認する）。"""
+
+    @staticmethod
+    def _run(code: str, *flags: str, **env: str) -> str:
+        result = subprocess.run(
+            [sys.executable, *flags, "-c", code],
+            env={**os.environ, "PYTHONPATH": SRC, **env},
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        return result.stdout.strip()
+
+    CODE = (
+        "from sample.example_module import ExampleEntity, process\n"
+        "e = ExampleEntity(name='', value=-1.0)\n"
+        "print(hasattr(process, '__wrapped__'), process(e, 2.0))\n"
+    )
+
+    def test_env_off(self) -> None:
+        """CONTRACT_MODE=off では契約付きの関数が元の関数のまま import されること。"""
+        assert self._run(self.CODE, CONTRACT_MODE="off") == "False -2.0"
+
+    def test_optimized_defaults_to_off(self) -> None:
+        """python -O で起動した場合の既定は off であること。"""
+        assert self._run(self.CODE, "-O", CONTRACT_MODE="") == "False -2.0"
+
+    def test_env_boundary_keeps_batch_checks(self) -> None:
+        """CONTRACT_MODE=boundary ではバッチの入口の契約のみ検査すること。"""
+        code = (
+            "from sample.example_module import ExampleEntity, process_batch\n"
+            "ExampleEntity(name='', value=-1.0)\n"
+            "try:\n"
+            "    process_batch([1.0, -1.0], 2.0)\n"
+            "except AssertionError as exc:\n"
+            "    print(exc)\n"
+        )
+        output = self._run(code, CONTRACT_MODE="boundary")
+        assert output == "value must be >= 0.0, got -1.0 at index 1"
+
+    def test_env_boundary_checks_batch_from_entities(self) -> None:
+        """boundary モードでは未検査のエンティティをバッチに取り込む時点で検査すること。"""
+        code = (
+            "from sample.example_module import ExampleEntity as E, ExampleEntityBatch\n"
+            "for entities in ([E('', -5.0)], [E('a', 1.0), E('', 1.0)]):\n"
+            "    try:\n"
+            "        ExampleEntityBatch.from_entities(entities)\n"
+            "    except AssertionError as exc:\n"
+            "        print(exc)\n"
+        )
+        output = self._run(code, CONTRACT_MODE="boundary")
+        assert output.splitlines() == [
+            "value must be >= 0.0, got -5.0 at index 0",
+            "name must not be empty at index 1",
+        ]
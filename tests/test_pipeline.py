@@ -0,0 +1,155 @@
+"""ストリーミングパイプライン（sample.pipeline）のテスト。
+
+要素ごとの ``process`` と同じ結果になること、順序を保って並列化できること、
+入力から先読みするチャンク数に上限があることを検証する。
+"""
+
+import csv
+import json
+import tracemalloc
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from sample.example_module import ExampleEntity, process
+from sample.pipeline import Chunk, process_chunks, read_chunks, run_pipeline
+
+
+def _write_csv(path: Path, count: int) -> list[tuple[str, float]]:
+    """``count`` 件のレコードを CSV に書き出し、その内容を返す。"""
+    records = [(f"entity-{i % 7}", i * 0.5) for i in range(count)]
+    with path.open("w", newline="") as stream:
+        writer = csv.writer(stream)
+        writer.writerow(("id", "name", "value"))
+        writer.writerows((i, name, value) for i, (name, value) in enumerate(records))
+    return records
+
+
+def _expected(records: list[tuple[str, float]], multiplier: float) -> list[list[str]]:
+    return [
+        [name, str(process(ExampleEntity(name=name, value=value), multiplier))]
+        for name, value in records
+    ]
+
+
+class TestReadChunks:
+    """入力の読み込みとチャンク単位の検証。"""
+
+    def test_chunks_cover_input(self, tmp_path: Path) -> None:
+        """チャンクは入力を先頭から順に chunk_size 件ずつ分割すること。"""
+        records = _write_csv(tmp_path / "in.csv", 10)
+        chunks = list(read_chunks(tmp_path / "in.csv", chunk_size=4))
+        assert [(c.start, len(c.batch)) for c in chunks] == [(0, 4), (4, 4), (8, 2)]
+        assert [c.batch[i].name for c in chunks for i in range(len(c.batch))] == [
+            name for name, _ in records
+        ]
+
+    def test_jsonl_input(self, tmp_path: Path) -> None:
+        """JSONL の入力を読み込めること（空行は読み飛ばす）。"""
+        source = tmp_path / "in.jsonl"
+        source.write_text('{"name": "a", "value": 1.5}\n\n{"name": "b", "value": 2}\n')
+        (chunk,) = read_chunks(source)
+        assert [chunk.batch[0], chunk.batch[1]] == [
+            ExampleEntity(name="a", value=1.5),
+            ExampleEntity(name="b", value=2.0),
+        ]
+
+    def test_blank_lines_skipped(self, tmp_path: Path) -> None:
+        """CSV・JSONL の空行は読み飛ばすこと。"""
+        csv_source = tmp_path / "in.csv"
+        csv_source.write_text("name,value\na,1\n\nb,2\n\n")
+        jsonl_source = tmp_path / "in.jsonl"
+        jsonl_source.write_text('{"name": "a", "value": 1}\n\n{"name": "b", "value": 2}\n')
+        for source in (csv_source, jsonl_source):
+            (chunk,) = read_chunks(source)
+            assert list(chunk.batch.names) == ["a", "b"]
+            assert list(chunk.batch.values) == [1.0, 2.0]
+
+    def test_violation_reports_record(self, tmp_path: Path) -> None:
+        """不変条件の違反はチャンク内の位置とチャンク先頭のレコード番号を報告すること。"""
+        source = tmp_path / "in.csv"
+        source.write_text("name,value\na,1\nb,2\nc,-3\n")
+        chunks = read_chunks(source, chunk_size=2)
+        assert next(chunks).start == 0
+        with pytest.raises(
+            AssertionError,
+            match=r"value must be >= 0.0, got -3.0 at index 0 \(chunk starting at record 2\)",
+        ):
+            next(chunks)
+
+    def test_invalid_input_rejected(self, tmp_path: Path) -> None:
+        """解釈できないレコード・ヘッダは ValueError となること。"""
+        source = tmp_path / "in.csv"
+        source.write_text("name,value\na,x\n")
+        with pytest.raises(ValueError, match="invalid record in chunk starting at record 0"):
+            list(read_chunks(source))
+        source.write_text("name,value\na,1\nb\n")
+        with pytest.raises(ValueError, match="record 0: CSV line 3 has 1 fields"):
+            list(read_chunks(source))
+        source.write_text("name,amount\na,1\n")
+        with pytest.raises(ValueError, match="'name' and 'value'"):
+            list(read_chunks(source))
+        with pytest.raises(ValueError, match="chunk_size"):
+            list(read_chunks(source, chunk_size=0))
+
+
+class TestPipeline:
+    """読み込みから書き出しまでの実行。"""
+
+    @pytest.mark.parametrize("workers", [0, 2])
+    def test_matches_process(self, tmp_path: Path, workers: int) -> None:
+        """結果は要素ごとの process と一致し、入力の順序で書き出されること。"""
+        records = _write_csv(tmp_path / "in.csv", 1000)
+        count = run_pipeline(
+            tmp_path / "in.csv", tmp_path / "out.csv", 3.0, chunk_size=64, workers=workers
+        )
+        assert count == 1000
+        with (tmp_path / "out.csv").open(newline="") as stream:
+            rows = list(csv.reader(stream))
+        assert rows[0] == ["name", "result"]
+        assert rows[1:] == _expected(records, 3.0)
+
+    def test_jsonl_output(self, tmp_path: Path) -> None:
+        """出力先が .jsonl なら JSONL で書き出すこと。"""
+        records = _write_csv(tmp_path / "in.csv", 5)
+        run_pipeline(tmp_path / "in.csv", tmp_path / "out.jsonl", 2.0)
+        lines = (tmp_path / "out.jsonl").read_text().splitlines()
+        assert [json.loads(line) for line in lines] == [
+            {"name": name, "result": value * 2.0} for name, value in records
+        ]
+
+    def test_bounded_in_flight(self, tmp_path: Path) -> None:
+        """入力から先読みするチャンク数は max_in_flight で制限されること。"""
+        _write_csv(tmp_path / "in.csv", 200)
+        pulled = 0
+
+        def counted() -> Iterator[Chunk]:
+            nonlocal pulled
+            for chunk in read_chunks(tmp_path / "in.csv", chunk_size=10):
+                pulled += 1
+                yield chunk
+
+        results = process_chunks(counted(), 1.0, workers=2, max_in_flight=3)
+        starts = []
+        for chunk, values in results:
+            # 結果を受け取った時点で、処理中のチャンクは上限 + 次に投入する 1 個まで
+            assert pulled - len(starts) <= 3 + 1
+            starts.append(chunk.start)
+            assert len(values) == len(chunk.batch)
+        assert starts == list(range(0, 200, 10))
+
+    def test_memory_independent_of_input_size(self, tmp_path: Path) -> None:
+        """メモリ使用量のピークは入力の件数に比例しないこと。"""
+
+        def peak(count: int) -> int:
+            _write_csv(tmp_path / "in.csv", count)
+            tracemalloc.start()
+            try:
+                run_pipeline(tmp_path / "in.csv", tmp_path / "out.csv", 2.0, chunk_size=500)
+                return tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+
+        small, large = peak(5_000), peak(50_000)
+        assert large < small * 2
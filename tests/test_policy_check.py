@@ -0,0 +1,634 @@
+"""ci/policy_check.py のテスト。
+
+実リポジトリではなく ``tmp_path`` 上のダミーリポジトリをスキャン対象とし、
+``REPO_ROOT`` / ``SCAN_DIRS`` 等のモジュール定数を差し替えて検証する。
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "ci"))
+
+import policy_check  # noqa: E402
+
+# ダミーの秘密情報（SECRET_PATTERNS の AWS Access Key ID 形式に一致する）
+FAKE_AWS_KEY = "AKIA" + "ABCDEFGHIJKLMNOP"
+
+# 許可リスト外の URL（このファイル自体が URL 検出に掛からないよう実行時に組み立てる）
+FAKE_URL = "https" + "://evil.invalid"
+
+
+@pytest.fixture
+def fake_repo(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """スキャン対象のダミーリポジトリを作成し、モジュール定数を差し替える。"""
+    src = tmp_path / "src"
+    src.mkdir()
+    (src / "clean.py").write_text("x = 1\n", encoding="utf-8")
+    (src / "leak.py").write_text(f'KEY = "{FAKE_AWS_KEY}"\n', encoding="utf-8")
+    monkeypatch.setattr(policy_check, "REPO_ROOT", tmp_path)
+    monkeypatch.setattr(policy_check, "SCAN_DIRS", [src])
+    monkeypatch.setattr(policy_check, "CACHE_FILE", tmp_path / ".policy_check_cache.json")
+    return tmp_path
+
+
+# ---------------------------------------------------------------------------
+# 結果キャッシュ
+# ---------------------------------------------------------------------------
+
+
+class TestScanCache:
+    """``ScanCache`` によるスキャン省略のテスト。"""
+
+    def test_cached_run_matches_uncached(
+        self, fake_repo: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """キャッシュ有無で出力と終了コードが一致すること。"""
+        assert policy_check.main(["--no-cache"]) == 1
+        uncached = capsys.readouterr().out
+        assert policy_check.main([]) == 1
+        first = capsys.readouterr().out
+        assert policy_check.main([]) == 1
+        second = capsys.readouterr().out
+        assert uncached == first == second
+
+    def test_unchanged_file_is_not_rescanned(
+        self, fake_repo: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """内容が変わらないファイルは scan_text が呼ばれないこと。"""
+        policy_check.main([])
+        calls: list[Path] = []
+        original = policy_check.scan_text
+
+        def spy(path: Path, text: str) -> list[policy_check.Issue]:
+            calls.append(path)
+            return original(path, text)
+
+        monkeypatch.setattr(policy_check, "scan_text", spy)
+        policy_check.main([])
+        assert calls == []
+
+        (fake_repo / "src" / "clean.py").write_text("x = 2\n", encoding="utf-8")
+        policy_check.main([])
+        assert calls == [fake_repo / "src" / "clean.py"]
+
+    def test_pattern_change_invalidates_cache(
+        self, fake_repo: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """パターン定数を変更するとキャッシュが無効化されること。"""
+        assert policy_check.main([]) == 1
+        monkeypatch.setattr(policy_check, "SECRET_PATTERNS", [])
+        assert policy_check.main([]) == 0
+
+    def test_stale_entries_are_evicted(self, fake_repo: Path) -> None:
+        """削除されたファイルのエントリは保存時に破棄されること。"""
+        policy_check.main([])
+        (fake_repo / "src" / "leak.py").unlink()
+        policy_check.main([])
+        assert "src/leak.py" not in policy_check.CACHE_FILE.read_text(encoding="utf-8")
+
+
+# ---------------------------------------------------------------------------
+# 並列スキャン
+# ---------------------------------------------------------------------------
+
+
+class TestParallelScan:
+    """``--jobs`` による並列スキャンのテスト。"""
+
+    @pytest.fixture
+    def many_files(self, fake_repo: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+        """違反を含むファイルを多数配置し、並列化の下限件数を下げる。"""
+        for i in range(40):
+            body = f'KEY = "{FAKE_AWS_KEY}"\n' if i % 7 == 0 else f"x = {i}\n"
+            (fake_repo / "src" / f"mod_{i:02d}.py").write_text(body, encoding="utf-8")
+        monkeypatch.setattr(policy_check, "PARALLEL_MIN_FILES", 1)
+        return fake_repo
+
+    @pytest.mark.parametrize("cache_args", [["--no-cache"], []])
+    def test_output_identical_to_serial(
+        self,
+        many_files: Path,
+        capsys: pytest.CaptureFixture[str],
+        cache_args: list[str],
+    ) -> None:
+        """並列実行の出力が逐次実行と完全に一致すること。"""
+        assert policy_check.main([*cache_args, "--jobs", "1"]) == 1
+        serial = capsys.readouterr().out
+        assert policy_check.main([*cache_args, "--jobs", "4"]) == 1
+        parallel = capsys.readouterr().out
+        assert parallel == serial
+
+    def test_negative_jobs_rejected(self) -> None:
+        """負の --jobs は引数エラーとなること。"""
+        with pytest.raises(SystemExit):
+            policy_check.parse_args(["--jobs", "-1"])
+
+
+# ---------------------------------------------------------------------------
+# パターンエンジン
+# ---------------------------------------------------------------------------
+
+
+class TestPatternEngine:
+    """``PatternEngine`` と旧実装（行単位・パターン単位の検索）の等価性テスト。"""
+
+    @pytest.mark.parametrize(
+        ("pattern", "expected"),
+        [
+            (r"AKIA[0-9A-Z]{16}", "AKIA"),
+            (r"-----BEGIN\s+(RSA|DSA)\s+PRIVATE", "-----BEGIN"),
+            (r"foo\.bar?", "foo.ba"),
+            (r"ab+c", "ab"),
+            (r"^\s*import\s+requests", ""),
+            (r"a|b", ""),
+            (r"a[(]b|c", ""),
+        ],
+    )
+    def test_literal_prefix(self, pattern: str, expected: str) -> None:
+        """リテラル接頭辞はマッチに必ず含まれる部分だけを返すこと。"""
+        assert policy_check.literal_prefix(pattern) == expected
+
+    @pytest.mark.parametrize("newline", ["\n", "\r\n", "\r"])
+    def test_url_lines_follow_splitlines(self, newline: str) -> None:
+        """URL 検出の行番号・除外条件が splitlines() 基準の旧実装と一致すること。"""
+        lines = [
+            "x = 1",
+            f'a = "{FAKE_URL}/x"; b = "{FAKE_URL}/y"',
+            f"# {FAKE_URL}/comment",
+            'c = "https://github.com/org/repo"',
+            "",
+            f'd = "{FAKE_URL}"',
+        ]
+        text = newline.join(lines)
+        engine = policy_check.get_engine()
+        assert list(engine.url_violation_lines(text, ".py")) == [(2, 6), (6, 6)]
+
+    def test_scan_text_reports_in_rule_order(self, fake_repo: Path) -> None:
+        """検出結果が import → URL → 秘密情報 → 禁止パターンの順で並ぶこと。"""
+        path = fake_repo / "src" / "mixed.py"
+        text = f'import requests\nu = "{FAKE_URL}"\nk = "{FAKE_AWS_KEY}"\n'
+        overrides = {
+            "FORBIDDEN_IMPORT_PATTERNS": [r"^\s*import\s+requests"],
+            "FORBIDDEN_PATTERNS": [r"evil"],
+        }
+        with pytest.MonkeyPatch.context() as mp:
+            for name, value in overrides.items():
+                mp.setattr(policy_check, name, value)
+            issues = policy_check.scan_text(path, text)
+        assert [issue.message.split(":")[0] for issue in issues] == [
+            "禁止操作疑い",
+            "外部接続疑い",
+            "秘密情報疑い",
+            "禁止パターン検出",
+        ]
+        assert issues[1].message.endswith("src/mixed.py:2")
+        assert [issue.rule for issue in issues] == [
+            "forbidden-import",
+            "url-literal",
+            "secret",
+            "forbidden-pattern",
+        ]
+        assert [(issue.line, issue.column) for issue in issues] == [(1, 1), (2, 6), (3, 6), (2, 14)]
+
+
+# ---------------------------------------------------------------------------
+# 構造化出力
+# ---------------------------------------------------------------------------
+
+
+class TestStructuredOutput:
+    """``--format`` / ``--max-issues`` のテスト。"""
+
+    @pytest.fixture
+    def leaky_repo(self, fake_repo: Path) -> Path:
+        """違反を含むファイルを複数配置する。"""
+        for i in range(5):
+            (fake_repo / "src" / f"leak_{i}.py").write_text(
+                f'x = 1\nKEY = "{FAKE_AWS_KEY}"\n', encoding="utf-8"
+            )
+        return fake_repo
+
+    def test_jsonl_records(self, leaky_repo: Path, capsys: pytest.CaptureFixture[str]) -> None:
+        """JSON Lines は 1 行 1 件で、ルール ID と位置を含むこと。"""
+        assert policy_check.main(["--no-cache", "--format", "jsonl"]) == 1
+        records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        assert len(records) == 6
+        assert records[0] == {
+            "rule": "secret",
+            "path": "src/leak.py",
+            "message": records[0]["message"],
+            "line": 1,
+            "column": 8,
+            "pattern": next(p for p in policy_check.SECRET_PATTERNS if p.startswith("AKIA")),
+        }
+        assert {record["line"] for record in records[1:]} == {2}
+
+    def test_sarif_document(self, leaky_repo: Path, tmp_path: Path) -> None:
+        """SARIF 出力が妥当な JSON で、ルール定義と結果を含むこと。"""
+        out = tmp_path / "policy.sarif"
+        assert policy_check.main(["--no-cache", "--format", "sarif", "-o", str(out)]) == 1
+        run = json.loads(out.read_text(encoding="utf-8"))["runs"][0]
+        assert {rule["id"] for rule in run["tool"]["driver"]["rules"]} == set(policy_check.RULES)
+        assert len(run["results"]) == 6
+        location = run["results"][1]["locations"][0]["physicalLocation"]
+        assert location["artifactLocation"]["uri"] == "src/leak_0.py"
+        assert location["region"] == {"startLine": 2, "startColumn": 8}
+
+    def test_sarif_without_issues(
+        self, fake_repo: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """違反がなくても SARIF 出力は空の results を持つ妥当な JSON であること。"""
+        (fake_repo / "src" / "leak.py").unlink()
+        assert policy_check.main(["--no-cache", "--format", "sarif"]) == 0
+        assert json.loads(capsys.readouterr().out)["runs"][0]["results"] == []
+
+    def test_max_issues_stops_early(
+        self,
+        leaky_repo: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        """上限件数に達したら以降のファイルをスキャンせずに失敗すること。"""
+        calls: list[Path] = []
+        original = policy_check.scan_text
+
+        def spy(path: Path, text: str) -> list[policy_check.Issue]:
+            calls.append(path)
+            return original(path, text)
+
+        monkeypatch.setattr(policy_check, "scan_text", spy)
+        assert policy_check.main(["--no-cache", "--max-issues", "2"]) == 1
+        captured = capsys.readouterr()
+        assert captured.out.count(FAKE_AWS_KEY[:4]) == 2
+        assert "打ち切りました" in captured.err
+        assert len(calls) == 3
+
+    def test_max_issues_must_be_positive(self) -> None:
+        """0 以下の --max-issues は引数エラーとなること。"""
+        with pytest.raises(SystemExit):
+            policy_check.parse_args(["--max-issues", "0"])
+
+
+# ---------------------------------------------------------------------------
+# プロファイル
+# ---------------------------------------------------------------------------
+
+
+class TestProfile:
+    """``--profile`` / ``--profile-json`` のテスト。"""
+
+    def test_backtracking_pattern_ranks_first(
+        self, fake_repo: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """破滅的バックトラックを起こすパターンが最も高コストとして報告されること。"""
+        slow = r"(a+)+b"
+        monkeypatch.setattr(policy_check, "FORBIDDEN_PATTERNS", [slow])
+        (fake_repo / "src" / "slow.py").write_text("a" * 20 + "\n", encoding="utf-8")
+        out = fake_repo / "profile.json"
+        assert policy_check.main(["--no-cache", "--profile", "--profile-json", str(out)]) == 1
+
+        report = json.loads(out.read_text(encoding="utf-8"))
+        assert report["patterns"][0]["pattern"] == slow
+        assert report["slowest_files"][0]["path"] == "src/slow.py"
+        assert {"enumerate", "read", "match", "total"} <= set(report["phases_ms"])
+        assert "高コストなパターン" in capsys.readouterr().err
+
+    def test_pattern_timings_add_up_within_match_phase(
+        self, fake_repo: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """パターン別の計測値と url_allowlist の合計が match フェーズに収まること。"""
+        monkeypatch.setattr(policy_check, "FORBIDDEN_IMPORT_PATTERNS", [r"(a+)+b"])
+        monkeypatch.setattr(policy_check, "URL_ALLOWLIST_PATTERNS", [r"(x+x+)+y"])
+        lines = ["a" * 20, *(f'u = "{FAKE_URL}" + "{"x" * 18}"' for _ in range(20))]
+        (fake_repo / "src" / "slow.py").write_text("\n".join(lines) + "\n", encoding="utf-8")
+        out = fake_repo / "profile.json"
+        policy_check.main(["--no-cache", "--profile-top", "50", "--profile-json", str(out)])
+
+        report = json.loads(out.read_text(encoding="utf-8"))
+        phases = report["phases_ms"]
+        patterns = {(p["rule"], p["pattern"]): p["ms"] for p in report["patterns"]}
+        # 禁止 import の照合時間も match フェーズに含まれること
+        assert patterns[(policy_check.RULE_IMPORT, r"(a+)+b")] <= phases["match"]
+        # URL パターンの計測値に url_allowlist の時間が二重計上されないこと
+        assert patterns[(policy_check.RULE_URL, policy_check.URL_PATTERN)] < phases["url_allowlist"]
+        total = sum(patterns.values()) + phases["url_allowlist"]
+        assert total <= phases["match"]
+
+    def test_parallel_profile_merges_worker_timings(
+        self, fake_repo: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """並列スキャンでもワーカーの計測値が親プロセスに合算されること。"""
+        for i in range(8):
+            (fake_repo / "src" / f"mod_{i}.py").write_text(f"x = {i}\n", encoding="utf-8")
+        monkeypatch.setattr(policy_check, "PARALLEL_MIN_FILES", 1)
+        out = fake_repo / "profile.json"
+        policy_check.main(["--no-cache", "--jobs", "2", "--profile-json", str(out)])
+
+        report = json.loads(out.read_text(encoding="utf-8"))
+        assert report["files_scanned"] == 10
+        secret_calls = [p["calls"] for p in report["patterns"] if p["rule"] == "secret"]
+        assert secret_calls and all(calls == 10 for calls in secret_calls)
+
+    def test_profiling_is_off_by_default(self, fake_repo: Path) -> None:
+        """プロファイル指定がなければ計測を行わないこと。"""
+        policy_check.main(["--no-cache"])
+        assert policy_check._profile is None
+
+
+# ---------------------------------------------------------------------------
+# 監視モード
+# ---------------------------------------------------------------------------
+
+
+class TestWatchMode:
+    """``PolicyWatcher`` と ``--status`` のテスト。"""
+
+    @pytest.fixture
+    def watcher(self, fake_repo: Path) -> policy_check.PolicyWatcher:
+        """ダミーリポジトリを監視するウォッチャー（ポーリングはテストから行う）。"""
+        cache = policy_check.ScanCache(policy_check.CACHE_FILE, policy_check.pattern_fingerprint())
+        return policy_check.PolicyWatcher(cache, fake_repo / "status.json", persist_cache=False)
+
+    def test_poll_rescans_only_changed_files(
+        self, watcher: policy_check.PolicyWatcher, fake_repo: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """2 回目以降のポーリングでは変更されたファイルだけを再スキャンすること。"""
+        assert watcher.poll() is True
+        assert [issue.path for issue in watcher.issues or []] == ["src/leak.py"]
+
+        calls: list[Path] = []
+        original = policy_check.scan_text
+
+        def spy(path: Path, text: str) -> list[policy_check.Issue]:
+            calls.append(path)
+            return original(path, text)
+
+        monkeypatch.setattr(policy_check, "scan_text", spy)
+        assert watcher.poll() is False
+        assert calls == []
+
+        (fake_repo / "src" / "leak.py").write_text("x = 0\n", encoding="utf-8")
+        assert watcher.poll() is True
+        assert calls == [fake_repo / "src" / "leak.py"]
+        assert watcher.issues == []
+
+    def test_status_reports_current_verdict(
+        self,
+        watcher: policy_check.PolicyWatcher,
+        fake_repo: Path,
+        capsys: pytest.CaptureFixture[str],
+    ) -> None:
+        """--status は状態ファイルの判定をスキャンせずに返すこと。"""
+        status = ["--status", "--status-file", str(watcher.status_file)]
+        watcher.poll()
+        capsys.readouterr()
+        assert policy_check.main(status) == 1
+        assert "src/leak.py" in capsys.readouterr().out
+
+        (fake_repo / "src" / "leak.py").unlink()
+        watcher.poll()
+        assert policy_check.main([*status, "--format", "jsonl"]) == 0
+        assert capsys.readouterr().out == ""
+
+    def test_status_without_live_watcher(
+        self,
+        watcher: policy_check.PolicyWatcher,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """状態ファイルがない・古い・パターンが変わった場合は終了コード 2 を返すこと。"""
+        status = ["--status", "--status-file", str(watcher.status_file)]
+        assert policy_check.main(status) == 2
+
+        watcher.poll()
+        old = time.time() - 3600
+        os.utime(watcher.status_file, (old, old))
+        assert policy_check.main(status) == 2
+
+        watcher.poll()
+        assert policy_check.main(status) == 1
+        monkeypatch.setattr(policy_check, "SECRET_PATTERNS", [])
+        assert policy_check.main(status) == 2
+
+    def test_watch_rejects_diff_mode(self) -> None:
+        """--watch と差分モードは併用できないこと。"""
+        with pytest.raises(SystemExit):
+            policy_check.parse_args(["--watch", "--staged"])
+
+
+# ---------------------------------------------------------------------------
+# 大きなファイル・バイナリファイル
+# ---------------------------------------------------------------------------
+
+
+class TestLargeAndBinaryFiles:
+    """メモリマップ経路とバイナリ判定のテスト。"""
+
+    @pytest.mark.parametrize("newline", ["\n", "\r\n", "\u2028"])
+    def test_mmap_path_matches_text_path(
+        self, fake_repo: Path, monkeypatch: pytest.MonkeyPatch, newline: str
+    ) -> None:
+        """メモリマップ経路の検出結果がテキスト経路と一致すること。"""
+        path = fake_repo / "src" / "big.py"
+        lines = ["# 日本語のコメント", f'u = "{FAKE_URL}"', "x = 1", f'k = "{FAKE_AWS_KEY}"']
+        path.write_text(newline.join(lines * 50), encoding="utf-8")
+
+        text_issues = policy_check.scan_file(path)
+        monkeypatch.setattr(policy_check, "MMAP_THRESHOLD_BYTES", 1)
+        mmap_issues = policy_check.scan_file(path)
+        assert mmap_issues == text_issues
+        assert len(mmap_issues) == 51
+
+    @pytest.mark.parametrize("threshold", [1, 1 << 30])
+    def test_binary_file_is_skipped(
+        self, fake_repo: Path, monkeypatch: pytest.MonkeyPatch, threshold: int
+    ) -> None:
+        """先頭に NUL を含むファイルは秘密情報を含んでいても検出しないこと。"""
+        path = fake_repo / "src" / "blob.txt"
+        path.write_bytes(b"\0\x01\x02" + FAKE_AWS_KEY.encode())
+        monkeypatch.setattr(policy_check, "MMAP_THRESHOLD_BYTES", threshold)
+        assert policy_check.scan_file(path) == []
+
+
+# ---------------------------------------------------------------------------
+# 差分スキャン
+# ---------------------------------------------------------------------------
+
+
+def git(repo: Path, *args: str) -> None:
+    """テスト用リポジトリで git を実行する。"""
+    subprocess.run(
+        ["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+        cwd=repo,
+        check=True,
+        capture_output=True,
+    )
+
+
+class TestDiffMode:
+    """``--since`` / ``--staged`` による差分スキャンのテスト。"""
+
+    @pytest.fixture
+    def git_repo(self, fake_repo: Path) -> Path:
+        """違反を含むファイルをコミット済みの git リポジトリ。"""
+        (fake_repo / "src" / "urls.py").write_text(f'old = "{FAKE_URL}"\n', encoding="utf-8")
+        git(fake_repo, "init", "-q")
+        git(fake_repo, "add", "-A")
+        git(fake_repo, "commit", "-q", "-m", "initial")
+        return fake_repo
+
+    def test_unchanged_tree_passes(self, git_repo: Path) -> None:
+        """変更がなければ既存の違反があっても成功すること。"""
+        assert policy_check.main(["--staged"]) == 0
+        assert policy_check.main(["--since", "HEAD"]) == 0
+
+    def test_only_changed_lines_are_reported(
+        self, git_repo: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """変更されたファイルの、変更された行の URL のみを検出すること。"""
+        path = git_repo / "src" / "urls.py"
+        path.write_text(f'old = "{FAKE_URL}"\nnew = "{FAKE_URL}"\n', encoding="utf-8")
+        assert policy_check.main(["--since", "HEAD"]) == 1
+        out = capsys.readouterr().out
+        assert "src/urls.py:2" in out
+        assert "src/urls.py:1" not in out
+        assert "leak.py" not in out
+
+        # 未ステージの変更は --staged の対象外
+        assert policy_check.main(["--staged"]) == 0
+        git(git_repo, "add", "src/urls.py")
+        assert policy_check.main(["--staged"]) == 1
+
+    def test_staged_scans_index_content(
+        self, git_repo: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """--staged は作業ツリーではなく、コミットされるインデックスの内容を検査すること。"""
+        path = git_repo / "src" / "config.py"
+        path.write_text(f'x = 1\nkey = "{FAKE_AWS_KEY}"\n', encoding="utf-8")
+        git(git_repo, "add", "src/config.py")
+        # 作業ツリーからのみ削除しても、ステージ済みの秘密情報は検出する
+        path.write_text("x = 1\n", encoding="utf-8")
+        assert policy_check.main(["--staged"]) == 1
+        assert "in src/config.py" in capsys.readouterr().out
+        path.unlink()
+        assert policy_check.main(["--staged"]) == 1
+
+    def test_staged_line_numbers_ignore_unstaged_edits(
+        self, git_repo: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """未ステージの編集で行がずれても、ステージ済みの変更行で判定すること。"""
+        path = git_repo / "src" / "urls.py"
+        path.write_text(f'old = "{FAKE_URL}"\nnew = "{FAKE_URL}"\n', encoding="utf-8")
+        git(git_repo, "add", "src/urls.py")
+        path.write_text(f'# a\n# b\nold = "{FAKE_URL}"\nnew = "{FAKE_URL}"\n', encoding="utf-8")
+        assert policy_check.main(["--staged"]) == 1
+        out = capsys.readouterr().out
+        assert "src/urls.py:2" in out
+        assert "src/urls.py:4" not in out
+
+        # ステージ済みの変更行に違反がなければ、作業ツリーの同じ行の違反は報告しない
+        path.write_text(f'old = "{FAKE_URL}"\nnew = 1\n', encoding="utf-8")
+        git(git_repo, "add", "src/urls.py")
+        path.write_text(f'old = "{FAKE_URL}"\nnew = "{FAKE_URL}"\n', encoding="utf-8")
+        assert policy_check.main(["--staged"]) == 0
+
+    def test_file_level_rules_apply_to_whole_file(self, git_repo: Path) -> None:
+        """秘密情報はファイル内のどこにあっても、変更ファイルなら検出すること。"""
+        path = git_repo / "src" / "leak.py"
+        path.write_text(path.read_text(encoding="utf-8") + "y = 2\n", encoding="utf-8")
+        assert policy_check.main(["--since", "HEAD"]) == 1
+
+    def test_bad_ref_is_an_error(self, git_repo: Path) -> None:
+        """存在しない REF は成功扱いにせず、終了コード 2 を返すこと。"""
+        assert policy_check.main(["--since", "no-such-ref"]) == 2
+
+
+# ---------------------------------------------------------------------------
+# 対象ファイルの列挙
+# ---------------------------------------------------------------------------
+
+
+class TestEnumeration:
+    """``walk`` / ``git`` 列挙方式のテスト。"""
+
+    @pytest.fixture
+    def tree(self, fake_repo: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+        """除外ディレクトリ・除外ファイル・対象外拡張子を含むツリー。"""
+        src = fake_repo / "src"
+        for rel in [
+            "pkg/a.py",
+            "pkg/B.YML",
+            "pkg/notes.md",
+            "pkg/generated.py",
+            "node_modules/dep/index.js",
+            "pkg/__pycache__/a.py",
+        ]:
+            (src / rel).parent.mkdir(parents=True, exist_ok=True)
+            (src / rel).write_text("x = 1\n", encoding="utf-8")
+        monkeypatch.setattr(policy_check, "SKIP_FILES", {"src/pkg/generated.py"})
+        return fake_repo
+
+    @staticmethod
+    def legacy_enumerate() -> set[Path]:
+        """旧実装（rglob + パスごとの除外判定）による列挙。"""
+        return {
+            path
+            for root in policy_check.SCAN_DIRS
+            for path in root.rglob("*")
+            if path.is_file()
+            and not policy_check.should_skip(path)
+            and not policy_check.is_skipped_file(path)
+            and path.suffix.lower() in policy_check.SCAN_EXTENSIONS
+        }
+
+    def test_walk_matches_legacy_rglob(self, tree: Path) -> None:
+        """walk 方式が旧実装と同じファイル集合を返すこと。"""
+        paths = policy_check.enumerate_scan_files("walk")
+        assert set(paths) == self.legacy_enumerate()
+        assert {p.relative_to(tree).as_posix() for p in paths} == {
+            "src/clean.py",
+            "src/leak.py",
+            "src/pkg/a.py",
+            "src/pkg/B.YML",
+        }
+
+    def test_walk_lists_files_before_subdirectories(self, fake_repo: Path) -> None:
+        """walk 方式は各ディレクトリのファイルを名前順に返してから、サブディレクトリを辿ること。"""
+        for rel in ["src/b.py", "src/a/z.py", "src/a/y/x.py", "src/c/w.py", "src/a.py"]:
+            (fake_repo / rel).parent.mkdir(parents=True, exist_ok=True)
+            (fake_repo / rel).write_text("x = 1\n", encoding="utf-8")
+        paths = [
+            p.relative_to(fake_repo).as_posix()
+            for p in policy_check.walk_scan_files(fake_repo / "src")
+        ]
+        # パス全体で整列すると src/a/z.py が src/b.py より前になる
+        assert paths == [
+            "src/a.py",
+            "src/b.py",
+            "src/clean.py",
+            "src/leak.py",
+            "src/a/z.py",
+            "src/a/y/x.py",
+            "src/c/w.py",
+        ]
+
+    def test_git_enumerator_lists_tracked_and_untracked(self, tree: Path) -> None:
+        """git 方式が追跡中・未追跡（ignore 対象外）のファイルを列挙すること。"""
+        (tree / ".gitignore").write_text("src/pkg/B.YML\n", encoding="utf-8")
+        git(tree, "init", "-q")
+        git(tree, "add", "src/clean.py")
+        paths = policy_check.enumerate_scan_files("git")
+        assert {p.relative_to(tree).as_posix() for p in paths} == {
+            "src/clean.py",
+            "src/leak.py",
+            "src/pkg/a.py",
+        }
+
+    def test_git_enumerator_falls_back_to_walk(self, tree: Path) -> None:
+        """git リポジトリでない場合は walk 方式にフォールバックすること。"""
+        assert set(policy_check.enumerate_scan_files("git")) == self.legacy_enumerate()
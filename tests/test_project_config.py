@@ -0,0 +1,192 @@
+"""設定ファイルの読み込み（project_config.loader）のテスト。
+
+組み込みのパーサーが PyYAML と同じ結果を返すこと、解析結果が更新時刻でキャッシュされること、
+シェル変数として 1 回で読み込めることを検証する。
+"""
+
+import os
+import subprocess
+from collections.abc import Iterator
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from project_config import loader
+
+REPO_CONFIG = Path(__file__).resolve().parents[1] / "project-config.yml"
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache() -> Iterator[None]:
+    """テストごとにキャッシュを破棄する。"""
+    loader.clear_cache()
+    yield
+    loader.clear_cache()
+
+
+@pytest.fixture(params=[True, False], ids=["pyyaml", "builtin"])
+def use_yaml(request: pytest.FixtureRequest) -> Iterator[bool]:
+    """PyYAML 使用時と組み込みのパーサー使用時の両方で実行する。"""
+    if request.param and not loader._HAS_YAML:
+        pytest.skip("PyYAML is not installed")
+    with mock.patch.object(loader, "_HAS_YAML", request.param):
+        yield request.param
+
+
+class TestParser:
+    """組み込みの YAML パーサー。"""
+
+    def test_matches_pyyaml_on_repo_config(self) -> None:
+        """リポジトリの設定ファイルに対して PyYAML と同じ結果を返すこと。"""
+        yaml = pytest.importorskip("yaml")
+        text = REPO_CONFIG.read_text(encoding="utf-8")
+        assert loader.parse_yaml(text) == yaml.safe_load(text)
+
+    def test_subset(self) -> None:
+        """ブロック・フロー・ブロックスカラー・コメントを解析できること。"""
+        text = (
+            "# comment\n"
+            "a:\n"
+            '  name: "x # not a comment" # comment\n'
+            "  count: 3\n"
+            "  ratio: 0.5\n"
+            "  flag: true\n"
+            "  empty:\n"
+            "    # only comments\n"
+            "  items: [1, 'two', {k: v}]\n"
+            "  text: |\n"
+            "    line 1\n"
+            "    # kept\n"
+            "\n"
+            "    line 3\n"
+            "list:\n"
+            "- plain\n"
+            "- key: value\n"
+            "  other: 2\n"
+            "-\n"
+            "  - nested\n"
+        )
+        assert loader.parse_yaml(text) == {
+            "a": {
+                "name": "x # not a comment",
+                "count": 3,
+                "ratio": 0.5,
+                "flag": True,
+                "empty": None,
+                "items": [1, "two", {"k": "v"}],
+                "text": "line 1\n# kept\n\nline 3\n",
+            },
+            "list": ["plain", {"key": "value", "other": 2}, ["nested"]],
+        }
+
+    def test_raw_matches_pyyaml_base_loader(self) -> None:
+        """raw では PyYAML の BaseLoader と同じく、スカラーを元の表記の文字列で返すこと。"""
+        yaml = pytest.importorskip("yaml")
+        text = REPO_CONFIG.read_text(encoding="utf-8") + (
+            "extra:\n  version: 3.10\n  flag: yes\n  none: ~\n  items: [1, 'a']\n  empty:\n"
+        )
+        assert loader.parse_yaml(text, raw=True) == yaml.load(text, Loader=yaml.BaseLoader)
+
+    def test_invalid_indentation_rejected(self) -> None:
+        """不正なインデントは ValueError となること。"""
+        with pytest.raises(ValueError, match="line 3"):
+            loader.parse_yaml("a:\n  b: 1\n    c: 2\n")
+
+
+class TestLoadConfig:
+    """設定の読み込みとキャッシュ。"""
+
+    def test_nested_keys(self, use_yaml: bool) -> None:
+        """入れ子のリストを含む全キーを取り出せること。"""
+        config = loader.load_config(REPO_CONFIG)
+        assert loader.get(config, "project.name") == "my-project"
+        assert loader.get(config, "toolchain.version") == "3.11"
+        assert loader.get(config, "source.modules.0.name") == "core"
+        assert loader.get(config, "source.modules.9.name", "none") == "none"
+        flat = loader.flatten(config)
+        assert flat["source.modules.count"] == 2
+        assert flat["ai_models.overrides"] is None
+
+    def test_cached_by_mtime(self, tmp_path: Path, use_yaml: bool) -> None:
+        """更新時刻が変わらなければ再解析せず、変われば再解析すること。"""
+        path = tmp_path / "config.yml"
+        path.write_text("project:\n  name: a\n")
+        first = loader.load_config(path)
+        assert loader.load_config(path) is first
+
+        path.write_text("project:\n  name: b\n")
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        assert loader.get(loader.load_config(path), "project.name") == "b"
+
+    def test_top_level_must_be_mapping(self, tmp_path: Path, use_yaml: bool) -> None:
+        """トップレベルがマッピングでなければ ValueError となること。"""
+        path = tmp_path / "config.yml"
+        path.write_text("- a\n- b\n")
+        with pytest.raises(ValueError, match="must be a mapping"):
+            loader.load_config(path)
+        path.write_text("")
+        assert loader.load_config(path) == {}
+
+
+class TestShellExport:
+    """シェル変数としての出力。"""
+
+    def test_names(self) -> None:
+        """キーを大文字にし、英数字以外を _ に置き換えること。"""
+        assert loader.shell_name("source.modules.0.name") == "CFG_SOURCE_MODULES_0_NAME"
+        assert loader.shell_name("a-b.c", prefix="X_") == "X_A_B_C"
+
+    def test_eval_in_bash(self, tmp_path: Path) -> None:
+        """1 回の呼び出しの出力を eval して全キーを参照できること。"""
+        path = tmp_path / "config.yml"
+        path.write_text(
+            "project:\n"
+            '  name: "it\'s $HOME `x`"\n'
+            "  scope: |\n"
+            "    - one\n"
+            "    - two\n"
+            "  enabled: false\n"
+            "source:\n"
+            "  modules:\n"
+            "    - name: core\n"
+        )
+        script = (
+            'eval "$(python3 -m project_config.loader --config "$1" shell)"\n'
+            'printf "%s|%s|%s|%s|%s" "$CFG_PROJECT_NAME" "$CFG_PROJECT_SCOPE" '
+            '"$CFG_PROJECT_ENABLED" "$CFG_SOURCE_MODULES_0_NAME" "$CFG_SOURCE_MODULES_COUNT"\n'
+        )
+        src = str(Path(loader.__file__).resolve().parents[1])
+        result = subprocess.run(
+            ["bash", "-c", script, "bash", str(path)],
+            env={**os.environ, "PYTHONPATH": src},
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        assert result.stdout == "it's $HOME `x`|- one\n- two\n|false|core|1"
+
+    def test_scalars_keep_original_text(
+        self, tmp_path: Path, use_yaml: bool, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """数値・真偽値に見えるスカラーも、パーサーによらず元の表記のまま出力すること。"""
+        path = tmp_path / "config.yml"
+        path.write_text(
+            "toolchain:\n  version: 3.10\n  enabled: yes\n  count: 007\n  quoted: '1.0'\n"
+        )
+        assert loader.main(["--config", str(path), "shell"]) == 0
+        assert capsys.readouterr().out == (
+            "CFG_TOOLCHAIN_VERSION=3.10\n"
+            "CFG_TOOLCHAIN_ENABLED=yes\n"
+            "CFG_TOOLCHAIN_COUNT=007\n"
+            "CFG_TOOLCHAIN_QUOTED=1.0\n"
+        )
+        assert loader.main(["--config", str(path), "get", "toolchain.version"]) == 0
+        assert capsys.readouterr().out == "3.10\n"
+
+    def test_get_command(self, capsys: pytest.CaptureFixture[str]) -> None:
+        """get コマンドは 1 つの値を、未定義なら既定値を出力すること。"""
+        assert loader.main(["--config", str(REPO_CONFIG), "get", "source.src_dir"]) == 0
+        assert loader.main(["--config", str(REPO_CONFIG), "get", "missing", "--default", "x"]) == 0
+        assert capsys.readouterr().out == "src\nx\n"
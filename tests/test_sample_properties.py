@@ -11,12 +11,28 @@ CUSTOMIZE: ``ExampleEntity`` / ``process`` のインポート先を
     プロジェクトの実際のモジュールに変更すること。
 """
 
+import dataclasses
+import importlib.util
+import sys
+from array import array
+from collections.abc import Iterator
+from pathlib import Path
+from unittest import mock
+
 import pytest
 from hypothesis import assume, given, settings
 from hypothesis import strategies as st
 
 # CUSTOMIZE: インポート先をプロジェクトの実際のモジュールに変更すること。
-from sample.example_module import ExampleEntity, process
+from sample import example_module
+from sample.example_module import (
+    ExampleEntity,
+    ExampleEntityBatch,
+    FrozenExampleEntity,
+    SlottedExampleEntity,
+    process,
+    process_batch,
+)
 
 # ---------------------------------------------------------------------------
 # 戦略（Strategies）: テストデータの生成規則
@@ -146,3 +162,154 @@ class TestProcessPreconditions:
         entity = ExampleEntity(name="test", value=value)
         with pytest.raises(AssertionError, match="multiplier must be > 0.0"):
             process(entity, multiplier)
+
+
+# ---------------------------------------------------------------------------
+# プロパティテスト: process_batch 関数
+# ---------------------------------------------------------------------------
+
+
+@pytest.fixture(params=[True, False], ids=["numpy", "fallback"])
+def use_numpy(request: pytest.FixtureRequest) -> Iterator[bool]:
+    """NumPy 使用時とフォールバック時の両方で実行する。"""
+    if request.param and not example_module._HAS_NUMPY:
+        pytest.skip("numpy is not installed")
+    with mock.patch.object(example_module, "_HAS_NUMPY", request.param):
+        yield request.param
+
+
+class TestProcessBatch:
+    """``process_batch`` / ``ExampleEntityBatch`` のテスト。
+
+    列指向版は要素ごとの ``process`` と同じ結果・同じ契約を持つことを検証する。
+    """
+
+    @given(values=st.lists(valid_values, max_size=50), multiplier=valid_multipliers)
+    @settings(max_examples=100)
+    def test_matches_process(self, values: list[float], multiplier: float) -> None:
+        """一括処理の結果は要素ごとの process の結果と一致すること。"""
+        expected = [process(ExampleEntity(name="test", value=v), multiplier) for v in values]
+        for flag in (True, False) if example_module._HAS_NUMPY else (False,):
+            with mock.patch.object(example_module, "_HAS_NUMPY", flag):
+                batch = ExampleEntityBatch(["test"] * len(values), array("d", values))
+                assert list(process_batch(batch, multiplier)) == expected
+
+    def test_violation_reports_index(self, use_numpy: bool) -> None:
+        """列全体の契約違反は最初に違反した位置を報告すること。"""
+        with pytest.raises(AssertionError, match="value must be >= 0.0, got -1.0 at index 2"):
+            process_batch([1.0, 2.0, -1.0, -3.0], 2.0)
+        with pytest.raises(AssertionError, match="multiplier must be > 0.0"):
+            process_batch([1.0], 0.0)
+        with pytest.raises(AssertionError, match="name must not be empty at index 1"):
+            ExampleEntityBatch(["a", "", "c"], array("d", [1.0, 2.0, 3.0]))
+        with pytest.raises(AssertionError, match="value must be >= 0.0, got nan at index 0"):
+            ExampleEntityBatch(["a"], array("d", [float("nan")]))
+
+    def test_columnar_round_trip(self, use_numpy: bool) -> None:
+        """エンティティの列と相互に変換でき、不正な長さは拒否されること。"""
+        entities = [ExampleEntity(name="a", value=1.5), ExampleEntity(name="b", value=0.0)]
+        batch = ExampleEntityBatch.from_entities(entities)
+        assert len(batch) == 2
+        assert [batch[i] for i in range(len(batch))] == entities
+        with pytest.raises(AssertionError, match="same length"):
+            ExampleEntityBatch(["a"], array("d", [1.0, 2.0]))
+
+    def test_numpy_columns(self) -> None:
+        """NumPy の列を直接受け付け、NumPy 配列を返すこと。"""
+        np = pytest.importorskip("numpy")
+        batch = ExampleEntityBatch(np.array(["a", "b"]), np.array([1.0, 2.5]))
+        result = process_batch(batch, 2.0)
+        assert isinstance(result, np.ndarray)
+        assert result.tolist() == [2.0, 5.0]
+        assert process_batch(np.array([1e308]), 10.0).tolist() == [float("inf")]
+
+
+# ---------------------------------------------------------------------------
+# プロパティテスト: 省メモリ版のエンティティ
+# ---------------------------------------------------------------------------
+
+compact_entity_classes = pytest.mark.parametrize(
+    "cls", [SlottedExampleEntity, FrozenExampleEntity], ids=["slots", "frozen"]
+)
+
+
+class TestCompactEntities:
+    """スロット版エンティティと struct-of-arrays 版コレクションのテスト。
+
+    省メモリ版も ``ExampleEntity`` と同じ不変条件を持つことを検証する。
+    """
+
+    @compact_entity_classes
+    @given(value=st.floats(max_value=-0.001, allow_nan=False, allow_infinity=False))
+    @settings(max_examples=50)
+    def test_negative_value_rejected(self, cls: type, value: float) -> None:
+        """負の value でのインスタンス生成はアサーションエラーとなること。"""
+        with pytest.raises(AssertionError, match="value must be >= 0.0"):
+            cls(name="test", value=value)
+
+    @compact_entity_classes
+    def test_empty_name_rejected(self, cls: type) -> None:
+        """空文字列の name でのインスタンス生成はアサーションエラーとなること。"""
+        with pytest.raises(AssertionError, match="name must not be empty"):
+            cls(name="", value=1.0)
+
+    @compact_entity_classes
+    @given(value=valid_values, multiplier=valid_multipliers)
+    @settings(max_examples=50)
+    def test_process_accepts_compact(self, cls: type, value: float, multiplier: float) -> None:
+        """process は省メモリ版にも同じ結果を返すこと。"""
+        expected = process(ExampleEntity(name="test", value=value), multiplier)
+        assert process(cls(name="test", value=value), multiplier) == expected
+
+    def test_slots_and_frozen(self) -> None:
+        """インスタンスは __dict__ を持たず、frozen 版は変更できないこと。"""
+        slotted = SlottedExampleEntity(name="a", value=1.0)
+        frozen = FrozenExampleEntity(name="a", value=1.0)
+        assert not hasattr(slotted, "__dict__")
+        assert not hasattr(frozen, "__dict__")
+        with pytest.raises(AttributeError):
+            slotted.extra = 1  # type: ignore[attr-defined]
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            frozen.value = 2.0  # type: ignore[misc]
+        assert {frozen, FrozenExampleEntity(name="a", value=1.0)} == {frozen}
+
+    def test_names_are_interned(self) -> None:
+        """重複した名前は名前表で 1 つにまとめられ、ビューから引けること。"""
+        names = ["a", "b", "a", "c", "b"]
+        batch = ExampleEntityBatch(names, array("d", [1.0] * 5))
+        assert batch.name_table == ["a", "b", "c"]
+        assert list(batch.names) == names
+        assert batch.names[-1] == "b"
+        assert batch.names[1:3] == ["b", "a"]
+        table = sum(sys.getsizeof(name) for name in batch.name_table)
+        assert batch.nbytes() == len(names) * (4 + 8) + table
+
+    def test_append_and_extend(self) -> None:
+        """追加時も不変条件を検証し、違反した位置を報告すること。"""
+        batch = ExampleEntityBatch.from_entities(
+            [SlottedExampleEntity(name="a", value=1.0), FrozenExampleEntity(name="b", value=2.0)]
+        )
+        batch.append("a", 3.0)
+        assert batch[2] == ExampleEntity(name="a", value=3.0)
+        assert batch.name_table == ["a", "b"]
+        with pytest.raises(AssertionError, match="value must be >= 0.0, got -1.0 at index 3"):
+            batch.append("c", -1.0)
+        with pytest.raises(AssertionError, match="name must not be empty at index 3"):
+            batch.append("", 1.0)
+        assert len(batch) == 3
+        assert list(process_batch(batch, 2.0)) == [2.0, 4.0, 6.0]
+
+    def test_memory_per_entity(self) -> None:
+        """1 件あたりのメモリは columnar < slots < dataclass の順に小さいこと。"""
+        path = Path(__file__).parent / "benchmarks" / "bench_entity_memory.py"
+        spec = importlib.util.spec_from_file_location("bench_entity_memory", path)
+        assert spec is not None and spec.loader is not None
+        bench = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(bench)
+
+        names, values = bench.make_columns(20_000, 10, seed=0)
+        sizes = {
+            name: bench.bytes_per_entity(name, names, values)
+            for name in ("dataclass", "slots", "columnar")
+        }
+        assert sizes["columnar"] < sizes["slots"] < sizes["dataclass"]
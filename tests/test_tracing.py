@@ -0,0 +1,1256 @@
+"""src/observability/tracing.py のテスト。
+
+グローバル TracerProvider は一度しか設定できないため、モジュール読み込み時に
+インメモリエクスポータ付きの Provider を設定し、テストごとに記録済みスパンを消去する。
+"""
+
+import asyncio
+import gc
+import importlib.util
+import inspect
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from collections.abc import AsyncIterator, Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+pytest.importorskip("opentelemetry.sdk")
+
+from opentelemetry import trace  # noqa: E402
+from opentelemetry.sdk.metrics import MeterProvider  # noqa: E402
+from opentelemetry.sdk.metrics.export import InMemoryMetricReader  # noqa: E402
+from opentelemetry.sdk.trace import TracerProvider  # noqa: E402
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor, SpanExportResult  # noqa: E402
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import (  # noqa: E402
+    InMemorySpanExporter,
+)
+
+from observability import tracing  # noqa: E402
+
+EXPORTER = InMemorySpanExporter()
+_provider = TracerProvider()
+_provider.add_span_processor(SimpleSpanProcessor(EXPORTER))
+METRICS = InMemoryMetricReader()
+trace.set_tracer_provider(_provider)
+tracing.configure_metrics(MeterProvider(metric_readers=[METRICS]))
+
+
+@pytest.fixture(autouse=True)
+def _reset() -> None:
+    """記録済みスパンとサンプリング設定をテストごとに初期化する。"""
+    EXPORTER.clear()
+    tracing.configure_sampling()
+
+
+def span_names() -> list[str]:
+    """記録されたスパン名を終了順に返す。"""
+    return [span.name for span in EXPORTER.get_finished_spans()]
+
+
+# ---------------------------------------------------------------------------
+# 基本動作
+# ---------------------------------------------------------------------------
+
+
+class TestDecorators:
+    """3 種のデコレータの属性と状態記録のテスト。"""
+
+    def test_attributes_and_status(self) -> None:
+        """成功時は既定の属性と成功ステータスを記録すること。"""
+
+        @tracing.trace_tool_execution("shell.run")
+        def run(cmd: str) -> str:
+            return cmd.upper()
+
+        @tracing.trace_llm_call("test-model")
+        def chat(prompt: str) -> str:
+            return prompt
+
+        assert run("ls") == "LS"
+        assert chat("hi") == "hi"
+        tool_span, llm_span = EXPORTER.get_finished_spans()
+        assert tool_span.name == "shell.run"
+        assert tool_span.attributes["tool.name"] == "shell.run"
+        assert tool_span.attributes["tool.status"] == "success"
+        assert llm_span.name == "gen_ai.chat.test-model"
+        assert llm_span.attributes["gen_ai.response.finish_reason"] == "stop"
+
+    def test_error_is_recorded_and_reraised(self) -> None:
+        """例外時はエラーステータスと例外イベントを記録して再送出すること。"""
+
+        @tracing.trace_agent_operation()
+        def fail() -> None:
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError, match="boom"):
+            fail()
+        (span,) = EXPORTER.get_finished_spans()
+        assert span.name.endswith("fail")
+        assert span.attributes["agent.status"] == "error"
+        assert span.events[0].name == "exception"
+
+
+class _CountingRepr:
+    """``repr()`` された回数を数える（直列化の有無の確認用）。"""
+
+    calls = 0
+
+    def __repr__(self) -> str:
+        type(self).calls += 1
+        return "counted"
+
+
+class TestToolCapture:
+    """``trace_tool_execution`` の引数・戻り値の取得のテスト。"""
+
+    def test_not_captured_by_default(self) -> None:
+        """既定では引数・戻り値を記録しないこと。"""
+
+        @tracing.trace_tool_execution("tool")
+        def tool(cmd: str) -> str:
+            return cmd
+
+        tool("ls")
+        (span,) = EXPORTER.get_finished_spans()
+        assert "tool.arguments" not in span.attributes
+        assert "tool.result" not in span.attributes
+
+    def test_arguments_and_result(self) -> None:
+        """引数名つきの引数と戻り値を JSON で記録すること。"""
+
+        @tracing.trace_tool_execution("tool", capture_args=True, capture_result=True)
+        def tool(cmd: str, *, cwd: str = ".", timeout: float | None = None) -> dict[str, Any]:
+            return {"code": 0, "out": [cmd, cwd]}
+
+        tool("ls", cwd="/tmp")
+        (span,) = EXPORTER.get_finished_spans()
+        assert json.loads(span.attributes["tool.arguments"]) == {"cmd": "ls", "cwd": "/tmp"}
+        assert json.loads(span.attributes["tool.result"]) == {"code": 0, "out": ["ls", "/tmp"]}
+
+    def test_secrets_redacted(self) -> None:
+        """秘密情報らしい名前の値と、秘密情報のパターンに一致する文字列を伏せること。"""
+        key = "sk-" + "a1" * 20
+
+        @tracing.trace_tool_execution("tool", capture_args=True, capture_result=True)
+        def tool(url: str, api_key: str, headers: dict[str, str]) -> str:
+            return f"used {key}"
+
+        tool("https://" + "example.com", key, {"Authorization": "Bearer x", "Accept": "json"})
+        (span,) = EXPORTER.get_finished_spans()
+        arguments = json.loads(span.attributes["tool.arguments"])
+        assert arguments["api_key"] == "[REDACTED]"
+        assert arguments["headers"] == {"Authorization": "[REDACTED]", "Accept": "json"}
+        assert span.attributes["tool.result"] == '"used [REDACTED]"'
+
+    def test_multiline_private_key_redacted(self) -> None:
+        """改行を含む秘密鍵は、JSON のエスケープに関係なく鍵本体まで伏せること。"""
+        body = "MIIEowIBAAKCAQEA" + "q" * 40
+        pem = "-----BEGIN RSA " + f"PRIVATE KEY-----\n{body}\n{body}\n-----END RSA PRIVATE KEY-----"
+
+        @tracing.trace_tool_execution("tool", capture_args=True, capture_result=True)
+        def tool(note: str, files: list[str]) -> dict[str, str]:
+            return {"key.pem": pem[:80]}
+
+        tool(f"see\n{pem}\nend", [pem])
+        (span,) = EXPORTER.get_finished_spans()
+        assert json.loads(span.attributes["tool.arguments"]) == {
+            "note": "see\n[REDACTED]\nend",
+            "files": ["[REDACTED]"],
+        }
+        # 切り詰められた鍵も文字列の末尾まで伏せる
+        assert json.loads(span.attributes["tool.result"]) == {"key.pem": "[REDACTED]"}
+
+    def test_token_counts_are_not_redacted(self) -> None:
+        """``max_tokens`` 等の件数は伏せず、トークンそのものの値だけを伏せること。"""
+
+        @tracing.trace_tool_execution("tool", capture_args=True)
+        def tool(max_tokens: int, options: dict[str, object]) -> None:
+            pass
+
+        tool(256, {"total_tokens": 10, "access_token": "abc", "authToken": "def", "token": "g"})
+        (span,) = EXPORTER.get_finished_spans()
+        assert json.loads(span.attributes["tool.arguments"]) == {
+            "max_tokens": 256,
+            "options": {
+                "total_tokens": 10,
+                "access_token": "[REDACTED]",
+                "authToken": "[REDACTED]",
+                "token": "[REDACTED]",
+            },
+        }
+
+    def test_large_payload_truncated_after_redaction(self) -> None:
+        """上限を超える値は切り詰め、上限をまたぐ秘密情報も断片を残さないこと。"""
+        secret = "AKIA" + "Z" * 16
+
+        @tracing.trace_tool_execution("tool", capture_args=True, max_attribute_length=64)
+        def tool(text: str, rows: list[int]) -> None:
+            pass
+
+        tool("x" * 55 + secret, list(range(1_000_000)))
+        (span,) = EXPORTER.get_finished_spans()
+        captured = span.attributes["tool.arguments"]
+        assert captured.endswith("…[truncated]")
+        assert len(captured) == 64 + len("…[truncated]")
+        assert "AKIA" not in captured
+
+    def test_serialized_only_when_recording(self) -> None:
+        """サンプリングされなかった呼び出しでは引数・戻り値を直列化しないこと。"""
+
+        @tracing.trace_tool_execution("tool", capture_args=True, capture_result=True)
+        def tool(value: object) -> object:
+            return value
+
+        _CountingRepr.calls = 0
+        tracing.configure_sampling(sample_ratio=0.0)
+        tool(_CountingRepr())
+        assert _CountingRepr.calls == 0
+        tracing.configure_sampling()
+        tool(_CountingRepr())
+        assert _CountingRepr.calls == 2
+
+    def test_configure_redaction(self) -> None:
+        """伏せるパターンを置き換えられること。"""
+
+        @tracing.trace_tool_execution("tool", capture_args=True)
+        def tool(ticket: str, note: str, token: str) -> None:
+            pass
+
+        tracing.configure_redaction([r"TICKET-\d+"], key_pattern="ticket")
+        try:
+            tool("1", "see TICKET-42", "visible")
+        finally:
+            tracing.configure_redaction()
+        (span,) = EXPORTER.get_finished_spans()
+        assert json.loads(span.attributes["tool.arguments"]) == {
+            "ticket": "[REDACTED]",
+            "note": "see [REDACTED]",
+            "token": "visible",
+        }
+
+    def test_invalid_max_length_rejected(self) -> None:
+        """正でない ``max_attribute_length`` は ValueError となること。"""
+        with pytest.raises(ValueError, match="max_attribute_length"):
+            tracing.trace_tool_execution(capture_args=True, max_attribute_length=0)
+
+
+# ---------------------------------------------------------------------------
+# 非同期関数・ジェネレータ
+# ---------------------------------------------------------------------------
+
+
+class TestAsyncAndGenerators:
+    """コルーチン・非同期ジェネレータ・ジェネレータの計装のテスト。"""
+
+    def test_wrapper_kind_is_preserved(self) -> None:
+        """ラッパーが元の関数と同じ種類（コルーチン等）であること。"""
+
+        @tracing.trace_tool_execution()
+        async def coro() -> None:
+            pass
+
+        @tracing.trace_tool_execution()
+        async def agen() -> AsyncIterator[int]:
+            yield 1
+
+        @tracing.trace_tool_execution()
+        def gen() -> Iterator[int]:
+            yield 1
+
+        assert inspect.iscoroutinefunction(coro)
+        assert inspect.isasyncgenfunction(agen)
+        assert inspect.isgeneratorfunction(gen)
+
+    def test_concurrent_coroutines_are_timed_until_completion(self) -> None:
+        """並行実行した各呼び出しのスパンが await 完了まで開いており、親子が混ざらないこと。"""
+
+        @tracing.trace_tool_execution("fetch")
+        async def fetch(i: int) -> int:
+            await asyncio.sleep(0.05)
+            return i
+
+        @tracing.trace_agent_operation("fan_out")
+        async def fan_out() -> list[int]:
+            return list(await asyncio.gather(*(fetch(i) for i in range(20))))
+
+        assert asyncio.run(fan_out()) == list(range(20))
+        spans = EXPORTER.get_finished_spans()
+        (root,) = [span for span in spans if span.name == "fan_out"]
+        fetches = [span for span in spans if span.name == "fetch"]
+        assert len(fetches) == 20
+        for span in fetches:
+            assert span.parent is not None
+            assert span.parent.span_id == root.context.span_id
+            assert span.end_time - span.start_time >= 40_000_000
+            assert span.attributes["tool.status"] == "success"
+        # 20 件の sleep が直列化されていない（イベントループをブロックしていない）
+        assert root.end_time - root.start_time < 500_000_000
+
+    def test_generator_span_spans_iteration_only(self) -> None:
+        """ジェネレータのスパンは反復の完了で閉じ、yield 中の呼び出し元の処理を子にしないこと。"""
+
+        @tracing.trace_tool_execution("inner")
+        def inner() -> None:
+            pass
+
+        @tracing.trace_tool_execution("consumer")
+        def consumer() -> None:
+            pass
+
+        @tracing.trace_tool_execution("produce")
+        def produce(n: int) -> Iterator[int]:
+            for i in range(n):
+                inner()
+                yield i
+
+        items = []
+        for item in produce(3):
+            consumer()
+            items.append(item)
+        assert items == [0, 1, 2]
+
+        spans = EXPORTER.get_finished_spans()
+        (gen_span,) = [span for span in spans if span.name == "produce"]
+        assert gen_span.attributes["tool.status"] == "success"
+        for span in spans:
+            if span.name == "inner":
+                assert span.parent.span_id == gen_span.context.span_id
+            if span.name == "consumer":
+                assert span.parent is None
+
+    def test_generator_send_throw_and_close(self) -> None:
+        """send() / throw() を中継し、途中の close() でもスパンを閉じること。"""
+
+        @tracing.trace_tool_execution("echo")
+        def echo() -> Iterator[str]:
+            received = "start"
+            while True:
+                try:
+                    received = yield received
+                except ValueError:
+                    received = "recovered"
+
+        gen = echo()
+        assert next(gen) == "start"
+        assert gen.send("hello") == "hello"
+        assert gen.throw(ValueError) == "recovered"
+        assert span_names() == []
+        gen.close()
+        (span,) = EXPORTER.get_finished_spans()
+        assert span.attributes["tool.status"] == "success"
+
+    def test_generator_error_is_recorded(self) -> None:
+        """ジェネレータ内の例外はエラーとして記録され、呼び出し元へ伝播すること。"""
+
+        @tracing.trace_tool_execution("broken")
+        def broken() -> Iterator[int]:
+            yield 1
+            raise RuntimeError("boom")
+
+        with pytest.raises(RuntimeError, match="boom"):
+            list(broken())
+        (span,) = EXPORTER.get_finished_spans()
+        assert span.attributes["tool.status"] == "error"
+
+    def test_async_generator(self) -> None:
+        """非同期ジェネレータのスパンが反復完了まで開いており、値をそのまま中継すること。"""
+
+        @tracing.trace_llm_call("stream-model")
+        async def stream(n: int) -> AsyncIterator[str]:
+            for i in range(n):
+                await asyncio.sleep(0.01)
+                yield f"tok{i}"
+
+        async def consume() -> list[str]:
+            return [token async for token in stream(3)]
+
+        assert asyncio.run(consume()) == ["tok0", "tok1", "tok2"]
+        (span,) = EXPORTER.get_finished_spans()
+        assert span.attributes["gen_ai.response.finish_reason"] == "stop"
+        assert span.end_time - span.start_time >= 25_000_000
+
+    def test_unsampled_generator_suppresses_children(self) -> None:
+        """記録しないと判定されたジェネレータ内の呼び出しも記録しないこと。"""
+
+        @tracing.trace_tool_execution("inner")
+        def inner() -> None:
+            pass
+
+        @tracing.trace_tool_execution("produce")
+        def produce() -> Iterator[int]:
+            inner()
+            yield 1
+
+        tracing.configure_sampling(sample_ratio=0.0)
+        assert list(produce()) == [1]
+        assert span_names() == []
+
+
+# ---------------------------------------------------------------------------
+# LLM 応答の記録・ストリーミング
+# ---------------------------------------------------------------------------
+
+
+class TestLLMResponses:
+    """``trace_llm_call`` の使用量記録とストリーミング計測のテスト。"""
+
+    def test_usage_is_extracted_from_response(self) -> None:
+        """応答の usage / model / stop_reason を属性として記録すること。"""
+
+        @tracing.trace_llm_call("req-model")
+        def chat() -> dict[str, object]:
+            return {
+                "model": "resp-model",
+                "stop_reason": "end_turn",
+                "usage": {"input_tokens": 12, "output_tokens": 34},
+            }
+
+        chat()
+        (span,) = EXPORTER.get_finished_spans()
+        assert span.attributes["gen_ai.usage.input_tokens"] == 12
+        assert span.attributes["gen_ai.usage.output_tokens"] == 34
+        assert span.attributes["gen_ai.response.model"] == "resp-model"
+        assert span.attributes["gen_ai.response.finish_reason"] == "end_turn"
+
+    def test_sync_stream_metrics(self) -> None:
+        """ストリームを逐次中継し、TTFT・チャンク間隔・出力速度を記録すること。"""
+        produced: list[int] = []
+
+        def chunks() -> Iterator[str]:
+            time.sleep(0.03)
+            for i in range(5):
+                produced.append(i)
+                time.sleep(0.01)
+                yield f"t{i}"
+
+        @tracing.trace_llm_call("m", stream=True)
+        def chat() -> Iterator[str]:
+            return chunks()
+
+        stream = chat()
+        assert next(stream) == "t0"
+        # バッファせずに 1 件ずつ取り出していること
+        assert produced == [0]
+        assert span_names() == []
+        assert list(stream) == ["t1", "t2", "t3", "t4"]
+
+        (span,) = EXPORTER.get_finished_spans()
+        attrs = span.attributes
+        assert attrs["gen_ai.usage.output_tokens"] == 5
+        assert attrs["gen_ai.response.finish_reason"] == "stop"
+        assert attrs["gen_ai.response.time_to_first_token"] >= 0.03
+        assert attrs["gen_ai.response.inter_token_latency.p50"] >= 0.005
+        assert attrs["gen_ai.response.tokens_per_second"] > 0
+        assert [event.name for event in span.events] == ["gen_ai.content.first_token"]
+
+    def test_async_generator_stream_with_reported_usage(self) -> None:
+        """非同期ジェネレータの最終チャンクが報告した使用量を優先すること。"""
+
+        @tracing.trace_llm_call("m", stream=True, token_counter=lambda chunk: 2)
+        async def chat() -> AsyncIterator[dict[str, object]]:
+            for _ in range(3):
+                await asyncio.sleep(0)
+                yield {"delta": "x"}
+            yield {"usage": {"input_tokens": 7, "output_tokens": 99}, "stop_reason": "end_turn"}
+
+        async def consume() -> int:
+            return len([chunk async for chunk in chat()])
+
+        assert asyncio.run(consume()) == 4
+        (span,) = EXPORTER.get_finished_spans()
+        assert span.attributes["gen_ai.usage.input_tokens"] == 7
+        assert span.attributes["gen_ai.usage.output_tokens"] == 99
+        assert span.attributes["gen_ai.response.finish_reason"] == "end_turn"
+
+    def test_coroutine_returning_async_iterator(self) -> None:
+        """コルーチンが返す非同期イテレータも計測し、途中終了を cancelled と記録すること。"""
+
+        async def tokens() -> AsyncIterator[str]:
+            for i in range(100):
+                yield str(i)
+
+        @tracing.trace_llm_call("m", stream=True)
+        async def chat() -> AsyncIterator[str]:
+            return tokens()
+
+        async def consume() -> list[str]:
+            stream = await chat()
+            first = []
+            async for token in stream:
+                first.append(token)
+                if len(first) == 3:
+                    break
+            await stream.aclose()
+            return first
+
+        assert asyncio.run(consume()) == ["0", "1", "2"]
+        (span,) = EXPORTER.get_finished_spans()
+        assert span.attributes["gen_ai.usage.output_tokens"] == 3
+        assert span.attributes["gen_ai.response.finish_reason"] == "cancelled"
+
+    @pytest.mark.parametrize("iterated", [0, 2])
+    @pytest.mark.parametrize("is_async", [False, True])
+    def test_abandoned_stream_ends_span(self, is_async: bool, iterated: int) -> None:
+        """反復も close() もされずに破棄されたストリームのスパンを abandoned として閉じること。"""
+
+        def tokens() -> Iterator[str]:
+            yield from ["a", "b", "c"]
+
+        async def async_tokens() -> AsyncIterator[str]:
+            for token in tokens():
+                yield token
+
+        @tracing.trace_llm_call("m", stream=True)
+        def chat() -> Any:
+            return async_tokens() if is_async else tokens()
+
+        stream = chat()
+        for _ in range(iterated):
+            if is_async:
+                # イベントループの終了処理で閉じられないよう、ループを使わずに 1 件進める
+                with pytest.raises(StopIteration):
+                    anext(stream).send(None)
+            else:
+                next(stream)
+        assert span_names() == []
+        del stream
+        gc.collect()
+
+        (span,) = EXPORTER.get_finished_spans()
+        assert span.attributes["gen_ai.response.finish_reason"] == "abandoned"
+        assert span.attributes["gen_ai.usage.output_tokens"] == iterated
+
+    def test_stream_error(self) -> None:
+        """ストリーム途中の例外をエラーとして記録すること。"""
+
+        @tracing.trace_llm_call("m", stream=True)
+        def chat() -> Iterator[str]:
+            yield "a"
+            raise ConnectionError("reset")
+
+        with pytest.raises(ConnectionError):
+            list(chat())
+        (span,) = EXPORTER.get_finished_spans()
+        assert span.attributes["gen_ai.response.finish_reason"] == "error"
+        assert span.attributes["gen_ai.usage.output_tokens"] == 1
+
+
+# ---------------------------------------------------------------------------
+# サンプリング
+# ---------------------------------------------------------------------------
+
+
+class TestSampling:
+    """``configure_sampling`` / ``init_tracer`` のサンプリング設定のテスト。"""
+
+    def test_zero_ratio_skips_whole_call_tree(self) -> None:
+        """ルートがサンプリングされなければ配下の呼び出しもスパンを生成しないこと。"""
+
+        @tracing.trace_tool_execution("child")
+        def child() -> int:
+            return 1
+
+        @tracing.trace_agent_operation("root")
+        def root() -> int:
+            return child() + 1
+
+        tracing.configure_sampling(sample_ratio=0.0)
+        assert root() == 2
+        assert child() == 1
+        assert span_names() == []
+
+    def test_children_follow_sampled_parent(self) -> None:
+        """ルートが記録されれば、比率に関係なく子も記録されること。"""
+
+        @tracing.trace_tool_execution("child")
+        def child() -> None:
+            pass
+
+        tracer = trace.get_tracer(__name__)
+        with tracer.start_as_current_span("manual-root"):
+            tracing.configure_sampling(sample_ratio=0.0)
+            child()
+        assert span_names() == ["child", "manual-root"]
+
+    @pytest.mark.parametrize("shape", ["generator", "iterator", "async-generator", "coroutine"])
+    def test_unsampled_stream_skips_calls_inside(self, shape: str) -> None:
+        """サンプリングされなかったストリームの呼び出し中・生成中の呼び出しも記録しないこと。"""
+
+        @tracing.trace_tool_execution("inner.tool")
+        def inner(value: int) -> int:
+            return value
+
+        def chunks() -> Iterator[int]:
+            yield inner(1)
+            yield inner(2)
+
+        async def async_chunks() -> AsyncIterator[int]:
+            yield inner(1)
+            yield inner(2)
+
+        def open_iterator() -> Iterator[int]:
+            inner(0)
+            return chunks()
+
+        async def open_async() -> AsyncIterator[int]:
+            inner(0)
+            return async_chunks()
+
+        async def collect(stream: Any) -> list[int]:
+            return [chunk async for chunk in stream]
+
+        funcs: dict[str, Any] = {
+            "generator": chunks,
+            "iterator": open_iterator,
+            "async-generator": async_chunks,
+            "coroutine": open_async,
+        }
+        stream = tracing.trace_llm_call("m", stream=True)(funcs[shape])
+
+        def consume() -> list[int]:
+            if shape in ("generator", "iterator"):
+                return list(stream())
+            if shape == "async-generator":
+                return asyncio.run(collect(stream()))
+            return asyncio.run(collect(asyncio.run(stream())))
+
+        # ストリームのみレート制限し、1 回目で枠を使い切る（inner.tool 単独なら記録される）
+        tracing.configure_sampling(rate_limits={"gen_ai.chat.m": 0.001})
+        assert consume() == [1, 2]
+        assert "gen_ai.chat.m" in span_names()
+        EXPORTER.clear()
+        assert consume() == [1, 2]
+        assert span_names() == []
+
+    def test_rate_limit_per_span_name(self) -> None:
+        """レート制限はスパン名ごとに適用されること。"""
+
+        @tracing.trace_tool_execution("limited")
+        def limited() -> None:
+            pass
+
+        @tracing.trace_tool_execution("free")
+        def free() -> None:
+            pass
+
+        tracing.init_tracer(rate_limits={"limited": 2.0})
+        for _ in range(10):
+            limited()
+            free()
+        assert span_names().count("limited") == 2
+        assert span_names().count("free") == 10
+
+    @pytest.mark.parametrize(
+        "kwargs", [{"sample_ratio": 1.5}, {"sample_ratio": -0.1}, {"rate_limits": {"x": 0.0}}]
+    )
+    def test_invalid_settings_rejected(self, kwargs: dict[str, object]) -> None:
+        """範囲外の比率・正でないレートは ValueError となること。"""
+        with pytest.raises(ValueError):
+            tracing.configure_sampling(**kwargs)  # type: ignore[arg-type]
+
+
+# ---------------------------------------------------------------------------
+# コンテキストの伝播
+# ---------------------------------------------------------------------------
+
+
+@tracing.trace_tool_execution("worker.task")
+def _worker_task(value: int) -> tuple[int, int, int]:
+    """現在のスパンの値・トレース ID・親スパン ID を返す（プロセスプール用）。"""
+    span = trace.get_current_span()
+    parent = getattr(span, "parent", None)
+    return value, span.get_span_context().trace_id, parent.span_id if parent else 0
+
+
+class TestContextPropagation:
+    """スレッドプール・プロセスプール・サブプロセスへのコンテキスト伝播のテスト。"""
+
+    def test_thread_pool_tasks_are_children(self) -> None:
+        """``submit()`` / ``map()`` のタスクのスパンが送信元のスパンの子となること。"""
+        tracer = trace.get_tracer(__name__)
+        with (
+            tracer.start_as_current_span("fan-out") as root,
+            tracing.ContextThreadPoolExecutor(max_workers=2) as pool,
+        ):
+            pool.submit(_worker_task, 0).result()
+            assert [v for v, _, _ in pool.map(_worker_task, [1, 2])] == [1, 2]
+        root_context = root.get_span_context()
+        workers = [s for s in EXPORTER.get_finished_spans() if s.name == "worker.task"]
+        assert len(workers) == 3
+        for span in workers:
+            assert span.context.trace_id == root_context.trace_id
+            assert span.parent is not None and span.parent.span_id == root_context.span_id
+
+    def test_thread_pool_follows_sampling_decision(self) -> None:
+        """サンプリングされなかった呼び出しから送信したタスクは記録されないこと。"""
+
+        @tracing.trace_agent_operation("root")
+        def root() -> int:
+            with tracing.ContextThreadPoolExecutor(max_workers=1) as pool:
+                return pool.submit(_worker_task, 1).result()[0]
+
+        tracing.configure_sampling(sample_ratio=0.0)
+        assert root() == 1
+        assert span_names() == []
+
+    def test_process_pool_tasks_are_children(self) -> None:
+        """ワーカープロセスのスパンが送信元のスパンと同じトレースの子となること。"""
+        tracer = trace.get_tracer(__name__)
+        with (
+            tracer.start_as_current_span("fan-out") as root,
+            tracing.ContextProcessPoolExecutor(max_workers=2) as pool,
+        ):
+            results = [pool.submit(_worker_task, 0).result(), *pool.map(_worker_task, [1, 2])]
+        expected = root.get_span_context()
+        assert results == [(v, expected.trace_id, expected.span_id) for v in range(3)]
+
+    def test_forked_worker_spans_are_exported(self, tmp_path: Path) -> None:
+        """fork したワーカーのスパンが、親と同じトレースとしてエクスポータまで届くこと。"""
+        script = tmp_path / "fan_out.py"
+        script.write_text(
+            """
+import json
+import multiprocessing
+import sys
+
+from opentelemetry import trace
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SpanExportResult
+
+from observability import tracing
+from observability.exporters import BoundedBatchSpanProcessor
+
+
+class FileExporter:
+    def export(self, spans):
+        with open(sys.argv[1], "a") as stream:
+            for span in spans:
+                stream.write(f"{span.name} {span.context.trace_id:032x}\\n")
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self):
+        pass
+
+
+# 送信間隔を長くし、ワーカーのタスク終了時の送信でのみ届くようにする
+processor = BoundedBatchSpanProcessor(
+    FileExporter(), tracing.BatchConfig(schedule_delay_millis=600_000)
+)
+provider = TracerProvider()
+provider.add_span_processor(processor)
+trace.set_tracer_provider(provider)
+
+
+@tracing.trace_tool_execution("worker.task")
+def task(value):
+    return value, processor._worker.is_alive()
+
+
+if __name__ == "__main__":
+    context = multiprocessing.get_context("fork")
+    with trace.get_tracer(__name__).start_as_current_span("fan-out") as root:
+        with tracing.ContextProcessPoolExecutor(max_workers=2, mp_context=context) as pool:
+            print(json.dumps(list(pool.map(task, [1, 2]))))
+    provider.shutdown()
+    print(f"{root.get_span_context().trace_id:032x}")
+"""
+        )
+        spans = tmp_path / "spans.txt"
+        results, trace_id = _run_python(str(script), str(spans)).stdout.splitlines()
+        assert json.loads(results) == [[1, True], [2, True]]
+        assert sorted(spans.read_text().splitlines()) == [
+            f"fan-out {trace_id}",
+            f"worker.task {trace_id}",
+            f"worker.task {trace_id}",
+        ]
+
+    def test_context_env_round_trip(self) -> None:
+        """``context_env()`` を渡した子プロセスの ``init_tracer()`` が親スパンを引き継ぐこと。"""
+        script = """
+from opentelemetry import trace
+from observability import tracing
+
+@tracing.trace_tool_execution("child.tool")
+def child() -> str:
+    span = trace.get_current_span()
+    return f"{span.get_span_context().trace_id:032x} {span.parent.span_id:016x}"
+
+tracing.init_tracer()
+print(child())
+"""
+        tracer = trace.get_tracer(__name__)
+        with tracer.start_as_current_span("parent") as parent:
+            env = tracing.context_env({"PYTHONPATH": str(SRC_DIR)})
+        context = parent.get_span_context()
+        assert env["TRACEPARENT"] == (
+            f"00-{context.trace_id:032x}-{context.span_id:016x}-{context.trace_flags:02x}"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", script], env=env, capture_output=True, text=True, check=True
+        )
+        assert result.stdout.split() == [f"{context.trace_id:032x}", f"{context.span_id:016x}"]
+
+    def test_context_env_without_span(self) -> None:
+        """現在のスパンがなければ環境変数をそのまま引き継ぐこと。"""
+        env = {"TRACEPARENT": "00-" + "1" * 32 + "-" + "2" * 16 + "-01", "X": "1"}
+        assert tracing.context_env(env) == env
+        assert tracing.context_env(env) is not env
+
+
+# ---------------------------------------------------------------------------
+# バッチ送信・OTLP
+# ---------------------------------------------------------------------------
+
+
+class _CollectorHandler(BaseHTTPRequestHandler):
+    """OTLP/HTTP の ``/v1/traces`` を受け付け、受信したスパン名を記録する。"""
+
+    def do_POST(self) -> None:  # noqa: N802
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        request = self.server.request_type()  # type: ignore[attr-defined]
+        request.ParseFromString(body)
+        self.server.received.extend(  # type: ignore[attr-defined]
+            span.name
+            for resource_spans in request.resource_spans
+            for scope_spans in resource_spans.scope_spans
+            for span in scope_spans.spans
+        )
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-protobuf")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+        pass
+
+
+class _BlockingExporter:
+    """``release`` がセットされるまで送信を止めるエクスポータ。"""
+
+    def __init__(self) -> None:
+        self.exporting = threading.Event()
+        self.release = threading.Event()
+        self.exported: list[str] = []
+
+    def export(self, spans: list[object]) -> SpanExportResult:
+        self.exporting.set()
+        self.release.wait(5)
+        self.exported.extend(span.name for span in spans)  # type: ignore[attr-defined]
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self) -> None:
+        pass
+
+
+def _local_tracer(processor: tracing.BoundedBatchSpanProcessor) -> trace.Tracer:
+    """グローバル設定と独立した Provider のトレーサを返す。"""
+    provider = TracerProvider()
+    provider.add_span_processor(processor)
+    return provider.get_tracer(__name__)
+
+
+class TestBatchExport:
+    """``BoundedBatchSpanProcessor`` / ``create_otlp_exporter`` のテスト。"""
+
+    def test_otlp_http_export_to_local_collector(self) -> None:
+        """OTLP/HTTP でローカルのコレクタにスパンが届くこと。"""
+        pytest.importorskip("opentelemetry.exporter.otlp.proto.http")
+        from opentelemetry.proto.collector.trace.v1.trace_service_pb2 import (
+            ExportTraceServiceRequest,
+        )
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _CollectorHandler)
+        server.received = []  # type: ignore[attr-defined]
+        server.request_type = ExportTraceServiceRequest  # type: ignore[attr-defined]
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            endpoint = "http" + "://127.0.0.1:" + str(server.server_port) + "/v1/traces"
+            exporter = tracing.create_otlp_exporter("http/protobuf", endpoint)
+            processor = tracing.BoundedBatchSpanProcessor(
+                exporter, tracing.BatchConfig(max_export_batch_size=2)
+            )
+            tracer = _local_tracer(processor)
+            for name in ("a", "b", "c"):
+                with tracer.start_as_current_span(name):
+                    pass
+            assert processor.force_flush()
+            processor.shutdown()
+        finally:
+            server.shutdown()
+            server.server_close()
+        assert server.received == ["a", "b", "c"]  # type: ignore[attr-defined]
+        assert processor.stats() == {"queued": 0, "dropped": 0, "exported": 3, "failed": 0}
+
+    @pytest.mark.parametrize(
+        ("policy", "kept"),
+        [("drop_newest", ["s5", "s6", "s7", "s8", "s9"]), ("drop_oldest", list("xyzuv"))],
+    )
+    def test_full_queue_drops_without_blocking(self, policy: str, kept: list[str]) -> None:
+        """送信が詰まってもキューは上限を超えず、呼び出し元を待たせずに破棄すること。"""
+        exporter = _BlockingExporter()
+        config = tracing.BatchConfig(max_queue_size=5, max_export_batch_size=5, drop_policy=policy)
+        processor = tracing.BoundedBatchSpanProcessor(exporter, config)
+        tracer = _local_tracer(processor)
+        for i in range(5):
+            with tracer.start_as_current_span(f"s{i}"):
+                pass
+        assert exporter.exporting.wait(5)
+
+        names = [f"s{i}" for i in range(5, 10)] + list("xyz") + ["u", "v"]
+        start = time.perf_counter()
+        for name in names[:8] if policy == "drop_newest" else names:
+            with tracer.start_as_current_span(name):
+                pass
+        assert time.perf_counter() - start < 1.0
+        stats = processor.stats()
+        assert stats["queued"] == 5
+        assert stats["dropped"] == (3 if policy == "drop_newest" else 5)
+
+        exporter.release.set()
+        assert processor.force_flush()
+        processor.shutdown()
+        assert exporter.exported == [f"s{i}" for i in range(5)] + kept
+
+    def test_reinit_replaces_processors(self) -> None:
+        """``init_tracer()`` を再度呼ぶと、前回のプロセッサを停止して集計から外すこと。"""
+        tracing.init_tracer(enable_console_export=True)
+        (first,) = tracing._span_processors
+        tracing.init_tracer(enable_console_export=True)
+        (second,) = tracing._span_processors
+        assert second is not first
+        assert not first._worker.is_alive()
+        tracing.init_tracer()
+        assert tracing._span_processors == []
+        assert not second._worker.is_alive()
+        assert tracing.get_export_stats() == {"queued": 0, "dropped": 0, "exported": 0, "failed": 0}
+
+    def test_invalid_config_rejected(self) -> None:
+        """不正なバッチ設定・未対応のプロトコルは ValueError となること。"""
+        with pytest.raises(ValueError):
+            tracing.BatchConfig(max_queue_size=10, max_export_batch_size=20)
+        with pytest.raises(ValueError):
+            tracing.BatchConfig(drop_policy="block")
+        with pytest.raises(ValueError):
+            tracing.create_otlp_exporter("thrift")
+
+
+# ---------------------------------------------------------------------------
+# リングバッファ
+# ---------------------------------------------------------------------------
+
+
+class TestRingBuffer:
+    """``RingBufferSpanExporter`` の保持と照会のテスト。"""
+
+    @staticmethod
+    def _record(
+        buffer: tracing.RingBufferSpanExporter, spans: list[tuple[str, int, str | None]]
+    ) -> None:
+        """(スパン名, 所要ミリ秒, tool.status) のスパンを記録する。"""
+        provider = TracerProvider()
+        provider.add_span_processor(SimpleSpanProcessor(buffer))
+        tracer = provider.get_tracer(__name__)
+        for name, millis, status in spans:
+            span = tracer.start_span(name, start_time=0)
+            if status is not None:
+                span.set_attributes({"tool.name": name, "tool.status": status})
+            span.end(end_time=millis * 1_000_000)
+
+    def test_reinit_without_buffer_clears_it(self) -> None:
+        """``ring_buffer_size=0`` で再初期化すると ``get_ring_buffer()`` が None を返すこと。"""
+        tracing.init_tracer(ring_buffer_size=10)
+        first = tracing.get_ring_buffer()
+        assert first is not None
+        tracing.init_tracer(ring_buffer_size=10)
+        assert tracing.get_ring_buffer() not in (None, first)
+        tracing.init_tracer(ring_buffer_size=0)
+        assert tracing.get_ring_buffer() is None
+
+    def test_keeps_only_latest_spans(self) -> None:
+        """容量を超えると古いスパンから捨てること。"""
+        buffer = tracing.RingBufferSpanExporter(capacity=3)
+        self._record(buffer, [(f"op{i}", i, None) for i in range(5)])
+        assert [record.name for record in buffer.records()] == ["op2", "op3", "op4"]
+
+    def test_queries(self) -> None:
+        """遅いスパン・パーセンタイル・ツールごとのエラー率を返すこと。"""
+        buffer = tracing.RingBufferSpanExporter()
+        spans: list[tuple[str, int, str | None]] = [("llm", ms, None) for ms in range(1, 101)]
+        spans += [("grep", 5, "success")] * 3 + [("grep", 7, "error")]
+        self._record(buffer, spans)
+
+        assert [record.duration_ms for record in buffer.slowest(3)] == [100.0, 99.0, 98.0]
+        assert [record.name for record in buffer.slowest(1, name="grep")] == ["grep"]
+        percentiles = buffer.latency_percentiles()
+        assert percentiles["llm"] == {"count": 100, "p50": 51.0, "p95": 96.0, "p99": 100.0}
+        assert percentiles["grep"]["count"] == 4
+        assert buffer.error_rates() == {"grep": 0.25}
+
+        buffer.clear()
+        assert buffer.records() == []
+
+    def test_error_status_is_detected(self) -> None:
+        """デコレータの外で記録された例外（スパンのステータス）もエラーとして扱うこと。"""
+        buffer = tracing.RingBufferSpanExporter()
+        provider = TracerProvider()
+        provider.add_span_processor(SimpleSpanProcessor(buffer))
+        with (
+            pytest.raises(RuntimeError),
+            provider.get_tracer(__name__).start_as_current_span("manual"),
+        ):
+            raise RuntimeError("boom")
+        assert [record.error for record in buffer.records()] == [True]
+
+
+# ---------------------------------------------------------------------------
+# メトリクス
+# ---------------------------------------------------------------------------
+
+
+def _metric_points(name: str) -> list[tuple[dict[str, object], object]]:
+    """``name`` のメトリクスの (属性, データ点) を返す（集計はテスト間で累積する）。"""
+    data = METRICS.get_metrics_data()
+    return [
+        (dict(point.attributes), point)
+        for resource_metrics in data.resource_metrics
+        for scope_metrics in resource_metrics.scope_metrics
+        for metric in scope_metrics.metrics
+        if metric.name == name
+        for point in metric.data.data_points
+    ]
+
+
+class TestMetrics:
+    """デコレータが記録するメトリクスのテスト。"""
+
+    def test_tool_and_agent_counters(self) -> None:
+        """ツール・エージェントの呼び出し回数を状態別に数えること。"""
+
+        @tracing.trace_tool_execution("metrics.tool")
+        def tool(fail: bool) -> None:
+            if fail:
+                raise ValueError("bad")
+
+        @tracing.trace_agent_operation("metrics.agent")
+        def agent() -> None:
+            tool(False)
+
+        for _ in range(3):
+            agent()
+        with pytest.raises(ValueError):
+            tool(True)
+
+        counts = {
+            (attrs["tool.name"], attrs["tool.status"]): point.value  # type: ignore[attr-defined]
+            for attrs, point in _metric_points("tool.calls")
+            if attrs["tool.name"] == "metrics.tool"
+        }
+        assert counts == {("metrics.tool", "success"): 3, ("metrics.tool", "error"): 1}
+        agents = [
+            point.value  # type: ignore[attr-defined]
+            for attrs, point in _metric_points("agent.operations")
+            if attrs == {"gen_ai.agent.operation": "metrics.agent", "agent.status": "success"}
+        ]
+        assert agents == [3]
+
+    def test_llm_duration_and_token_usage(self) -> None:
+        """LLM 呼び出しの所要時間とトークン数をヒストグラムに記録すること。"""
+
+        @tracing.trace_llm_call("metrics-model")
+        def chat(fail: bool = False) -> dict[str, object]:
+            if fail:
+                raise TimeoutError
+            return {"usage": {"input_tokens": 12, "output_tokens": 30}}
+
+        chat()
+        chat()
+        with pytest.raises(TimeoutError):
+            chat(fail=True)
+
+        durations = {
+            attrs.get("error.type"): point.count  # type: ignore[attr-defined]
+            for attrs, point in _metric_points("gen_ai.client.operation.duration")
+            if attrs["gen_ai.request.model"] == "metrics-model"
+        }
+        assert durations == {None: 2, "TimeoutError": 1}
+        tokens = {
+            attrs["gen_ai.token.type"]: point.sum  # type: ignore[attr-defined]
+            for attrs, point in _metric_points("gen_ai.client.token.usage")
+            if attrs["gen_ai.request.model"] == "metrics-model"
+        }
+        assert tokens == {"input": 24, "output": 60}
+
+    @pytest.mark.parametrize(
+        "sampling",
+        [{"sample_ratio": 0.0}, {"rate_limits": {"sampled.agent": 0.001, "gen_ai.chat.s": 0.001}}],
+    )
+    def test_unsampled_calls_are_counted(self, sampling: dict[str, Any]) -> None:
+        """サンプリングでスパンを記録しない呼び出しも、メトリクスには全件記録すること。"""
+        suffix = "ratio" if "sample_ratio" in sampling else "limit"
+
+        @tracing.trace_tool_execution(f"sampled.tool.{suffix}")
+        def tool() -> Iterator[int]:
+            yield 1
+
+        @tracing.trace_agent_operation("sampled.agent")
+        def agent() -> None:
+            list(tool())
+
+        @tracing.trace_llm_call("s")
+        def chat() -> dict[str, object]:
+            return {"usage": {"input_tokens": 5, "output_tokens": 7}}
+
+        @tracing.trace_llm_call("s", stream=True)
+        async def stream() -> AsyncIterator[str]:
+            for chunk in ("a", "b", "c"):
+                yield chunk
+
+        async def consume() -> list[str]:
+            return [chunk async for chunk in stream()]
+
+        def histogram(name: str, model: str) -> tuple[int, int]:
+            points = [
+                (point.count, point.sum)  # type: ignore[attr-defined]
+                for attrs, point in _metric_points(name)
+                if attrs["gen_ai.request.model"] == model
+            ]
+            return points[0] if points else (0, 0)
+
+        before = histogram("gen_ai.client.operation.duration", "s")[0]
+        tracing.configure_sampling(**sampling)
+        for _ in range(4):
+            agent()
+            chat()
+            asyncio.run(consume())
+        # レート制限では各スパン名の最初の 1 回（エージェントとその子のツール、LLM）だけ記録する
+        assert len(span_names()) == (0 if suffix == "ratio" else 3)
+
+        tools = [
+            point.value  # type: ignore[attr-defined]
+            for attrs, point in _metric_points("tool.calls")
+            if attrs["tool.name"] == f"sampled.tool.{suffix}"
+        ]
+        assert tools == [4]
+        assert histogram("gen_ai.client.operation.duration", "s")[0] - before == 8
+
+
+# ---------------------------------------------------------------------------
+# オーバーヘッドの回帰検知
+# ---------------------------------------------------------------------------
+
+
+def _load_overhead_bench() -> Any:
+    """tests/benchmarks/bench_tracing_overhead.py をモジュールとして読み込む。"""
+    path = Path(__file__).parent / "benchmarks" / "bench_tracing_overhead.py"
+    spec = importlib.util.spec_from_file_location("bench_tracing_overhead", path)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class TestOverhead:
+    """デコレータのホットパスの作業量が基準値から増えていないことのテスト。
+
+    実行速度に左右されない呼び出しあたりの Python 関数呼び出し数とメモリ確保量で判定する
+    （所要時間の比較は ``bench_tracing_overhead.py --check`` で行う）。
+    OTel SDK を通る構成の呼び出し数・メモリ確保量の総計は SDK や CPython の版で変わるため、
+    ``src/observability`` 内の関数呼び出し数のみを比較し、総計は ``--check`` で比較する。
+    """
+
+    @pytest.mark.parametrize(
+        ("config", "keys"),
+        [
+            ("otel-absent", ("own_py_calls", "py_calls", "peak_bytes")),
+            ("sampled-out", ("own_py_calls", "py_calls", "peak_bytes")),
+            ("no-exporter", ("own_py_calls",)),
+            ("ring-buffer", ("own_py_calls",)),
+        ],
+    )
+    def test_hot_path_work_within_baseline(self, config: str, keys: tuple[str, ...]) -> None:
+        """基準値ファイルの許容幅を超えて作業量が増えていないこと。"""
+        bench = _load_overhead_bench()
+        baseline = json.loads(bench.BASELINE_FILE.read_text())
+        with bench.workload(config) as target:
+            work = bench.count_work(target.sync)
+        expected = {key: baseline[config][key] for key in keys}
+        assert bench.check({config: work}, {config: expected}) == []
+
+
+# ---------------------------------------------------------------------------
+# 遅延インポート
+# ---------------------------------------------------------------------------
+
+SRC_DIR = Path(__file__).resolve().parents[1] / "src"
+
+
+def _run_python(*args: str) -> subprocess.CompletedProcess[str]:
+    """src を import パスに加えた新しいインタプリタで実行する。"""
+    env = {**os.environ, "PYTHONPATH": str(SRC_DIR)}
+    return subprocess.run(
+        [sys.executable, *args], env=env, capture_output=True, text=True, check=True
+    )
+
+
+# import 時に読み込まない（最初の使用まで遅延する）モジュール
+# （OTel の有無の確認で名前空間パッケージ opentelemetry 自体は読み込むため、その配下を対象とする）
+_DEFERRED_MODULES = (
+    "opentelemetry.",
+    "observability.exporters",
+    "observability.executors",
+    "concurrent.futures.process",
+    "multiprocessing",
+)
+
+
+class TestLazyImport:
+    """``observability.tracing`` の import が OTel を読み込まないことのテスト。"""
+
+    def test_import_does_not_load_deferred_modules(self) -> None:
+        """import 時に OTel と、最初の使用まで遅延するモジュールを読み込まないこと。"""
+        script = "import sys; from observability import tracing; print(*sorted(sys.modules))"
+        loaded = _run_python("-c", script).stdout.split()
+        assert "observability.tracing" in loaded
+        deferred = [
+            name
+            for name in loaded
+            for mod in _DEFERRED_MODULES
+            if name == mod or name.startswith(mod if mod.endswith(".") else f"{mod}.")
+        ]
+        assert deferred == []
+
+    def test_process_pool_is_loaded_on_first_use(self) -> None:
+        """``ContextProcessPoolExecutor`` を参照するまで multiprocessing を読み込まないこと。"""
+        script = """
+import sys
+from observability import tracing
+
+print("multiprocessing" in sys.modules)
+tracing.ContextProcessPoolExecutor
+print("multiprocessing" in sys.modules)
+"""
+        assert _run_python("-c", script).stdout.split() == ["False", "True"]
+
+    def test_functions_decorated_before_init_are_traced(self) -> None:
+        """``init_tracer()`` より前にデコレートした関数も初期化後の呼び出しで記録されること。"""
+        script = """
+import sys
+from observability import tracing
+
+@tracing.trace_tool_execution("early.tool")
+def early() -> int:
+    return 1
+
+assert not [m for m in sys.modules if m.startswith("opentelemetry.")], "imported too early"
+tracing.init_tracer(ring_buffer_size=10)
+early()
+print([record.name for record in tracing.get_ring_buffer().records()])
+"""
+        assert _run_python("-c", script).stdout.strip() == "['early.tool']"